@@ -0,0 +1,44 @@
+"""
+Benchmark parsing a Simrad raw file with ``open_raw(..., n_workers=N)``.
+
+Usage::
+
+    python benchmarks/open_raw_n_workers.py FILE SONAR_MODEL [N_WORKERS ...]
+
+Times ``open_raw`` with each number of workers (default: 1, 2, 4 and 8),
+and prints the speedup over ``n_workers=1``.
+The speedup is bounded by the number of cores of the machine, and by the parts
+of the conversion that remain serial: indexing the file, merging the pings
+of the workers and setting the groups of the ``EchoData`` object.
+"""
+
+import sys
+import time
+
+import echopype as ep
+
+
+def time_open_raw(raw_file, sonar_model, n_workers, repeat=3):
+    """Return the shortest time of ``repeat`` calls to ``open_raw`` with ``n_workers``."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ep.open_raw(raw_file, sonar_model=sonar_model, n_workers=n_workers)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(raw_file, sonar_model, n_workers_list):
+    serial_time = None
+    print(f"{'n_workers':>9} {'time (s)':>9} {'speedup':>8}")
+    for n_workers in n_workers_list:
+        elapsed = time_open_raw(raw_file, sonar_model, n_workers)
+        if serial_time is None:
+            serial_time = elapsed if n_workers == 1 else time_open_raw(raw_file, sonar_model, 1)
+        print(f"{n_workers:>9} {elapsed:>9.2f} {serial_time / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        sys.exit(__doc__)
+    main(sys.argv[1], sys.argv[2], [int(n) for n in sys.argv[3:]] or [1, 2, 4, 8])
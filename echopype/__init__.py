@@ -3,9 +3,11 @@ from __future__ import absolute_import, division, print_function
 from _echopype_version import version as __version__  # noqa
 
 from . import calibrate, clean, commongrid, consolidate, mask, utils
-from .convert.api import open_raw
+from .convert.api import convert_files, open_raw
+from .convert.incremental import IncrementalConverter
 from .echodata.api import open_converted
-from .echodata.combine import combine_echodata
+from .echodata.catalog import build_catalog, query_catalog
+from .echodata.combine import combine_echodata, open_mfconverted
 from .utils.io import init_ep_dir
 from .utils.log import verbose
 
@@ -15,15 +17,20 @@ verbose(override=True)
 init_ep_dir()
 
 __all__ = [
+    "IncrementalConverter",
+    "build_catalog",
     "calibrate",
     "clean",
     "combine_echodata",
     "commongrid",
     "consolidate",
+    "convert_files",
     "mask",
     "metrics",
     "open_converted",
+    "open_mfconverted",
     "open_raw",
+    "query_catalog",
     "utils",
     "verbose",
 ]
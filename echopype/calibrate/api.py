@@ -1,11 +1,14 @@
+import numpy as np
 import xarray as xr
 
 from ..echodata import EchoData
 from ..echodata.simrad import check_input_args_combination
 from ..utils.log import _init_logger
 from ..utils.prov import echopype_prov_attrs, source_files_vars
+from ..utils.ragged import from_ragged, is_ragged
 from .calibrate_azfp import CalibrateAZFP
 from .calibrate_ek import CalibrateEK60, CalibrateEK80
+from .range import PING_INVARIANT_ATTR
 
 CALIBRATOR = {
     "EK60": CalibrateEK60,
@@ -19,6 +22,29 @@ CALIBRATOR = {
 logger = _init_logger(__name__)
 
 
+class _PaddedBeamGroupsView:
+    """
+    View of an EchoData object in which the beam groups with ragged samples
+    are lazily padded when accessed, so that they are calibrated as padded beam groups.
+    """
+
+    def __init__(self, echodata: EchoData):
+        self._echodata = echodata
+        self._padded_groups = {}
+
+    def __getitem__(self, key):
+        if key in self._padded_groups:
+            return self._padded_groups[key]
+        ds = self._echodata[key]
+        if isinstance(ds, xr.Dataset) and is_ragged(ds):
+            ds = from_ragged(ds)
+            self._padded_groups[key] = ds
+        return ds
+
+    def __getattr__(self, name):
+        return getattr(self._echodata, name)
+
+
 def _compute_cal(
     cal_type,
     echodata: EchoData,
@@ -27,6 +53,7 @@ def _compute_cal(
     ecs_file=None,
     waveform_mode=None,
     encode_mode=None,
+    pulse_compression_dtype=np.complex64,
 ):
     # Check on waveform_mode and encode_mode inputs
     if echodata.sonar_model == "EK80":
@@ -45,6 +72,11 @@ def _compute_cal(
                 "(encode_mode='power'). Calibration will be done on the power samples.",
             )
 
+    # Pad the samples of beam groups stored as ragged arrays on demand
+    beam_groups = [p for p in echodata.group_paths if p.startswith("Sonar/Beam_group")]
+    if any(is_ragged(echodata[p]) for p in beam_groups):
+        echodata = _PaddedBeamGroupsView(echodata)
+
     # Set up calibration object
     cal_obj = CALIBRATOR[echodata.sonar_model](
         echodata,
@@ -53,6 +85,7 @@ def _compute_cal(
         ecs_file=ecs_file,
         waveform_mode=waveform_mode,
         encode_mode=encode_mode,
+        pulse_compression_dtype=pulse_compression_dtype,
     )
 
     # Check Echodata Backscatter Size
@@ -72,7 +105,10 @@ def _compute_cal(
         cal_type: Sv or TS
         """
         ds["range_sample"].attrs = {"long_name": "Along-range sample number, base 0"}
-        ds["echo_range"].attrs = {"long_name": "Range distance", "units": "m"}
+        echo_range_attrs = {"long_name": "Range distance", "units": "m"}
+        if PING_INVARIANT_ATTR in ds["echo_range"].attrs:
+            echo_range_attrs[PING_INVARIANT_ATTR] = ds["echo_range"].attrs[PING_INVARIANT_ATTR]
+        ds["echo_range"].attrs = echo_range_attrs
         ds[cal_type].attrs = {
             "long_name": {
                 "Sv": "Volume backscattering strength (Sv re 1 m-1)",
@@ -176,6 +212,11 @@ def compute_Sv(echodata: EchoData, **kwargs) -> xr.Dataset:
         - `"power"` for power/angle samples, only allowed when
           the echosounder is configured for narrowband transmission
 
+    pulse_compression_dtype : str or np.dtype, default np.complex64
+        Complex dtype of the pulse compression of broadband complex samples.
+        Used only for EK80 data with `waveform_mode="BB"`.
+        `np.complex128` doubles the precision and the memory footprint.
+
     Returns
     -------
     xr.Dataset
@@ -265,6 +306,11 @@ def compute_TS(echodata: EchoData, **kwargs):
         - `"power"` for power/angle samples, only allowed when
           the echosounder is configured for narrowband transmission
 
+    pulse_compression_dtype : str or np.dtype, default np.complex64
+        Complex dtype of the pulse compression of broadband complex samples.
+        Used only for EK80 data with `waveform_mode="BB"`.
+        `np.complex128` doubles the precision and the memory footprint.
+
     Returns
     -------
     xr.Dataset
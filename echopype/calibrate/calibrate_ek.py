@@ -216,6 +216,7 @@ class CalibrateEK80(CalibrateEK):
         waveform_mode,
         encode_mode,
         ecs_file=None,
+        pulse_compression_dtype=np.complex64,
         **kwargs,
     ):
         super().__init__(echodata, env_params, cal_params, ecs_file)
@@ -223,6 +224,9 @@ class CalibrateEK80(CalibrateEK):
         # Set sonar_type
         self.sonar_type = "EK80"
 
+        # Complex dtype of the pulse compression of broadband samples
+        self.pulse_compression_dtype = pulse_compression_dtype
+
         # The waveform and encode mode combination checked in calibrate/api.py::_compute_cal
         # so just doing assignment here
         self.waveform_mode = waveform_mode
@@ -440,7 +444,9 @@ class CalibrateEK80(CalibrateEK):
         # Compute power
         if self.waveform_mode == "BB":
             pc = compress_pulse(
-                backscatter=beam["backscatter_r"] + 1j * beam["backscatter_i"], chirp=chirp
+                backscatter=beam["backscatter_r"] + 1j * beam["backscatter_i"],
+                chirp=chirp,
+                dtype=self.pulse_compression_dtype,
             )  # has beam dim
             pc = pc / get_norm_fac(chirp=chirp)  # normalization for each channel
             prx = _get_prx(pc)  # ensure prx is xr.DataArray
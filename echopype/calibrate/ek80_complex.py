@@ -1,10 +1,10 @@
 from collections import defaultdict
 from functools import partial
-from typing import Dict, Literal, Optional, Union
+from typing import Dict, List, Literal, Optional, Union
 
 import numpy as np
 import xarray as xr
-from scipy import signal
+from scipy import fft, signal
 
 from ..convert.set_groups_ek80 import DECIMATION, FILTER_IMAG, FILTER_REAL
 
@@ -259,70 +259,90 @@ def get_transmit_signal(
     return y_all, y_time_all
 
 
-def _convolve_per_channel(backscatter_subset: np.ndarray, replica_dict: dict, channels: dict):
+def _get_replica_fft(replicas: List[np.ndarray], num_samples: int, dtype: np.dtype):
     """
-    Convolve `backscatter_subset` array along range sample dimension for each channel.
-    The `backscatter_subset` array is a numpy array and has implicit dimensions
-    `('range_sample', 'channel')`.
+    Compute the FFT of the matched filter replica of each channel once,
+    at an FFT length long enough to hold the full linear convolution of
+    `num_samples` backscatter samples with the longest replica.
+
+    Returns the replica spectra with implicit dimensions `('fft_sample', 'channel')`
+    and the FFT length.
+    """
+    max_replica_size = max(replica.size for replica in replicas)
+    nfft = fft.next_fast_len(num_samples + max_replica_size - 1)
+    replica_fft = np.stack(
+        [fft.fft(replica.astype(dtype), n=nfft) for replica in replicas], axis=-1
+    )
+    return replica_fft, nfft
 
-    When the `backscatter_subset` array is all 0s, we return it since the resulting
-    convolution will be all 0s, irrespective of what the corresponding transmit
-    signal is.
 
-    When this function is used in `compress_pulse`, the array that is being sent
-    as backscatter subset corresponds to a specific `ping_time` and `beam`, from
-    the backscatter array.
+def _convolve_fft(
+    backscatter_block: np.ndarray,
+    replica_fft: np.ndarray,
+    replica_sizes: List[int],
+    nfft: int,
+    dtype: np.dtype,
+) -> np.ndarray:
     """
-    # Return if all 0s
-    if np.all(backscatter_subset == 0.0 + 0.0j):
-        return backscatter_subset
-    else:
-        # Create zeros like array from `backscatter_subset`
-        convolved = np.zeros_like(backscatter_subset, dtype=np.complex64)
-        # Iterate over channels
-        for ch_seq, channel in enumerate(channels):
-            # Extract replica values
-            replica = replica_dict[str(channel.values)]
-            # Convolve backscatter and chirp replica
-            convolved[:, ch_seq] = signal.convolve(
-                backscatter_subset[:, ch_seq], replica, mode="full"
-            )[replica.size - 1 :]
-        return convolved
-
-
-def compress_pulse(backscatter: xr.DataArray, chirp: Dict) -> xr.DataArray:
+    Convolve `backscatter_block` along range sample dimension for each channel
+    using the pre-computed replica spectra.
+    The `backscatter_block` array is a numpy array and has implicit dimensions
+    `(..., 'range_sample', 'channel')`, i.e. all pings and beams of a block are
+    convolved at once.
+
+    The output is the same as the tail of the full linear convolution
+    (`signal.convolve(x, replica, mode="full")[replica.size - 1:]`) of each channel.
+    """
+    num_samples = backscatter_block.shape[-2]
+    spectrum = fft.fft(backscatter_block.astype(dtype, copy=False), n=nfft, axis=-2)
+    spectrum *= replica_fft
+    convolved = fft.ifft(spectrum, axis=-2, overwrite_x=True)
+    compressed = np.empty(backscatter_block.shape, dtype=dtype)
+    for ch_seq, replica_size in enumerate(replica_sizes):
+        compressed[..., ch_seq] = convolved[
+            ..., replica_size - 1 : replica_size - 1 + num_samples, ch_seq
+        ]
+    return compressed
+
+
+def compress_pulse(
+    backscatter: xr.DataArray, chirp: Dict, dtype: Union[str, np.dtype] = np.complex64
+) -> xr.DataArray:
     """Perform pulse compression on the backscatter data.
 
+    The matched filter is applied in the frequency domain: the replica of each channel
+    is transformed once and all pings and beams of each (dask) block are compressed
+    together.
+
     Parameters
     ----------
     backscatter : xr.DataArray
         complex backscatter samples
     chirp : dict
         transmit chirp replica indexed by ``channel``
+    dtype : str or np.dtype, default np.complex64
+        complex dtype of the computation and output.
+        Use ``np.complex128`` for double precision at twice the memory footprint.
 
     Returns
     -------
     xr.DataArray
         A data array containing pulse compression output.
     """
-    # Calculate the transmit signal values from the chirp dictionary
-    replica_dict = {
-        # Compute conjugate and flip for each channel's transmit signal
-        str(channel.values): np.flipud(np.conj(chirp[str(channel.values)]))
-        for channel in backscatter["channel"]
-    }
+    dtype = np.dtype(dtype)
+    if dtype.kind != "c":
+        raise ValueError("dtype must be a complex dtype")
+
+    # Compute conjugate and flip for each channel's transmit signal
+    replicas = [
+        np.flipud(np.conj(chirp[str(channel.values)])) for channel in backscatter["channel"]
+    ]
+    replica_fft, nfft = _get_replica_fft(replicas, backscatter["range_sample"].size, dtype)
 
     # Zero out backscatter NaN values
     nan_mask = np.isnan(backscatter)
     backscatter_with_zeroed_nans = xr.where(nan_mask, 0.0 + 0.0j, backscatter)
 
-    # Create a partial function of the convolve function to pass in chirp and channels
-    _convolve_per_channel_partial = partial(
-        _convolve_per_channel,
-        replica_dict=replica_dict,
-        channels=backscatter_with_zeroed_nans["channel"],
-    )
-
     # Apply convolve on backscatter and replica (along range sample and channel dimension):
     # To enable parallelized computation with `dask='parallelized'`, we rechunk to ensure that
     #  the data is chunked with only one chunk along the core dimensions.
@@ -331,17 +351,22 @@ def compress_pulse(backscatter: xr.DataArray, chirp: Dict) -> xr.DataArray:
             {"range_sample": -1, "channel": -1}
         )
     pc = xr.apply_ufunc(
-        _convolve_per_channel_partial,
+        partial(
+            _convolve_fft,
+            replica_fft=replica_fft,
+            replica_sizes=[replica.size for replica in replicas],
+            nfft=nfft,
+            dtype=dtype,
+        ),
         backscatter_with_zeroed_nans,
         input_core_dims=[["range_sample", "channel"]],
         output_core_dims=[["range_sample", "channel"]],
         dask="parallelized",
-        vectorize=True,
-        output_dtypes=[np.complex64],
+        output_dtypes=[dtype],
     )
 
     # Restore NaN values in the pulse compressed array
-    pc = xr.where(nan_mask, np.nan, pc)
+    pc = pc.where(~nan_mask).transpose(*backscatter.dims)
 
     return pc
 
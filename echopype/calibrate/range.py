@@ -1,5 +1,7 @@
-from typing import Dict
+from typing import Dict, Union
 
+import dask.array
+import numpy as np
 import xarray as xr
 
 from ..echodata import EchoData
@@ -7,6 +9,33 @@ from ..echodata.simrad import retrieve_correct_beam_group
 from .env_params import harmonize_env_param_time
 
 DIMENSION_ORDER = ["channel", "ping_time", "range_sample"]
+# Attribute marking ranges that are constant along ping_time wherever they are not NaN
+PING_INVARIANT_ATTR = "ping_invariant"
+
+
+def _is_ping_invariant(da: Union[xr.DataArray, float]) -> bool:
+    """Check if a parameter is constant along ``ping_time`` in each channel, ignoring NaN."""
+    if not isinstance(da, xr.DataArray) or "ping_time" not in da.dims:
+        return not isinstance(da, xr.DataArray) or "time1" not in da.dims
+    da_max, da_min = da.max("ping_time"), da.min("ping_time")
+    return bool(((da_max == da_min) | da_max.isnull()).all())
+
+
+def _compact_range(
+    range_1d: xr.DataArray, backscatter: xr.DataArray, valid_params: xr.DataArray
+) -> xr.DataArray:
+    """
+    Lazily broadcast the per-channel range ``range_1d`` along ``ping_time``,
+    setting entries with NaN ``backscatter`` or invalid parameters to NaN.
+
+    The result is a dask array chunked as ``backscatter`` (along ``ping_time``
+    if ``backscatter`` is in memory), so that the full
+    ``(channel, ping_time, range_sample)`` array is only produced chunk by chunk
+    when computed.
+    """
+    if not isinstance(backscatter.data, dask.array.Array):
+        backscatter = backscatter.chunk({"ping_time": "auto"})
+    return xr.where(backscatter.notnull() & valid_params, range_1d, np.nan)
 
 
 def compute_range_AZFP(echodata: EchoData, env_params: Dict, cal_type: str) -> xr.DataArray:
@@ -137,6 +166,12 @@ def compute_range_EK(
 
     Notes
     -----
+    When ``sample_interval`` and the sound speed are constant along ``ping_time``
+    in each channel, as in most files, the range is computed once per channel
+    and lazily broadcast along ``ping_time`` as a dask array, so that the
+    ``(channel, ping_time, range_sample)`` array is not held in memory.
+    Such ranges have a ``ping_invariant`` attribute set to 1.
+
     The EK80 echosounder can be configured to transmit
     either broadband (``waveform_mode="BB"``) or narrowband (``waveform_mode="CW"``) signals.
     When transmitting in broadband mode, the returned echoes must be
@@ -170,18 +205,38 @@ def compute_range_EK(
         else echodata[ed_beam_group].sel(channel=chan_sel)
     )
 
-    # Range in meters, not modified for TVG compensation
-    range_meter = beam["range_sample"] * beam["sample_interval"] * sound_speed / 2
-    # make order of dims conform with the order of backscatter data
-    range_meter = range_meter.transpose(*DIMENSION_ORDER)
+    # Drop beam because echo_range should not have a beam dimension
+    backscatter = (
+        beam["backscatter_r"].isel(beam=0).drop("beam")
+        if "beam" in beam["backscatter_r"].dims
+        else beam["backscatter_r"]
+    )
 
-    # set entries with NaN backscatter data to NaN
-    if "beam" in beam["backscatter_r"].dims:
-        # Drop beam because echo_range should not have a beam dimension
-        valid_idx = ~beam["backscatter_r"].isel(beam=0).drop("beam").isnull()
+    if _is_ping_invariant(beam["sample_interval"]) and _is_ping_invariant(sound_speed):
+        # Range in meters, not modified for TVG compensation,
+        # computed once per channel and lazily broadcast along ping_time
+        # instead of stored for each ping
+        valid_params = beam["sample_interval"].notnull()
+        sample_interval = beam["sample_interval"]
+        if isinstance(sound_speed, xr.DataArray):
+            valid_params = valid_params & sound_speed.notnull()
+            if "ping_time" in sound_speed.dims:
+                sound_speed = sound_speed.max("ping_time")
+        if "ping_time" in sample_interval.dims:
+            sample_interval = sample_interval.max("ping_time")
+        range_1d = beam["range_sample"] * sample_interval * sound_speed / 2
+        range_meter = _compact_range(range_1d, backscatter, valid_params)
+        # make order of dims conform with the order of backscatter data
+        range_meter = range_meter.transpose(*DIMENSION_ORDER)
+        range_meter.attrs[PING_INVARIANT_ATTR] = 1
     else:
-        valid_idx = ~beam["backscatter_r"].isnull()
-    range_meter = range_meter.where(valid_idx)
+        # Range in meters, not modified for TVG compensation
+        range_meter = beam["range_sample"] * beam["sample_interval"] * sound_speed / 2
+        # make order of dims conform with the order of backscatter data
+        range_meter = range_meter.transpose(*DIMENSION_ORDER)
+
+        # set entries with NaN backscatter data to NaN
+        range_meter = range_meter.where(~backscatter.isnull())
 
     # remove time1 if exists as a coordinate
     if "time1" in range_meter.coords:
@@ -231,6 +286,9 @@ def range_mod_TVG_EK(
         # Change range for all channels with GPT
         if "GPT" in vend["transceiver_type"]:
             ch_GPT = vend["transceiver_type"] == "GPT"
-            range_meter.loc[dict(channel=ch_GPT)] = range_meter.sel(channel=ch_GPT) - mod_Ex60()
+            # Without item assignment, which lazily broadcast ranges do not support
+            range_meter = xr.where(
+                ch_GPT.sel(channel=range_meter["channel"]), range_meter - mod_Ex60(), range_meter
+            ).transpose(*range_meter.dims)
 
     return range_meter
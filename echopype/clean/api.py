@@ -4,6 +4,7 @@ Functions for reducing variabilities in backscatter data.
 
 from functools import partial
 
+import dask.array
 import numpy as np
 import xarray as xr
 
@@ -12,9 +13,9 @@ from ..utils.compute import _lin2log, _log2lin
 from ..utils.log import _init_logger
 from ..utils.prov import add_processing_level, echopype_prov_attrs, insert_input_processing_level
 from .utils import (
+    _attenuated_signal_mask_block,
     add_remove_background_noise_attrs,
     downsample_upsample_along_depth,
-    echopy_attenuated_signal_mask,
     echopy_impulse_noise_mask,
     extract_dB,
     index_binning_downsample_upsample_along_depth,
@@ -335,7 +336,7 @@ def mask_attenuated_signal(
 
     # Create partial of echopy attenuation mask computation
     partial_echopy_attenuation_mask = partial(
-        echopy_attenuated_signal_mask,
+        _attenuated_signal_mask_block,
         upper_limit_sl=upper_limit_sl,
         lower_limit_sl=lower_limit_sl,
         num_side_pings=num_side_pings,
@@ -343,16 +344,24 @@ def mask_attenuated_signal(
     )
 
     # Compute attenuated signal mask
-    attenuated_mask = xr.apply_ufunc(
-        partial_echopy_attenuation_mask,
-        ds_Sv["Sv"],
-        ds_Sv[range_var],
-        input_core_dims=[["ping_time", "range_sample"], ["ping_time", "range_sample"]],
-        output_core_dims=[["ping_time", "range_sample"]],
-        dask="parallelized",
-        vectorize=True,
-        output_dtypes=[bool],
-    )
+    dims = ("channel", "ping_time", "range_sample")
+    Sv = ds_Sv["Sv"].transpose(*dims)
+    range_values = ds_Sv[range_var].transpose(*dims)
+    if isinstance(Sv.data, dask.array.Array):
+        # Layers span `range_sample`, so blocks of pings are processed in parallel with
+        # `num_side_pings` halo pings on each side
+        Sv_data = Sv.data.rechunk({2: -1})
+        attenuated_mask_data = dask.array.map_overlap(
+            partial_echopy_attenuation_mask,
+            Sv_data,
+            dask.array.asarray(range_values.data).rechunk(Sv_data.chunks),
+            depth={0: 0, 1: num_side_pings, 2: 0},
+            boundary="none",
+            dtype=bool,
+        )
+    else:
+        attenuated_mask_data = partial_echopy_attenuation_mask(Sv.values, range_values.values)
+    attenuated_mask = xr.DataArray(attenuated_mask_data, dims=dims, coords=Sv.coords)
 
     return attenuated_mask
 
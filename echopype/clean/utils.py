@@ -1,6 +1,9 @@
 import re
-from typing import Callable
+import warnings
+from functools import partial
+from typing import Callable, Tuple
 
+import dask.array
 import dask_image.ndfilters
 import flox.xarray
 import numpy as np
@@ -26,6 +29,242 @@ def extract_dB(dB_str: str) -> float:
         raise ValueError("Decibal string must be formatted as 'NUMdB' or `NUMdb")
 
 
+def _window_bounds(
+    sorted_depth: np.ndarray, lower: np.ndarray, upper: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Locate the samples of a depth-sorted ping that fall within ``[lower, upper]``.
+
+    Returns the start (inclusive) and stop (exclusive) sample indices of each window.
+    NaN depths are sorted to the end of the ping and therefore never fall in a window.
+    """
+    lo = np.searchsorted(sorted_depth, lower, side="left")
+    hi = np.searchsorted(sorted_depth, upper, side="right")
+    return lo, np.maximum(hi, lo)
+
+
+def _pool_Sv_channel_mean(
+    sorted_Sv_lin: np.ndarray,
+    sorted_depth: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    num_side_pings: int,
+) -> np.ndarray:
+    """
+    Pooled nanmean of a single channel computed with cumulative sums over
+    depth-sorted samples.
+    """
+    num_pings, num_samples = sorted_Sv_lin.shape
+    valid = ~np.isnan(sorted_Sv_lin)
+    values = np.where(valid, sorted_Sv_lin, 0)
+
+    # Split pings into runs sharing the same depth vector. Within a run each window is
+    # a rectangle, so sum along `ping_time` first and then take differences of the
+    # cumulative sums along the depth-sorted samples.
+    new_run = np.ones(num_pings, dtype=bool)
+    new_run[1:] = np.any(
+        (sorted_depth[1:] != sorted_depth[:-1])
+        & ~(np.isnan(sorted_depth[1:]) & np.isnan(sorted_depth[:-1])),
+        axis=1,
+    )
+    run_starts = np.flatnonzero(new_run)
+    run_stops = np.append(run_starts[1:], num_pings)
+
+    sums = np.zeros((num_pings, num_samples))
+    counts = np.zeros((num_pings, num_samples))
+    for run_start, run_stop in zip(run_starts, run_stops):
+        run = slice(run_start, run_stop)
+        ping_cumsum_values = np.zeros((run_stop - run_start + 1, num_samples))
+        ping_cumsum_counts = np.zeros((run_stop - run_start + 1, num_samples))
+        np.cumsum(values[run], axis=0, out=ping_cumsum_values[1:])
+        np.cumsum(valid[run], axis=0, out=ping_cumsum_counts[1:])
+        ping_index = np.arange(run_stop - run_start)
+        start = np.maximum(ping_index - num_side_pings, 0)
+        stop = np.minimum(ping_index + num_side_pings + 1, run_stop - run_start)
+
+        range_cumsum_values = np.zeros((run_stop - run_start, num_samples + 1))
+        range_cumsum_counts = np.zeros((run_stop - run_start, num_samples + 1))
+        np.cumsum(
+            ping_cumsum_values[stop] - ping_cumsum_values[start],
+            axis=1,
+            out=range_cumsum_values[:, 1:],
+        )
+        np.cumsum(
+            ping_cumsum_counts[stop] - ping_cumsum_counts[start],
+            axis=1,
+            out=range_cumsum_counts[:, 1:],
+        )
+        lo, hi = _window_bounds(sorted_depth[run_start], lower[run], upper[run])
+        sums[run] = np.take_along_axis(range_cumsum_values, hi, axis=1) - np.take_along_axis(
+            range_cumsum_values, lo, axis=1
+        )
+        counts[run] = np.take_along_axis(range_cumsum_counts, hi, axis=1) - np.take_along_axis(
+            range_cumsum_counts, lo, axis=1
+        )
+
+    # Windows straddling a change in depth vector combine runs of samples located
+    # separately in each of their pings.
+    if len(run_starts) > 1:
+        range_cumsum_values = np.zeros((num_pings, num_samples + 1))
+        range_cumsum_counts = np.zeros((num_pings, num_samples + 1))
+        np.cumsum(values, axis=1, out=range_cumsum_values[:, 1:])
+        np.cumsum(valid, axis=1, out=range_cumsum_counts[:, 1:])
+        straddling = np.zeros(num_pings, dtype=bool)
+        for run_start in run_starts[1:]:
+            straddling[max(run_start - num_side_pings, 0) : run_start + num_side_pings] = True
+        for ping_index in np.flatnonzero(straddling):
+            sums[ping_index] = 0
+            counts[ping_index] = 0
+            for window_ping in range(
+                max(ping_index - num_side_pings, 0),
+                min(ping_index + num_side_pings + 1, num_pings),
+            ):
+                lo, hi = _window_bounds(
+                    sorted_depth[window_ping], lower[ping_index], upper[ping_index]
+                )
+                sums[ping_index] += (
+                    range_cumsum_values[window_ping][hi] - range_cumsum_values[window_ping][lo]
+                )
+                counts[ping_index] += (
+                    range_cumsum_counts[window_ping][hi] - range_cumsum_counts[window_ping][lo]
+                )
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def _pool_Sv_channel_gather(
+    sorted_Sv_lin: np.ndarray,
+    sorted_depth: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    num_side_pings: int,
+    func: Callable,
+    max_gather_size: int = 2**22,
+) -> np.ndarray:
+    """
+    Pooled aggregation of a single channel for order-statistic functions (e.g. nanmedian).
+
+    The window bounds in each of the surrounding pings are found for all pings at once,
+    and the samples of the windows holding the same number of samples are gathered
+    into a matrix, NaN-padded where they span a different number of samples
+    in some of the pings, and reduced along rows.
+    """
+    num_pings, num_samples = sorted_Sv_lin.shape
+    offsets = np.arange(-num_side_pings, num_side_pings + 1)
+    reduce_rows = _nanmedian_rows if func is np.nanmedian else partial(func, axis=1)
+
+    # Exact integer ranks of the depths and window bounds, so that the windows in all pings
+    # are located by a single search over the sorted (ping, depth rank) keys
+    values = np.unique(np.concatenate([sorted_depth.ravel(), lower.ravel(), upper.ravel()]))
+    ping_keys = np.arange(num_pings)[:, None] * values.size
+    depth_keys = (ping_keys + np.searchsorted(values, sorted_depth)).ravel()
+    lower_rank = np.searchsorted(values, lower)
+    upper_rank = np.searchsorted(values, upper)
+
+    flat_Sv_lin = sorted_Sv_lin.ravel()
+    pooled = np.full((num_pings, num_samples), np.nan)
+
+    # Bound the size of the window bounds by processing pings in batches
+    batch_len = max(max_gather_size // (offsets.size * num_samples), 1)
+    for batch_start in range(0, num_pings, batch_len):
+        batch_stop = min(batch_start + batch_len, num_pings)
+        batch_pings = np.arange(batch_start, batch_stop)
+
+        # Start and length of the window of each sample in each of the surrounding pings
+        window_pings = batch_pings[None, :] + offsets[:, None]
+        in_pings = (window_pings >= 0) & (window_pings < num_pings)
+        window_pings = np.clip(window_pings, 0, num_pings - 1)
+        window_keys = ping_keys[window_pings]
+        sample_offsets = window_pings[..., None] * num_samples
+        lo = (
+            np.searchsorted(depth_keys, window_keys + lower_rank[batch_start:batch_stop])
+            - sample_offsets
+        )
+        hi = (
+            np.searchsorted(
+                depth_keys, window_keys + upper_rank[batch_start:batch_stop], side="right"
+            )
+            - sample_offsets
+        )
+        lengths = np.where(in_pings[..., None], np.maximum(hi - lo, 0), 0)
+        starts = sample_offsets + lo
+
+        # Reduce together the windows of each size, padded to the longest in each ping
+        window_sizes = lengths.sum(axis=0).ravel()
+        order = np.argsort(window_sizes, kind="stable")
+        sizes, group_starts = np.unique(window_sizes[order], return_index=True)
+        group_stops = np.append(group_starts[1:], order.size)
+        lengths = lengths.reshape(offsets.size, -1)
+        starts = starts.reshape(offsets.size, -1)
+        batch_pooled = np.full(order.size, np.nan)
+        for size, group_start, group_stop in zip(sizes, group_starts, group_stops):
+            if size == 0:
+                continue
+            members = order[group_start:group_stop]
+            max_lengths = lengths[:, members].max(axis=1)
+            column_starts = np.concatenate([[0], np.cumsum(max_lengths)])
+            member_len = max(max_gather_size // int(column_starts[-1]), 1)
+            for member_start in range(0, members.size, member_len):
+                block = members[member_start : member_start + member_len]
+                gathered = np.empty((block.size, column_starts[-1]))
+                for offset_index in np.flatnonzero(max_lengths):
+                    offset_range = np.arange(max_lengths[offset_index])
+                    columns = gathered[
+                        :, column_starts[offset_index] : column_starts[offset_index + 1]
+                    ]
+                    columns[...] = flat_Sv_lin.take(
+                        starts[offset_index, block, None] + offset_range, mode="clip"
+                    )
+                    block_lengths = lengths[offset_index, block, None]
+                    if (block_lengths < offset_range.size).any():
+                        columns[offset_range >= block_lengths] = np.nan
+                batch_pooled[block] = reduce_rows(gathered)
+        pooled[batch_start:batch_stop] = batch_pooled.reshape(batch_stop - batch_start, -1)
+    return pooled
+
+
+def _pool_Sv_block(
+    Sv_lin: np.ndarray,
+    depth: np.ndarray,
+    func: Callable,
+    depth_bin: float,
+    num_side_pings: int,
+) -> np.ndarray:
+    """
+    Pool linear Sv of a `(channel, ping_time, range_sample)` block over windows spanning
+    `num_side_pings` on either side of each ping and `depth_bin` above and below each sample.
+
+    Windows are clipped at the edges of the block, so pings within `num_side_pings`
+    of a block edge are only exact when the block carries overlapping halo pings.
+    """
+    pooled = np.full(Sv_lin.shape, np.nan)
+    for channel_index in range(Sv_lin.shape[0]):
+        chan_Sv_lin = Sv_lin[channel_index]
+        chan_depth = depth[channel_index]
+
+        # Sort each ping by depth so that every window is a contiguous run of samples.
+        # Window membership only depends on the set of samples, so the pooled values
+        # are unchanged by this permutation.
+        order = np.argsort(chan_depth, axis=1, kind="stable")
+        sorted_depth = np.take_along_axis(chan_depth, order, axis=1)
+        sorted_Sv_lin = np.take_along_axis(chan_Sv_lin, order, axis=1)
+        lower = chan_depth - depth_bin
+        upper = chan_depth + depth_bin
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            if func is np.nanmean:
+                pooled[channel_index] = _pool_Sv_channel_mean(
+                    sorted_Sv_lin, sorted_depth, lower, upper, num_side_pings
+                )
+            else:
+                pooled[channel_index] = _pool_Sv_channel_gather(
+                    sorted_Sv_lin, sorted_depth, lower, upper, num_side_pings, func
+                )
+    return pooled
+
+
 def pool_Sv(
     ds_Sv: xr.Dataset,
     func: Callable,
@@ -36,7 +275,40 @@ def pool_Sv(
 ) -> xr.DataArray:
     """
     Compute pooled Sv array for transient noise masking.
+
+    For each sample, Sv is aggregated (in the linear domain) over all samples of the
+    same channel lying within `num_side_pings` pings and within `depth_bin` of the
+    sample's `range_var` value. Samples whose window would extend past the pings,
+    past the range of `range_var` values or above `exclude_above` are set to NaN.
+
+    Windows are found with searches over depth-sorted samples: `np.nanmean` is computed from
+    cumulative sums over the windows, and other functions, e.g. `np.nanmedian`, are applied
+    to the window samples of all pings gathered together by window size. Dask-backed Sv
+    is processed chunk by chunk along `ping_time` with `num_side_pings` halo pings.
     """
+    dims = ("channel", "ping_time", "range_sample")
+    Sv = ds_Sv["Sv"].transpose(*dims)
+    depth = ds_Sv[range_var].transpose(*dims)
+    pool_func = partial(
+        _pool_Sv_block, func=func, depth_bin=depth_bin, num_side_pings=num_side_pings
+    )
+
+    if isinstance(Sv.data, dask.array.Array):
+        # Windows span the whole `range_sample` dimension, so only `ping_time` is chunked
+        Sv_lin = _log2lin(Sv.data.rechunk({2: -1}))
+        depth_data = dask.array.asarray(depth.data).rechunk(Sv_lin.chunks)
+        pooled_Sv_lin = dask.array.map_overlap(
+            pool_func,
+            Sv_lin,
+            depth_data,
+            depth={0: 0, 1: num_side_pings, 2: 0},
+            boundary="none",
+            dtype=np.float64,
+        )
+    else:
+        pooled_Sv_lin = pool_func(_log2lin(Sv.values), np.asarray(depth.values, dtype=np.float64))
+    pooled_Sv = Sv.copy(data=_lin2log(pooled_Sv_lin))
+
     # Create ping time indices array
     ping_time_indices = xr.DataArray(
         np.arange(len(ds_Sv["ping_time"]), dtype=int),
@@ -45,65 +317,16 @@ def pool_Sv(
         name="ping_time_indices",
     )
 
-    # Create NaN pooled Sv array
-    pooled_Sv = xr.full_like(ds_Sv["Sv"], np.nan)
-
-    # Set min max values
-    depth_values_min = ds_Sv[range_var].min()
-    depth_values_max = ds_Sv[range_var].max()
-    ping_time_index_min = 0
-    ping_time_index_max = len(ds_Sv["ping_time"])
-
-    # Iterate through the channel dimension
-    for channel_index in range(len(ds_Sv["channel"])):
-
-        # Set channel arrays
-        chan_Sv = ds_Sv["Sv"].isel(channel=channel_index)
-        chan_depth = ds_Sv[range_var].isel(channel=channel_index)
-
-        # Iterate through the range sample dimension
-        for range_sample_index in range(len(ds_Sv["range_sample"])):
-
-            # Iterate through the ping time dimension
-            for ping_time_index in range(len(ds_Sv["ping_time"])):
-
-                # Grab current depth
-                current_depth = ds_Sv[range_var].isel(
-                    channel=channel_index,
-                    range_sample=range_sample_index,
-                    ping_time=ping_time_index,
-                )
-
-                # Check if current value is within a valid window
-                if (
-                    (current_depth - depth_bin >= depth_values_min)
-                    & (current_depth + depth_bin <= depth_values_max)
-                    & (current_depth - depth_bin >= exclude_above)
-                    & (ping_time_index - num_side_pings >= ping_time_index_min)
-                    & (ping_time_index + num_side_pings <= ping_time_index_max)
-                ):
-
-                    # Compute aggregate window Sv value
-                    window_mask = (
-                        (current_depth - depth_bin <= chan_depth)
-                        & (chan_depth <= current_depth + depth_bin)
-                        & (ping_time_index - num_side_pings <= ping_time_indices)
-                        & (ping_time_indices <= ping_time_index + num_side_pings)
-                    )
-                    window_Sv = chan_Sv.where(window_mask, other=np.nan).pipe(_log2lin)
-                    aggregate_window_Sv_value = window_Sv.pipe(func)
-                    aggregate_window_Sv_value = _lin2log(aggregate_window_Sv_value)
-
-                    # Put aggregate value in pooled Sv array
-                    pooled_Sv[
-                        dict(
-                            channel=channel_index,
-                            range_sample=range_sample_index,
-                            ping_time=ping_time_index,
-                        )
-                    ] = aggregate_window_Sv_value
+    # NaN out samples whose window is not fully contained within the data
+    within_window = (
+        (depth - depth_bin >= depth.min())
+        & (depth + depth_bin <= depth.max())
+        & (depth - depth_bin >= exclude_above)
+        & (ping_time_indices - num_side_pings >= 0)
+        & (ping_time_indices + num_side_pings <= len(ds_Sv["ping_time"]))
+    )
 
-    return pooled_Sv
+    return pooled_Sv.where(within_window).transpose(*ds_Sv["Sv"].dims)
 
 
 def index_binning_pool_Sv(
@@ -334,6 +557,86 @@ def echopy_impulse_noise_mask(
     return mask
 
 
+def _nanmedian_rows(a: np.ndarray) -> np.ndarray:
+    """
+    Compute `np.nanmedian` along the last axis of a 2D array, using the partition-based
+    `np.median` for rows without NaN and sorting the rows with NaN to the end otherwise,
+    since `np.nanmedian` falls back to slow masked-array reductions.
+    """
+    has_nan = np.isnan(a).any(axis=1)
+    median = np.empty(a.shape[0])
+    median[~has_nan] = np.median(a[~has_nan], axis=1)
+    sorted_rows = np.sort(a[has_nan], axis=1)
+    num_valid = np.count_nonzero(~np.isnan(sorted_rows), axis=1)
+    lower_middle = np.take_along_axis(sorted_rows, np.maximum((num_valid - 1) // 2, 0)[:, None], 1)
+    upper_middle = np.take_along_axis(sorted_rows, (num_valid // 2)[:, None], 1)
+    with np.errstate(invalid="ignore"):
+        median[has_nan] = np.where(
+            num_valid > 0, (lower_middle[:, 0] + upper_middle[:, 0]) / 2, np.nan
+        )
+    return median
+
+
+def _sorted_median(sorted_values: np.ndarray) -> float:
+    """Median of a sorted 1D array without NaN, computed as `np.median` does."""
+    num_values = len(sorted_values)
+    if num_values == 0:
+        return np.nan
+    if num_values % 2:
+        return sorted_values[num_values // 2]
+    return (sorted_values[num_values // 2 - 1] + sorted_values[num_values // 2]) / 2
+
+
+def _sorted_valid(values: np.ndarray) -> np.ndarray:
+    """Sort the non-NaN values of an array into a 1D array."""
+    values = np.sort(values, axis=None)
+    return values[: np.count_nonzero(~np.isnan(values))]
+
+
+def _sliding_block_nanmedians(
+    Sv_lin: np.ndarray,
+    pings: np.ndarray,
+    up: np.ndarray,
+    lw: np.ndarray,
+    num_side_pings: int,
+) -> np.ndarray:
+    """
+    Compute the `nanmedian` of the block of side pings of each ping in `pings`.
+
+    The sorted block values are kept from one ping to the next, so that consecutive
+    pings sharing the same layer only remove and insert a single ping's worth of values.
+    """
+    block_medians = np.full(len(pings), np.nan)
+    if num_side_pings == 0:
+        return block_medians
+
+    sorted_block = None
+    previous = None
+    for pings_index, ping_time_idx in enumerate(pings):
+        layer = slice(up[ping_time_idx], lw[ping_time_idx])
+        if previous == (ping_time_idx - 1, layer.start, layer.stop):
+            # Slide block by one ping: remove the oldest ping and insert the newest one
+            removed = _sorted_valid(Sv_lin[ping_time_idx - num_side_pings - 1, layer])
+            removed_positions = np.searchsorted(sorted_block, removed, side="left")
+            # Offset positions of repeated values so that each occurrence is removed once
+            removed_positions += np.arange(len(removed)) - np.searchsorted(
+                removed, removed, side="left"
+            )
+            sorted_block = np.delete(sorted_block, removed_positions)
+            inserted = _sorted_valid(Sv_lin[ping_time_idx + num_side_pings - 1, layer])
+            sorted_block = np.insert(
+                sorted_block, np.searchsorted(sorted_block, inserted), inserted
+            )
+        else:
+            sorted_block = _sorted_valid(
+                Sv_lin[ping_time_idx - num_side_pings : ping_time_idx + num_side_pings, layer]
+            )
+        block_medians[pings_index] = _sorted_median(sorted_block)
+        previous = (ping_time_idx, layer.start, layer.stop)
+
+    return block_medians
+
+
 def echopy_attenuated_signal_mask(
     Sv: np.ndarray,
     range_var: np.ndarray,
@@ -346,37 +649,61 @@ def echopy_attenuated_signal_mask(
     # Initialize mask
     attenuated_mask = np.zeros(Sv.shape, dtype=bool)
 
-    for ping_time_idx in range(Sv.shape[0]):
-
-        # Find indices for upper and lower SL limits
-        up = np.argmin(abs(range_var[ping_time_idx, :] - upper_limit_sl))
-        lw = np.argmin(abs(range_var[ping_time_idx, :] - lower_limit_sl))
-
-        # Mask when attenuation masking is feasible
-        if not (
-            (ping_time_idx - num_side_pings < 0)
-            | (ping_time_idx + num_side_pings > Sv.shape[0] - 1)
-            | np.all(np.isnan(Sv[ping_time_idx, up:lw]))
-        ):
-            # Compare ping and block medians, and mask ping if difference greater than
-            # threshold.
-            pingmedian = _lin2log(np.nanmedian(_log2lin(Sv[ping_time_idx, up:lw])))
-            blockmedian = _lin2log(
-                np.nanmedian(
-                    _log2lin(
-                        Sv[
-                            (ping_time_idx - num_side_pings) : (ping_time_idx + num_side_pings),
-                            up:lw,
-                        ]
-                    )
-                )
-            )
-            if (pingmedian - blockmedian) < attenuation_signal_threshold:
-                attenuated_mask[ping_time_idx, :] = True
+    # Find indices for upper and lower SL limits of all pings
+    up = np.argmin(abs(range_var - upper_limit_sl), axis=1)
+    lw = np.argmin(abs(range_var - lower_limit_sl), axis=1)
+
+    # Mask when attenuation masking is feasible
+    ping_time_indices = np.arange(Sv.shape[0])
+    feasible = (ping_time_indices - num_side_pings >= 0) & (
+        ping_time_indices + num_side_pings <= Sv.shape[0] - 1
+    )
+    Sv_lin = _log2lin(Sv)
+    pingmedian = np.full(Sv.shape[0], np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        # Compute ping medians of all pings sharing the same layer at once
+        for layer_up, layer_lw in set(zip(up[feasible], lw[feasible])):
+            layer_pings = ping_time_indices[feasible & (up == layer_up) & (lw == layer_lw)]
+            layer_Sv_lin = Sv_lin[layer_pings, layer_up:layer_lw]
+            if layer_Sv_lin.shape[1] == 0:
+                feasible[layer_pings] = False
+                continue
+            feasible[layer_pings] = ~np.all(np.isnan(layer_Sv_lin), axis=1)
+            pingmedian[layer_pings] = _nanmedian_rows(layer_Sv_lin)
+
+    # Compare ping and block medians, and mask ping if difference greater than
+    # threshold.
+    pings = ping_time_indices[feasible]
+    blockmedian = _sliding_block_nanmedians(Sv_lin, pings, up, lw, num_side_pings)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        attenuated = (_lin2log(pingmedian[pings]) - _lin2log(blockmedian)) < (
+            attenuation_signal_threshold
+        )
+    attenuated_mask[pings[attenuated]] = True
 
     return attenuated_mask
 
 
+def _attenuated_signal_mask_block(
+    Sv: np.ndarray,
+    range_var: np.ndarray,
+    **kwargs,
+) -> np.ndarray:
+    """
+    Attenuated signal mask of a `(channel, ping_time, range_sample)` block.
+
+    Pings within `num_side_pings` of a block edge are left unmasked, so blocks
+    must carry overlapping halo pings to reproduce the whole-array mask.
+    """
+    return np.stack(
+        [
+            echopy_attenuated_signal_mask(chan_Sv, chan_range_var, **kwargs)
+            for chan_Sv, chan_range_var in zip(Sv, range_var)
+        ]
+    ).reshape(Sv.shape)
+
+
 def add_remove_background_noise_attrs(
     da: xr.DataArray,
     sv_type: str,
@@ -8,11 +8,20 @@ import xarray as xr
 from flox.xarray import xarray_reduce
 from geopy import distance
 
+from ..calibrate.range import PING_INVARIANT_ATTR
 from ..consolidate.api import POSITION_VARIABLES
 from ..utils.compute import _lin2log, _log2lin
 
 logger = logging.getLogger(__name__)
 
+# WGS-84 ellipsoid semi-major axis (m) and flattening
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+# mean radius of the Earth (m), same as geopy.distance.EARTH_RADIUS
+EARTH_RADIUS_M = 6371009.0
+# meters in a nautical mile
+NMI_IN_M = 1852.0
+
 
 def compute_raw_MVBS(
     ds_Sv: xr.Dataset,
@@ -194,24 +203,141 @@ def compute_raw_NASC(
     return xr.merge([ds, ds_ping_time, raw_NASC])
 
 
-def get_distance_from_latlon(ds_Sv):
-    # Get distance from lat/lon in nautical miles
-    df_pos = ds_Sv["latitude"].to_dataframe().join(ds_Sv["longitude"].to_dataframe())
-    df_pos["latitude_prev"] = df_pos["latitude"].shift(-1)
-    df_pos["longitude_prev"] = df_pos["longitude"].shift(-1)
-    df_latlon_nonan = df_pos.dropna().copy()
-    df_latlon_nonan["dist"] = df_latlon_nonan.apply(
-        lambda x: distance.distance(
-            (x["latitude"], x["longitude"]),
-            (x["latitude_prev"], x["longitude_prev"]),
-        ).nm,
-        axis=1,
+def _haversine_distance(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance in meters between two sets of points on a sphere
+    with the mean radius of the Earth.
+
+    Only NumPy ufuncs are used so that the inputs can be NumPy or dask arrays.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1, lon1, lat2, lon2))
+    hav = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
     )
-    df_pos = df_pos.join(df_latlon_nonan["dist"], how="left")
-    df_pos["dist"] = df_pos["dist"].cumsum()
-    df_pos["dist"] = df_pos["dist"].ffill().bfill()
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(hav, 0, 1)))
 
-    return df_pos["dist"].values
+
+def _geodesic_distance(lat1, lon1, lat2, lon2, max_iter=200, tol=1e-12):
+    """
+    Geodesic distance in meters between two sets of points on the WGS-84 ellipsoid,
+    computed with the Vincenty inverse formula on NumPy arrays.
+
+    The rare pairs for which the iteration does not converge (nearly antipodal points)
+    are computed with ``geopy.distance.geodesic``.
+    """
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (lat1, lon1, lat2, lon2))
+    )
+    a, f = WGS84_A, WGS84_F
+    b = (1 - f) * a
+
+    U1 = np.arctan((1 - f) * np.tan(np.radians(lat1)))
+    U2 = np.arctan((1 - f) * np.tan(np.radians(lat2)))
+    sinU1, cosU1 = np.sin(U1), np.cos(U1)
+    sinU2, cosU2 = np.sin(U2), np.cos(U2)
+    L = np.radians(lon2 - lon1)
+
+    lam = L
+    converged = np.isnan(L) | np.isnan(U1) | np.isnan(U2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for _ in range(max_iter):
+            sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+            sin_sigma = np.hypot(cosU2 * sin_lam, cosU1 * sinU2 - sinU1 * cosU2 * cos_lam)
+            cos_sigma = sinU1 * sinU2 + cosU1 * cosU2 * cos_lam
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+            # coincident points have sin_sigma == 0
+            sin_alpha = np.where(sin_sigma == 0, 0, cosU1 * cosU2 * sin_lam / sin_sigma)
+            cos2_alpha = 1 - sin_alpha**2
+            # points on the equator have cos2_alpha == 0
+            cos_2sigma_m = np.where(cos2_alpha == 0, 0, cos_sigma - 2 * sinU1 * sinU2 / cos2_alpha)
+            C = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+            lam_prev = lam
+            lam = L + (1 - C) * f * sin_alpha * (
+                sigma + C * sin_sigma * (cos_2sigma_m + C * cos_sigma * (-1 + 2 * cos_2sigma_m**2))
+            )
+            converged |= np.abs(lam - lam_prev) <= tol
+            if np.all(converged):
+                break
+
+        u2 = cos2_alpha * (a**2 - b**2) / b**2
+        A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+        B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+        delta_sigma = (
+            B
+            * sin_sigma
+            * (
+                cos_2sigma_m
+                + B
+                / 4
+                * (
+                    cos_sigma * (-1 + 2 * cos_2sigma_m**2)
+                    - B / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma**2) * (-3 + 4 * cos_2sigma_m**2)
+                )
+            )
+        )
+        dist = b * A * (sigma - delta_sigma)
+
+    for idx in zip(*np.nonzero(~converged)):
+        dist[idx] = distance.geodesic((lat1[idx], lon1[idx]), (lat2[idx], lon2[idx])).m
+    return dist
+
+
+def get_distance_from_latlon(
+    ds_Sv: xr.Dataset, method: Literal["geodesic", "haversine"] = "geodesic"
+) -> np.ndarray:
+    """
+    Get the cumulative distance in nautical miles along the ``latitude``
+    and ``longitude`` of each ping in ``ds_Sv``.
+
+    The distance of each ping is the cumulative sum of the distances
+    between consecutive pings with valid positions.
+    Pings before the first valid distance take the first cumulative distance.
+
+    Parameters
+    ----------
+    ds_Sv : xr.Dataset
+        A dataset containing ``latitude`` and ``longitude`` along ``ping_time``.
+        Positions can be NumPy or dask arrays.
+    method : {'geodesic', 'haversine'}, default 'geodesic'
+        ``geodesic`` computes the exact distance on the WGS-84 ellipsoid
+        (same as ``geopy.distance.distance``),
+        ``haversine`` computes the faster great-circle distance on a sphere.
+
+    Returns
+    -------
+    np.ndarray
+        Cumulative distance of each ping in nautical miles
+    """
+    if method == "geodesic":
+        kernel = _geodesic_distance
+    elif method == "haversine":
+        kernel = _haversine_distance
+    else:
+        raise ValueError("method must be one of 'geodesic' or 'haversine'")
+
+    lat, lon = ds_Sv["latitude"], ds_Sv["longitude"]
+    # Distance between each ping and the next one,
+    # NaN if either position is NaN (which includes the last ping)
+    dist = (
+        xr.apply_ufunc(
+            kernel,
+            lat,
+            lon,
+            lat.shift(ping_time=-1),
+            lon.shift(ping_time=-1),
+            dask="parallelized",
+            output_dtypes=[np.float64],
+        )
+        / NMI_IN_M
+    )
+    valid = dist.notnull()
+    cum_dist = dist.fillna(0).cumsum("ping_time")
+    # Pings before the first valid distance take the first cumulative distance,
+    # which is also the smallest one since the cumulative distance never decreases
+    cum_dist = cum_dist.where(valid.cumsum("ping_time") > 0, cum_dist.where(valid).min())
+
+    return cum_dist.values
 
 
 def _set_var_attrs(da, long_name, units, round_digits, standard_name=None):
@@ -488,6 +614,78 @@ def _get_reduced_positions(
     return ds_X
 
 
+def _get_ping_invariant_range(
+    da_range: xr.DataArray, x_dim: str = "ping_time"
+) -> Optional[xr.DataArray]:
+    """
+    Get the range of each channel and range sample if ``da_range``
+    is marked as constant along ``x_dim`` wherever it is not NaN,
+    as the lazily broadcast ``echo_range`` from ``compute_Sv``.
+
+    Returns ``None`` if the range is not marked as constant along ``x_dim``,
+    e.g. for ``depth`` or a range modified after calibration.
+    """
+    if x_dim not in da_range.dims:
+        return da_range
+    if x_dim == "ping_time" and da_range.attrs.get(PING_INVARIANT_ATTR) == 1:
+        # Lazily reduced along with the aggregated data
+        return da_range.max(x_dim)
+    return None
+
+
+def _groupby_x_along_ping_invariant_range(
+    ds_Sv: xr.Dataset,
+    range_1d: xr.DataArray,
+    range_interval: Union[pd.IntervalIndex, np.ndarray],
+    x_interval: Union[pd.IntervalIndex, np.ndarray],
+    x_var: Literal["ping_time", "distance_nmi"] = "ping_time",
+    range_var: Literal["echo_range", "depth"] = "echo_range",
+    method: str = "map-reduce",
+    **flox_kwargs,
+) -> xr.DataArray:
+    """
+    Perform the 'sv' mean groupby of ``_groupby_x_along_channels`` with ``skipna=True``
+    when the range does not vary along ``x_var``.
+
+    The range bins only depend on the channel and range sample, so ``sv`` is first summed
+    over the range bins of ``range_1d`` and then over the ``x_var`` bins,
+    instead of grouping by a range of the size of ``sv``.
+    """
+    # Samples without range are not aggregated
+    sv = ds_Sv["Sv"].pipe(_log2lin).where(ds_Sv[range_var].notnull())
+    range_1d = range_1d.rename(range_var)
+    x_dim = ds_Sv[x_var].dims[0]
+
+    reduced = []
+    for da, func in [(sv, "nansum"), (sv.notnull(), "sum")]:
+        da = xarray_reduce(
+            da,
+            ds_Sv["channel"],
+            range_1d,
+            expected_groups=(None, range_interval),
+            isbin=[False, True],
+            method=method,
+            func=func,
+            **flox_kwargs,
+        )
+        da = xarray_reduce(
+            da,
+            da["channel"],
+            ds_Sv[x_var].drop_vars([c for c in ds_Sv[x_var].coords if c != x_dim]),
+            expected_groups=(None, x_interval),
+            isbin=[False, True],
+            method=method,
+            func="sum",
+            **flox_kwargs,
+        )
+        reduced.append(da.transpose("channel", f"{x_var}_bins", f"{range_var}_bins"))
+
+    sv_sum, sv_count = reduced
+    sv_mean = sv_sum / sv_count.where(sv_count > 0)
+    sv_mean.name = "Sv"
+    return sv_mean
+
+
 def _groupby_x_along_channels(
     ds_Sv: xr.Dataset,
     range_interval: Union[pd.IntervalIndex, np.ndarray],
@@ -563,9 +761,6 @@ def _groupby_x_along_channels(
         logger.warning("x_var is 'distance_nmi', setting range_var to 'depth'")
         range_var = "depth"
 
-    # average should be done in linear domain
-    sv = ds_Sv["Sv"].pipe(_log2lin)
-
     # Check for any NaNs in the coordinate arrays:
     named_arrays = {
         x_var: ds_Sv[x_var].data,
@@ -582,6 +777,25 @@ def _groupby_x_along_channels(
                 f"The ```{array_name}``` coordinate array contain NaNs. {aggregation_msg}"
             )
 
+    # fast path when the range does not vary from ping to ping,
+    # which gives the same mean when NaN values are skipped
+    if skipna and func in ["nanmean", "mean"] and ds_Sv[x_var].ndim == 1:
+        range_1d = _get_ping_invariant_range(ds_Sv[range_var], ds_Sv[x_var].dims[0])
+        if range_1d is not None:
+            return _groupby_x_along_ping_invariant_range(
+                ds_Sv,
+                range_1d,
+                range_interval,
+                x_interval,
+                x_var=x_var,
+                range_var=range_var,
+                method=method,
+                **flox_kwargs,
+            )
+
+    # average should be done in linear domain
+    sv = ds_Sv["Sv"].pipe(_log2lin)
+
     # reduce along ping_time or distance_nmi
     # and echo_range or depth
     # by binning and averaging
@@ -316,6 +316,7 @@ def add_splitbeam_angle(
     pulse_compression: bool = False,
     storage_options: dict = {},
     to_disk: bool = True,
+    pulse_compression_dtype: Union[str, np.dtype] = np.complex64,
 ) -> xr.Dataset:
     """
     Add split-beam (alongship/athwartship) angles into the Sv dataset.
@@ -357,6 +358,9 @@ def add_splitbeam_angle(
         If ``False``, ``to_disk`` with split-beam angles added will be returned.
         ``to_disk=True`` is useful when ``source_Sv`` is a path and
         users only want to write the split-beam angle data to this path.
+    pulse_compression_dtype: str or np.dtype, default np.complex64
+        Complex dtype of the pulse compression, used only if ``pulse_compression=True``.
+        ``np.complex128`` doubles the precision and the memory footprint.
 
     Returns
     -------
@@ -469,7 +473,9 @@ def add_splitbeam_angle(
                 echodata["Vendor_specific"].sel(channel=source_Sv["channel"].values)
             )
             pc_params["receiver_sampling_frequency"] = source_Sv["receiver_sampling_frequency"]
-            theta, phi = get_angle_complex_samples(ds_beam, angle_params, pc_params)
+            theta, phi = get_angle_complex_samples(
+                ds_beam, angle_params, pc_params, pc_dtype=pulse_compression_dtype
+            )
         else:  # without pulse compression
             # operation is identical with CW complex data
             theta, phi = get_angle_complex_samples(ds_beam, angle_params)
@@ -3,7 +3,7 @@ Contains functions necessary to compute the split-beam (alongship/athwartship)
 angles and add them to a Dataset.
 """
 
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
 import numpy as np
 import xarray as xr
@@ -151,7 +151,10 @@ def get_angle_power_samples(
 
 
 def get_angle_complex_samples(
-    ds_beam: xr.Dataset, angle_params: dict, pc_params: dict = None
+    ds_beam: xr.Dataset,
+    angle_params: dict,
+    pc_params: dict = None,
+    pc_dtype: Union[str, np.dtype] = np.complex64,
 ) -> Tuple[xr.DataArray, xr.DataArray]:
     """
     Obtain split-beam angle from CW or BB mode complex samples.
@@ -166,6 +169,8 @@ def get_angle_complex_samples(
     pc_params : dict
         Parameters needed for pulse compression
         This dict also serves as a flag for whether to apply pulse compression
+    pc_dtype : str or np.dtype, default np.complex64
+        Complex dtype of the pulse compression
 
     Returns
     -------
@@ -186,7 +191,7 @@ def get_angle_complex_samples(
             waveform_mode="BB",
             fs=pc_params["receiver_sampling_frequency"],  # this is the added fs
         )
-        bs = compress_pulse(backscatter=bs, chirp=tx)  # has beam dim
+        bs = compress_pulse(backscatter=bs, chirp=tx, dtype=pc_dtype)  # has beam dim
         bs = bs / get_norm_fac(chirp=tx)  # normalization for each channel
 
     # Compute angles
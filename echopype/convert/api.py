@@ -1,7 +1,17 @@
+import json
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, Literal, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Tuple, Union
 
+import dask
 import fsspec
+import pandas as pd
+import xarray as xr
+import zarr
+from dask.array import Array as DaskArray
+from dask.array.core import normalize_chunks
 from datatree import DataTree
 
 # fmt: off
@@ -12,12 +22,19 @@ if TYPE_CHECKING:
     from ..core import EngineHint, PathHint, SonarModelsHint
 # fmt: on
 from ..echodata.echodata import XARRAY_ENGINE_MAP, EchoData
+from ..echodata.summary import SUMMARY_ATTR, compute_vendor_hashes
 from ..utils import io
 from ..utils.coding import COMPRESSION_SETTINGS
 from ..utils.log import _init_logger
 from ..utils.prov import add_processing_level
+from ..utils.ragged import to_ragged
 
 BEAM_SUBGROUP_DEFAULT = "Beam_group1"
+# Groups that can be selected with ``open_raw(include=...)``
+# Top-level and Provenance groups are always included
+INCLUDE_GROUPS = ["Environment", "Platform", "Platform/NMEA", "Sonar", "Vendor_specific"]
+# Size of the ``ping_time`` chunks written concurrently with ``parallel=True``
+PARALLEL_CHUNK_SIZE = "10MB"
 
 # Logging setup
 logger = _init_logger(__name__)
@@ -48,7 +65,9 @@ def to_file(
         whether or not to overwrite existing files
         Defaults to ``False``
     parallel : bool
-        whether or not to use parallel processing. (Not yet implemented)
+        whether or not to write all groups concurrently in a single dask graph,
+        consolidating metadata once at the end. Only available for zarr.
+        Defaults to ``False``
     output_storage_options : dict
         Additional keywords to pass to the filesystem class.
     **kwargs : dict, optional
@@ -57,10 +76,10 @@ def to_file(
         for a list of all possible arguments.
 
     """
-    if parallel:
-        raise NotImplementedError("Parallel conversion is not yet implemented.")
     if engine not in XARRAY_ENGINE_MAP.values():
         raise ValueError("Unknown type to convert file to!")
+    if parallel and engine != "zarr":
+        raise NotImplementedError("Parallel group writes are only implemented for zarr.")
 
     # Assemble output file names and path
     output_file = io.validate_output_path(
@@ -92,6 +111,7 @@ def to_file(
             ),
             engine=engine,
             compress=compress,
+            parallel=parallel,
             **kwargs,
         )
 
@@ -99,121 +119,136 @@ def to_file(
     echodata.converted_raw_path = output_file
 
 
-def _save_groups_to_file(echodata, output_path, engine, compress=True, **kwargs):
-    """Serialize all groups to file."""
-    # TODO: in terms of chunking, would using rechunker at the end be faster and more convenient?
-    # TODO: investigate chunking before we save Dataset to a file
-
+def _get_groups_to_save(echodata: EchoData) -> List[Tuple[Optional[str], xr.Dataset]]:
+    """
+    List the group paths and datasets to serialize, in writing order.
+    Groups left out of the conversion, e.g. with ``open_raw(include=...)``, are skipped.
+    """
     # Top-level group
-    io.save_file(
-        echodata["Top-level"],
-        path=output_path,
-        mode="w",
-        engine=engine,
-        compression_settings=COMPRESSION_SETTINGS[engine] if compress else None,
-        **kwargs,
-    )
-
-    # Environment group
-    io.save_file(
-        echodata["Environment"],  # TODO: chunking necessary?
-        path=output_path,
-        mode="a",
-        engine=engine,
-        group="Environment",
-        compression_settings=COMPRESSION_SETTINGS[engine] if compress else None,
-        **kwargs,
-    )
+    groups = [(None, echodata["Top-level"])]
 
-    # Platform group
-    io.save_file(
-        echodata["Platform"],  # TODO: chunking necessary? time1 and time2 (EK80) only
-        path=output_path,
-        mode="a",
-        engine=engine,
-        group="Platform",
-        compression_settings=COMPRESSION_SETTINGS[engine] if compress else None,
-        **kwargs,
-    )
+    # Environment and Platform groups
+    # TODO: chunking necessary? time1 and time2 (EK80) only
+    groups.append(("Environment", echodata["Environment"]))
+    groups.append(("Platform", echodata["Platform"]))
 
     # Platform/NMEA group: some sonar model does not produce NMEA data
     if echodata["Platform/NMEA"] is not None:
-        io.save_file(
-            echodata["Platform/NMEA"],  # TODO: chunking necessary?
-            path=output_path,
-            mode="a",
-            engine=engine,
-            group="Platform/NMEA",
-            compression_settings=COMPRESSION_SETTINGS[engine] if compress else None,
-            **kwargs,
+        groups.append(("Platform/NMEA", echodata["Platform/NMEA"]))
+
+    # Provenance and Sonar groups, with the Vendor_specific hashes used to check combinations
+    groups.append(
+        (
+            "Provenance",
+            echodata["Provenance"].assign_attrs(
+                {SUMMARY_ATTR: json.dumps(compute_vendor_hashes(echodata))}
+            ),
         )
-
-    # Provenance group
-    io.save_file(
-        echodata["Provenance"],
-        path=output_path,
-        group="Provenance",
-        mode="a",
-        engine=engine,
-        compression_settings=COMPRESSION_SETTINGS[engine] if compress else None,
-        **kwargs,
-    )
-
-    # Sonar group
-    io.save_file(
-        echodata["Sonar"],
-        path=output_path,
-        group="Sonar",
-        mode="a",
-        engine=engine,
-        compression_settings=COMPRESSION_SETTINGS[engine] if compress else None,
-        **kwargs,
     )
+    groups.append(("Sonar", echodata["Sonar"]))
 
     # /Sonar/Beam_groupX group
     if echodata.sonar_model == "AD2CP":
-        for i in range(1, len(echodata["Sonar"]["beam_group"]) + 1):
-            io.save_file(
-                echodata[f"Sonar/Beam_group{i}"],
-                path=output_path,
-                mode="a",
-                engine=engine,
-                group=f"Sonar/Beam_group{i}",
-                compression_settings=COMPRESSION_SETTINGS[engine] if compress else None,
-                **kwargs,
-            )
+        num_beam_groups = 0 if echodata["Sonar"] is None else len(echodata["Sonar"]["beam_group"])
+        for i in range(1, num_beam_groups + 1):
+            groups.append((f"Sonar/Beam_group{i}", echodata[f"Sonar/Beam_group{i}"]))
     else:
+        groups.append(
+            (f"Sonar/{BEAM_SUBGROUP_DEFAULT}", echodata[f"Sonar/{BEAM_SUBGROUP_DEFAULT}"])
+        )
+        if echodata["Sonar/Beam_group2"] is not None:
+            # some sonar model does not produce Sonar/Beam_group2
+            groups.append(("Sonar/Beam_group2", echodata["Sonar/Beam_group2"]))
+
+    # Vendor_specific group
+    groups.append(("Vendor_specific", echodata["Vendor_specific"]))
+
+    return [(group, ds) for group, ds in groups if ds is not None]
+
+
+def _save_groups_to_file(echodata, output_path, engine, compress=True, parallel=False, **kwargs):
+    """Serialize all groups to file."""
+    # TODO: in terms of chunking, would using rechunker at the end be faster and more convenient?
+    # TODO: investigate chunking before we save Dataset to a file
+    groups = _get_groups_to_save(echodata)
+    compression_settings = COMPRESSION_SETTINGS[engine] if compress else None
+
+    if parallel and engine == "zarr":
+        _save_groups_to_zarr_concurrently(groups, output_path, compression_settings, **kwargs)
+        return
+
+    for group, ds in groups:
         io.save_file(
-            echodata[f"Sonar/{BEAM_SUBGROUP_DEFAULT}"],
+            ds,
             path=output_path,
-            mode="a",
+            mode="w" if group is None else "a",
             engine=engine,
-            group=f"Sonar/{BEAM_SUBGROUP_DEFAULT}",
-            compression_settings=COMPRESSION_SETTINGS[engine] if compress else None,
+            group=group,
+            compression_settings=compression_settings,
             **kwargs,
         )
-        if echodata["Sonar/Beam_group2"] is not None:
-            # some sonar model does not produce Sonar/Beam_group2
+
+
+def _save_groups_to_zarr_concurrently(
+    groups: List[Tuple[Optional[str], xr.Dataset]],
+    output_path: Union[Path, fsspec.FSMap],
+    compression_settings: Optional[dict],
+    consolidated: bool = True,
+    **kwargs,
+):
+    """
+    Serialize all groups to zarr, writing the data of all groups together in one dask graph.
+
+    Group metadata are written in order so that parent groups exist before their children,
+    while array data writes are deferred and computed together once all groups are set up.
+    Metadata are consolidated once after all groups are written.
+    In-memory variables are chunked along ``ping_time`` so that their chunks are written
+    concurrently, with or without compression.
+    """
+    writes = []
+    for group, ds in groups:
+        # Defer in-memory data variables so that their writes join the dask graph.
+        # String variables are small and are written along with the group metadata.
+        ds = ds.copy()
+        for var in ds.data_vars:
+            if (
+                ds[var].ndim > 0
+                and not isinstance(ds[var].data, DaskArray)
+                and ds[var].dtype.kind in "biufcmM"
+            ):
+                ds[var] = ds[var].chunk(_get_ping_time_chunks(ds[var]))
+        writes.append(
             io.save_file(
-                echodata["Sonar/Beam_group2"],
+                ds,
                 path=output_path,
-                mode="a",
-                engine=engine,
-                group="Sonar/Beam_group2",
-                compression_settings=COMPRESSION_SETTINGS[engine] if compress else None,
+                mode="w" if group is None else "a",
+                engine="zarr",
+                group=group,
+                compression_settings=compression_settings,
+                consolidated=False,
+                compute=False,
                 **kwargs,
             )
+        )
+    dask.compute(*writes)
 
-    # Vendor_specific group
-    io.save_file(
-        echodata["Vendor_specific"],  # TODO: chunking necessary?
-        path=output_path,
-        mode="a",
-        engine=engine,
-        group="Vendor_specific",
-        compression_settings=COMPRESSION_SETTINGS[engine] if compress else None,
-        **kwargs,
+    if consolidated:
+        zarr.consolidate_metadata(
+            output_path if isinstance(output_path, fsspec.FSMap) else str(output_path)
+        )
+
+
+def _get_ping_time_chunks(da: xr.DataArray) -> Dict[str, Any]:
+    """Get chunks of ``PARALLEL_CHUNK_SIZE`` along ``ping_time``, a single chunk otherwise."""
+    if "ping_time" not in da.dims:
+        return {}
+    chunks = normalize_chunks(
+        tuple("auto" if dim == "ping_time" else -1 for dim in da.dims),
+        shape=da.shape,
+        limit=PARALLEL_CHUNK_SIZE,
+        dtype=da.dtype,
     )
+    return dict(zip(da.dims, chunks))
 
 
 def _set_convert_params(param_dict: Dict[str, str]) -> Dict[str, str]:
@@ -354,6 +389,13 @@ def open_raw(
     storage_options: Optional[Dict[str, str]] = None,
     use_swap: Union[bool, Literal["auto"]] = False,
     max_chunk_size: str = "100MB",
+    include: Optional[List[str]] = None,
+    time_range: Optional[Tuple[Any, Any]] = None,
+    channels: Optional[List[str]] = None,
+    native_dtypes: bool = True,
+    ping_block_size: Optional[int] = None,
+    ragged_samples: bool = False,
+    n_workers: int = 1,
 ) -> EchoData:
     """Create an EchoData object containing parsed data from a single raw data file.
 
@@ -395,6 +437,59 @@ def open_raw(
     max_mb : int
         The maximum data chunk size in Megabytes (MB), when offloading
         variables with a large memory footprint to a temporary zarr store
+    include : list of str, optional
+        Names of the groups to set, among "Environment", "Platform", "Platform/NMEA",
+        "Sonar" (including all ``Sonar/Beam_groupX`` groups) and "Vendor_specific".
+        The Top-level and Provenance groups are always set.
+        For EK60, ES70, EK80, ES80 and EA640 files, only the datagrams needed by these groups
+        are decoded, and the backscatter samples are only decoded if "Sonar" is included,
+        so that metadata or navigation data are obtained much faster than with a full parse.
+        Defaults to ``None``, which sets all groups.
+    time_range : tuple, optional
+        Start and end times (inclusive) of the pings, NMEA and MRU data to convert,
+        e.g. ``("2017-06-20T01:10", "2017-06-20T01:15")``.
+        Datagrams outside of this window are skipped before their samples are decoded.
+        Only used by EK60, ES70, EK80, ES80 and EA640.
+    channels : list of str, optional
+        IDs of the channels to convert, e.g. ``["GPT  38 kHz 009072033fa2 2-1 ES38B"]``.
+        Datagrams of other channels are skipped before their samples are decoded.
+        Only used by EK60, ES70, EK80, ES80 and EA640.
+    native_dtypes : bool, default True
+        Keep the power and angle samples in their native int16 and int8 dtypes
+        when rectangularizing, and the complex samples in float32.
+        The power and angle samples are decoded lazily to float32,
+        with the padding of shorter pings tracked by the number of samples of each ping,
+        and are stored as int16 packed integers with CF ``scale_factor``
+        and ``_FillValue`` encodings, which are decoded to float32 by ``open_converted``.
+        The smallest int16 power value, below -385 dB, is reserved for the padding
+        and read back as NaN.
+        This reduces the memory footprint of the conversion
+        and the size of the angle samples in the converted files.
+        Only used by EK60, ES70, EK80, ES80 and EA640.
+    ping_block_size : int, optional
+        Stream the samples to a temporary zarr store while parsing, in blocks of
+        ``ping_block_size`` pings per channel, instead of holding all pings in memory.
+        The memory used for the samples is then bounded regardless of the file size,
+        and ``use_swap`` is ignored.
+        Defaults to ``None``, which holds all samples in memory until rectangularized.
+        Only used by EK60, ES70, EK80, ES80 and EA640.
+    ragged_samples : bool, default False
+        Store the samples of the ``Sonar/Beam_groupX`` groups as contiguous ragged arrays,
+        with the number of samples of each channel and ping in ``sample_count``,
+        instead of padding all channels and pings to the longest ping.
+        This reduces the memory and disk footprint of files mixing channels
+        with very different numbers of samples.
+        The samples are padded on demand when calibrating,
+        or with ``echopype.utils.ragged.from_ragged``.
+        Only used by EK60, ES70, EK80, ES80 and EA640.
+    n_workers : int, default 1
+        Number of worker processes parsing the raw file.
+        With ``n_workers > 1``, the file is indexed and split into datagram-aligned
+        byte ranges, whose datagrams are decoded and assembled into per-channel pings
+        in a process pool. The pings of each channel are then merged in timestamp order.
+        This speeds up the conversion of large files on multi-core machines,
+        but cannot be combined with ``ping_block_size``.
+        Only used by EK60, ES70, EK80, ES80 and EA640.
 
 
     Returns
@@ -421,7 +516,11 @@ def open_raw(
     Users can override this behaviour by either passing
     ``use_swap=True`` or ``use_swap=False``. If a keyword "auto" is
     used for the ``use_swap`` parameter, echopype will determine the usage of
-    swap space automatically.
+    swap space automatically. The plan of the samples swapped to disk is then
+    available as the ``memory_plan`` attribute of the returned ``EchoData``:
+    its ``"variables"`` entry gives the expanded size in bytes and ``use_swap``
+    of each (raw type, data type, channel) of samples, along with the
+    ``"predicted_peak_rss"`` and ``"actual_peak_rss"`` peak memory in bytes.
 
     This feature is only available for the following
     echosounders: EK60, ES70, EK80, ES80, EA640.
@@ -438,6 +537,14 @@ def open_raw(
     if sonar_model is None:
         raise ValueError("Sonar model must be specified.")
 
+    if include is not None:
+        invalid_groups = [group for group in include if group not in INCLUDE_GROUPS]
+        if invalid_groups:
+            raise ValueError(
+                f"Cannot include groups {invalid_groups}: must be among {INCLUDE_GROUPS}"
+            )
+    include_groups = INCLUDE_GROUPS if include is None else include
+
     # Check inputs
     if convert_params is None:
         convert_params = {}
@@ -451,6 +558,24 @@ def open_raw(
         raise ValueError(
             f"Unsupported echosounder model: {sonar_model}\nMust be one of: {list(SONAR_MODELS)}"  # noqa
         )
+    if (time_range is not None or channels is not None) and sonar_model not in [
+        "EK60",
+        "ES70",
+        "EK80",
+        "ES80",
+        "EA640",
+    ]:
+        raise ValueError(
+            "Selecting a time range or channels is only supported for "
+            "EK60, ES70, EK80, ES80 and EA640 data."
+        )
+    if n_workers > 1 and sonar_model not in ["EK60", "ES70", "EK80", "ES80", "EA640"]:
+        raise ValueError(
+            "Parsing with several workers is only supported for "
+            "EK60, ES70, EK80, ES80 and EA640 data."
+        )
+    if n_workers > 1 and ping_block_size is not None:
+        raise ValueError("ping_block_size cannot be combined with n_workers > 1")
 
     # Check file extension and existence
     file_chk, xml_chk, bot_chk, idx_chk = _check_file(
@@ -469,18 +594,48 @@ def open_raw(
         sonar_model=sonar_model,
     )
     # Actually parse the raw datagrams from source file
-    parser.parse_raw()
+    if sonar_model in ["EK60", "ES70", "EK80", "ES80", "EA640"]:
+        if ping_block_size is not None and "Sonar" in include_groups:
+            # Stream the samples in blocks of pings while parsing
+            parser.stream_samples(ping_block_size=ping_block_size, native_dtypes=native_dtypes)
+        parser.parse_raw(
+            include=include, time_range=time_range, channels=channels, n_workers=n_workers
+        )
+    else:
+        parser.parse_raw()
 
     # Direct offload to zarr and rectangularization only available for some sonar models
     # No rectangularization for other sonar models not listed below
-    if sonar_model in ["EK60", "ES70", "EK80", "ES80", "EA640"]:
+    if sonar_model in ["EK60", "ES70", "EK80", "ES80", "EA640"] and "Sonar" in include_groups:
         # Perform rectangularization and offload to zarr
         # if the data expansion is too large to fit in memory
         parser.rectangularize_data(
             use_swap=use_swap,
             max_chunk_size=max_chunk_size,
+            native_dtypes=native_dtypes,
         )
 
+    return _parser_to_echodata(
+        parser,
+        sonar_model=sonar_model,
+        file_chk=file_chk,
+        xml_chk=xml_chk,
+        include_groups=include_groups,
+        convert_params=convert_params,
+        ragged_samples=ragged_samples,
+    )
+
+
+def _parser_to_echodata(
+    parser,
+    sonar_model: "SonarModelsHint",
+    file_chk: str,
+    xml_chk: Optional[str],
+    include_groups: List[str],
+    convert_params: Dict[str, str],
+    ragged_samples: bool = False,
+) -> EchoData:
+    """Set the groups of ``include_groups`` from the parsed data and assemble them into EchoData."""
     setgrouper = SONAR_MODELS[sonar_model]["set_groups"](
         parser,
         input_file=file_chk,
@@ -504,42 +659,279 @@ def open_raw(
         tree_dict["/"] = setgrouper.set_toplevel(
             sonar_model=sonar_model, date_created=parser.ping_time[0]
         )
-    tree_dict["Environment"] = setgrouper.set_env()
-    tree_dict["Platform"] = setgrouper.set_platform()
-    if sonar_model in ["EK60", "ES70", "EK80", "ES80", "EA640"]:
+    if "Environment" in include_groups:
+        tree_dict["Environment"] = setgrouper.set_env()
+    if "Platform" in include_groups:
+        tree_dict["Platform"] = setgrouper.set_platform()
+    if sonar_model in ["EK60", "ES70", "EK80", "ES80", "EA640"] and (
+        "Platform/NMEA" in include_groups
+    ):
         tree_dict["Platform/NMEA"] = setgrouper.set_nmea()
     tree_dict["Provenance"] = setgrouper.set_provenance()
-    # Allocate a tree_dict entry for Sonar? Otherwise, a DataTree error occurs
-    tree_dict["Sonar"] = None
-
-    # Set multi beam groups
-    beam_groups = setgrouper.set_beam()
-
-    beam_group_type = []
-    for idx, beam_group in enumerate(beam_groups, start=1):
-        if beam_group is not None:
-            # fill in beam_group_type (only necessary for EK80, ES80, EA640)
-            if idx == 1:
-                # choose the appropriate description key for Beam_group1
-                beam_group_type.append("complex" if "backscatter_i" in beam_group else "power")
-            else:
-                # provide None for all other beam groups (since the description does not have a key)
-                beam_group_type.append(None)
-
-            tree_dict[f"Sonar/Beam_group{idx}"] = beam_group
-
-    if sonar_model in ["EK80", "ES80", "EA640"]:
-        tree_dict["Sonar"] = setgrouper.set_sonar(beam_group_type=beam_group_type)
-    else:
-        tree_dict["Sonar"] = setgrouper.set_sonar()
+    if "Sonar" in include_groups:
+        # Allocate a tree_dict entry for Sonar? Otherwise, a DataTree error occurs
+        tree_dict["Sonar"] = None
+
+        # Set multi beam groups
+        beam_groups = setgrouper.set_beam()
+
+        beam_group_type = []
+        for idx, beam_group in enumerate(beam_groups, start=1):
+            if beam_group is not None:
+                # fill in beam_group_type (only necessary for EK80, ES80, EA640)
+                if idx == 1:
+                    # choose the appropriate description key for Beam_group1
+                    beam_group_type.append("complex" if "backscatter_i" in beam_group else "power")
+                else:
+                    # provide None for all other beam groups
+                    # (since the description does not have a key)
+                    beam_group_type.append(None)
+
+                if ragged_samples and sonar_model in ["EK60", "ES70", "EK80", "ES80", "EA640"]:
+                    beam_group = to_ragged(beam_group)
+                tree_dict[f"Sonar/Beam_group{idx}"] = beam_group
+
+        if sonar_model in ["EK80", "ES80", "EA640"]:
+            tree_dict["Sonar"] = setgrouper.set_sonar(beam_group_type=beam_group_type)
+        else:
+            tree_dict["Sonar"] = setgrouper.set_sonar()
 
-    tree_dict["Vendor_specific"] = setgrouper.set_vendor()
+    if "Vendor_specific" in include_groups:
+        tree_dict["Vendor_specific"] = setgrouper.set_vendor()
 
     # Create tree and echodata
     # TODO: make the creation of tree dynamically generated from yaml
     tree = DataTree.from_dict(tree_dict, name="root")
     echodata = EchoData(source_file=file_chk, xml_path=xml_chk, sonar_model=sonar_model)
+    echodata.memory_plan = getattr(parser, "memory_plan", None)
     echodata._set_tree(tree)
     echodata._load_tree()
 
     return echodata
+
+
+def _read_manifest(manifest_path: "PathHint") -> Dict[str, Dict[str, Any]]:
+    """Read the latest conversion record of each raw file from a manifest file."""
+    records = {}
+    if Path(manifest_path).exists():
+        with open(manifest_path) as manifest:
+            for line in manifest:
+                if line.strip():
+                    record = json.loads(line)
+                    records[record["raw_file"]] = record
+    return records
+
+
+def _conversion_record(raw_file: str) -> Dict[str, Any]:
+    """Create the conversion record of a raw file, failed until its conversion completes."""
+    return {
+        "raw_file": raw_file,
+        "converted_path": None,
+        "status": "failed",
+        "error": None,
+        "size_bytes": 0,
+        "duration_s": 0.0,
+    }
+
+
+def _convert_file(
+    raw_file: str,
+    sonar_model: "SonarModelsHint",
+    engine: "EngineHint",
+    save_path: Optional["PathHint"],
+    compress: bool,
+    overwrite: bool,
+    output_storage_options: Dict[str, str],
+    open_raw_kwargs: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Parse a single raw file and save it to ``engine``, returning a conversion record.
+
+    The converted file is written to a temporary path next to it and renamed once complete,
+    so that an existing converted file is never one left half-written by an interrupted run.
+    Any error raised while converting is captured in the record instead of propagated,
+    so that one bad file does not abort a batch conversion.
+    """
+    record = _conversion_record(raw_file)
+    start = time.perf_counter()
+    try:
+        storage_options = open_raw_kwargs.get("storage_options") or {}
+        record["size_bytes"] = fsspec.get_mapper(raw_file, **storage_options).fs.size(raw_file)
+        output_file = io.validate_output_path(
+            source_file=raw_file,
+            engine=engine,
+            save_path=save_path,
+            output_storage_options=output_storage_options,
+        )
+        record["converted_path"] = output_file
+
+        fs = fsspec.get_mapper(output_file, **output_storage_options).fs
+        if fs.exists(output_file) and not overwrite:
+            record["status"] = "skipped"
+        else:
+            echodata = open_raw(raw_file, sonar_model=sonar_model, **open_raw_kwargs)
+            root, suffix = os.path.splitext(output_file)
+            partial_file = f"{root}.partial{suffix}"
+            if fs.exists(partial_file):
+                # Left by an interrupted conversion
+                fs.rm(partial_file, recursive=True)
+            to_file(
+                echodata,
+                engine=engine,
+                save_path=partial_file,
+                compress=compress,
+                overwrite=True,
+                output_storage_options=output_storage_options,
+            )
+            if fs.exists(output_file):
+                fs.rm(output_file, recursive=True)
+            fs.mv(partial_file, output_file, recursive=True)
+            record["status"] = "converted"
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["duration_s"] = time.perf_counter() - start
+
+    return record
+
+
+def convert_files(
+    raw_files: List["PathHint"],
+    sonar_model: "SonarModelsHint",
+    save_path: Optional["PathHint"] = None,
+    engine: "EngineHint" = "zarr",
+    compress: bool = True,
+    overwrite: bool = False,
+    n_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    manifest_path: Optional["PathHint"] = None,
+    output_storage_options: Dict[str, str] = {},
+    **kwargs,
+) -> pd.DataFrame:
+    """Convert many raw data files to netCDF or zarr in parallel.
+
+    Each file is parsed with ``open_raw`` and saved to ``engine`` in its own worker,
+    so that files are converted concurrently and a failure to convert one file,
+    or of the worker converting it, does not affect the others.
+    Each converted file is written to a temporary ``.partial`` path and renamed
+    once complete, and duplicated raw files are converted once.
+
+    Parameters
+    ----------
+    raw_files : list of str or Path
+        paths to raw data files
+    sonar_model : str
+        model of the sonar instrument, see ``open_raw``
+    save_path : str or Path, optional
+        directory in which converted files will be saved,
+        using the same name as each raw file
+    engine : str {'netcdf4', 'zarr'}, default 'zarr'
+        type of converted file
+    compress : bool
+        whether or not to perform compression on data variables
+        Defaults to ``True``
+    overwrite : bool
+        whether or not to overwrite existing converted files
+        Defaults to ``False``
+    n_workers : int, optional
+        number of worker processes used when ``executor`` is not given.
+        Defaults to the number of CPUs. With ``n_workers=1`` files are
+        converted sequentially in the current process.
+    executor : concurrent.futures.Executor, optional
+        executor to submit the conversion of each file to,
+        e.g. ``client.get_executor()`` of a dask distributed ``Client``
+        to convert files on a dask cluster
+    manifest_path : str or Path, optional
+        path to a local manifest file recording, one JSON line per file,
+        the outcome of each conversion as soon as it completes.
+        Files recorded as converted in an existing manifest are not converted again
+        unless ``overwrite=True``, so that an interrupted batch conversion can be resumed.
+    output_storage_options : dict
+        Additional keywords to pass to the filesystem class of the output files.
+    **kwargs : dict, optional
+        Extra arguments to ``open_raw``, e.g. ``xml_path`` or ``storage_options``
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per raw file with the converted file path, the conversion
+        ``status`` ("converted", "skipped", "failed" or "resumed"), the error message
+        of failed conversions, the raw file size and the conversion duration.
+        Throughput of the batch is stored in the ``attrs`` of the DataFrame.
+    """
+    if engine not in XARRAY_ENGINE_MAP.values():
+        raise ValueError("Unknown type to convert file to!")
+
+    # Duplicated raw files are converted once
+    raw_files = list(dict.fromkeys(str(raw_file) for raw_file in raw_files))
+    manifest = _read_manifest(manifest_path) if manifest_path is not None else {}
+
+    # Files already converted by a previous run recorded in the manifest
+    records = {}
+    if not overwrite:
+        for raw_file in raw_files:
+            if manifest.get(raw_file, {}).get("status") == "converted":
+                records[raw_file] = {**manifest[raw_file], "status": "resumed", "duration_s": 0.0}
+    pending = [raw_file for raw_file in raw_files if raw_file not in records]
+
+    convert_args = (
+        sonar_model,
+        engine,
+        save_path,
+        compress,
+        overwrite,
+        output_storage_options,
+        kwargs,
+    )
+
+    def _record(record):
+        records[record["raw_file"]] = record
+        if record["status"] == "failed":
+            logger.warning(f"Failed to convert {record['raw_file']}: {record['error']}")
+        if manifest_path is not None:
+            with open(manifest_path, "a") as manifest_file:
+                manifest_file.write(json.dumps(record) + "\n")
+
+    start = time.perf_counter()
+    if executor is None and n_workers == 1:
+        for raw_file in pending:
+            _record(_convert_file(raw_file, *convert_args))
+    else:
+        pool = executor if executor is not None else ProcessPoolExecutor(max_workers=n_workers)
+        try:
+            futures = {
+                pool.submit(_convert_file, raw_file, *convert_args): raw_file
+                for raw_file in pending
+            }
+            for future in as_completed(futures):
+                try:
+                    record = future.result()
+                except Exception as e:
+                    # Failure of the pool itself, e.g. a worker process killed
+                    record = _conversion_record(futures[future])
+                    record["error"] = f"{type(e).__name__}: {e}"
+                _record(record)
+        finally:
+            if executor is None:
+                pool.shutdown()
+    elapsed = time.perf_counter() - start
+
+    # Report throughput of the files converted in this run
+    report = pd.DataFrame(
+        [records[raw_file] for raw_file in raw_files],
+        columns=["raw_file", "converted_path", "status", "error", "size_bytes", "duration_s"],
+    )
+    converted = report["status"] == "converted"
+    report.attrs = {
+        "num_converted": int(converted.sum()),
+        "num_failed": int((report["status"] == "failed").sum()),
+        "elapsed_s": elapsed,
+        "files_per_s": converted.sum() / elapsed,
+        "MB_per_s": report.loc[converted, "size_bytes"].sum() / 1e6 / elapsed,
+    }
+    logger.info(
+        f"Converted {report.attrs['num_converted']} of {len(raw_files)} files "
+        f"({report.attrs['num_failed']} failed) in {elapsed:.1f} s: "
+        f"{report.attrs['files_per_s']:.2f} files/s, {report.attrs['MB_per_s']:.2f} MB/s"
+    )
+
+    return report
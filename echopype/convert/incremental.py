@@ -0,0 +1,209 @@
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional
+
+import fsspec
+import zarr
+
+# fmt: off
+# black and isort have conflicting ideas about how this should be formatted
+from ..core import SONAR_MODELS
+
+if TYPE_CHECKING:
+    from ..core import PathHint, SonarModelsHint
+# fmt: on
+from ..echodata.echodata import EchoData
+from ..utils.io import _match_stored_dims
+from ..utils.log import _init_logger
+from .api import INCLUDE_GROUPS, _check_file, _parser_to_echodata
+
+# Groups other than the beam groups to which new data are appended
+APPEND_GROUPS = ["Platform", "Platform/NMEA"]
+# Parser attributes carried over from one update to the next:
+# the configuration datagrams, the latest EK80 parameter and environment datagrams,
+# and the EK80 filters, which are only recorded at the start of the file
+PARSER_STATE = [
+    "config_datagram",
+    "CON1_datagram",
+    "current_parameters",
+    "environment",
+    "fil_coeffs",
+    "fil_df",
+]
+
+logger = _init_logger(__name__)
+
+
+class IncrementalConverter:
+    """
+    Convert a Simrad raw file to zarr while it is still being written by the echosounder.
+
+    Each call to ``update`` parses only the complete pings appended to the raw file
+    since the previous update, and appends them along ``ping_time``
+    to the ``Sonar/Beam_groupX`` groups of the zarr store,
+    and the new navigation and motion data along their time dimensions
+    to the ``Platform`` and ``Platform/NMEA`` groups,
+    so that the cost of an update only depends on the amount of new data.
+    The first update writes all groups of the converted file.
+
+    Parameters
+    ----------
+    raw_file : str
+        Path to the raw data file being written.
+    sonar_model : str
+        Model of the sonar instrument, one of EK60, ES70, EK80, ES80 and EA640.
+    output_path : str
+        Path of the zarr store the converted data are written to.
+        An existing store is overwritten by the first update.
+    convert_params : dict, optional
+        Parameters (metadata) that may not exist in the raw file
+        and need to be added to the converted file.
+    storage_options : dict, optional
+        Options for cloud storage of the raw file.
+    output_storage_options : dict, optional
+        Options for cloud storage of the zarr store.
+
+    Notes
+    -----
+    The ``Environment`` and ``Vendor_specific`` groups are set from the first update only.
+    Channels that first appear in the raw file after the first update are not converted.
+    """
+
+    def __init__(
+        self,
+        raw_file: "PathHint",
+        sonar_model: "SonarModelsHint",
+        output_path: "PathHint",
+        convert_params: Optional[Dict[str, str]] = None,
+        storage_options: Optional[Dict[str, str]] = None,
+        output_storage_options: Optional[Dict[str, str]] = None,
+    ):
+        sonar_model = sonar_model.upper()  # type: ignore
+        if sonar_model not in ["EK60", "ES70", "EK80", "ES80", "EA640"]:
+            raise ValueError(
+                "Incremental conversion is only supported for "
+                "EK60, ES70, EK80, ES80 and EA640 data."
+            )
+        self.sonar_model = sonar_model
+        self.storage_options = storage_options if storage_options is not None else {}
+        self.raw_file, _, _, _ = _check_file(
+            str(raw_file), sonar_model, storage_options=self.storage_options
+        )
+        self.output_path = str(output_path) if isinstance(output_path, Path) else output_path
+        self.convert_params = convert_params if convert_params is not None else {}
+        self.output_storage_options = (
+            output_storage_options if output_storage_options is not None else {}
+        )
+
+        self.offset = None  # byte offset following the last datagram converted
+        self.num_updates = 0  # number of updates that converted new pings
+        self._parser_state = {}
+
+    def update(self, final: bool = False) -> int:
+        """
+        Convert the pings appended to the raw file since the previous update.
+
+        Datagrams are only consumed along with complete pings. The datagrams
+        of some channels of the last ping may not be written yet, so the datagrams
+        from the first one of the last ping on are held back and parsed again
+        by the next update, once datagrams of a later ping are written.
+        If no new ping is complete, nothing is written to the zarr store.
+
+        Parameters
+        ----------
+        final : bool, default False
+            The raw file is completely written: also convert the last ping.
+
+        Returns
+        -------
+        int
+            Number of new pings of the channel with the most new pings.
+        """
+        parser = SONAR_MODELS[self.sonar_model]["parser"](
+            self.raw_file,
+            bot_file="",
+            idx_file="",
+            storage_options=self.storage_options,
+            sonar_model=self.sonar_model,
+        )
+        for name, value in self._parser_state.items():
+            setattr(parser, name, value)
+        offset = parser.parse_raw_from(self.offset, hold_last_ping=not final)
+
+        num_pings = max((len(ping_time) for ping_time in parser.ping_time.values()), default=0)
+        if num_pings == 0:
+            return 0
+
+        parser.rectangularize_data(use_swap=False, native_dtypes=True)
+        echodata = _parser_to_echodata(
+            parser,
+            sonar_model=self.sonar_model,
+            file_chk=self.raw_file,
+            xml_chk=None,
+            include_groups=INCLUDE_GROUPS,
+            convert_params=self.convert_params,
+        )
+        if self.offset is None:
+            echodata.to_zarr(
+                save_path=self.output_path,
+                overwrite=True,
+                output_storage_options=self.output_storage_options,
+            )
+        else:
+            self._append(echodata)
+
+        self._parser_state = {
+            name: getattr(parser, name) for name in PARSER_STATE if hasattr(parser, name)
+        }
+        self.offset = offset
+        self.num_updates += 1
+        logger.info(f"appended {num_pings} pings from {self.raw_file} to {self.output_path}")
+        return num_pings
+
+    def _append(self, echodata: EchoData) -> None:
+        """Append the time-varying data of ``echodata`` to the zarr store."""
+        store = fsspec.get_mapper(self.output_path, **self.output_storage_options)
+        beam_groups = [
+            group for group in echodata.group_paths if group.startswith("Sonar/Beam_group")
+        ]
+        for group in beam_groups + APPEND_GROUPS:
+            ds = echodata[group]
+            if ds is None:
+                continue
+            zarr_group = zarr.open_group(store, path=group, mode="r+")
+            ds = _match_stored_dims(ds, zarr_group)
+
+            time_dims = [
+                dim
+                for dim in ds.dims
+                if dim in ds.coords and ds[dim].dtype.kind == "M" and dim in zarr_group
+            ]
+            for dim in time_dims:
+                if ds[dim].isnull().all():
+                    # Placeholder time coordinate of data absent from the raw file
+                    continue
+                # Variables with several time dimensions cannot be appended along one of them
+                names = [
+                    name
+                    for name, var in ds.data_vars.items()
+                    if dim in var.dims and len(set(time_dims) & set(var.dims)) == 1
+                ]
+                if len(names) == 0:
+                    continue
+                if all(ds[name].isnull().all() for name in names):
+                    # Placeholder time coordinate of data absent from the new datagrams,
+                    # e.g. the NMEA data of an update that only parsed ping datagrams
+                    continue
+                ds_dim = ds[names]
+                # Only write the coordinates along the appended dimension and the indexes
+                ds_dim = ds_dim.drop_vars(
+                    [
+                        name
+                        for name, var in ds_dim.coords.items()
+                        if dim not in var.dims and name not in ds_dim.dims
+                    ]
+                )
+                # The new data of an update are small, and are loaded so that
+                # the stored chunks need not align with the chunks of the decoded samples
+                ds_dim.load().to_zarr(store, group=group, mode="a", append_dim=dim)
+
+        zarr.consolidate_metadata(store)
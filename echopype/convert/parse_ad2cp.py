@@ -141,6 +141,14 @@ DIMENSION_NAMES = {
 }
 
 
+def _field_always_exists(packet: "Ad2cpDataPacket") -> bool:
+    """
+    Default field_exists_predicate; the field is parsed for every packet
+    """
+
+    return True
+
+
 class Field:
     """
     Represents a single field within a data record and controls the way
@@ -161,7 +169,7 @@ class Field:
         field_unit_conversion: Callable[
             ["Ad2cpDataPacket", np.ndarray], np.ndarray
         ] = lambda _, x: x,
-        field_exists_predicate: Callable[["Ad2cpDataPacket"], bool] = lambda _: True,
+        field_exists_predicate: Callable[["Ad2cpDataPacket"], bool] = _field_always_exists,
     ):
         """
         field_name: Name of the field. If None, the field is parsed but ignored
@@ -206,6 +214,30 @@ class Field:
 
         return [Dimension.PING_TIME]
 
+    def is_fixed_size(self) -> bool:
+        """
+        Returns whether the field is always present with the same size and shape,
+        i.e., whether it can be decoded without looking at the rest of the packet
+        """
+
+        return (
+            not callable(self.field_entry_size_bytes)
+            and not callable(self.field_shape)
+            and self.field_exists_predicate is _field_always_exists
+            and self.field_entry_data_type != STRING
+        )
+
+    def entry_dtype(self) -> np.dtype:
+        """
+        Returns the numpy dtype of the raw (unconverted) entries of a fixed size field
+        """
+
+        if self.field_entry_data_type == RAW_BYTES:
+            return np.dtype("<u1")
+        return np.dtype(
+            DTYPES[(self.field_entry_data_type, self.field_entry_size_bytes)]  # type: ignore
+        )
+
 
 F = Field  # use F instead of Field to make the repeated fields easier to read
 
@@ -218,6 +250,115 @@ class NoMorePackets(Exception):
     pass
 
 
+class PacketColumn:
+    """
+    Growable buffer holding the values of one field for a sequence of packets.
+
+    The buffer has one row per packet and is grown by doubling its capacity.
+    Values whose shape is smaller than the largest shape seen so far are zero padded
+    at the end of each axis, and rows of packets without the field are left as zeros.
+    """
+
+    INITIAL_CAPACITY = 64
+
+    def __init__(self):
+        self.buffer: Optional[np.ndarray] = None
+        self.present = np.zeros(0, dtype=bool)
+        self.num_rows = 0
+
+    def set(self, row: int, value: Any):
+        """
+        Stores the value of the field for the packet at the given row
+        """
+
+        value = np.asarray(value)
+        if self.buffer is None:
+            capacity = max(self.INITIAL_CAPACITY, row + 1)
+            self.buffer = np.zeros((capacity,) + value.shape, dtype=value.dtype)
+            self.present = np.zeros(capacity, dtype=bool)
+        else:
+            if value.ndim != self.buffer.ndim - 1:
+                raise ValueError(
+                    f"cannot store a {value.ndim}-dimensional value in a column "
+                    f"of {self.buffer.ndim - 1}-dimensional values"
+                )
+            capacity = len(self.buffer)
+            while row >= capacity:
+                capacity *= 2
+            shape = (capacity,) + tuple(
+                max(n_buffer, n_value)
+                for n_buffer, n_value in zip(self.buffer.shape[1:], value.shape)
+            )
+            dtype = np.result_type(self.buffer.dtype, value.dtype)
+            if shape != self.buffer.shape or dtype != self.buffer.dtype:
+                buffer = np.zeros(shape, dtype=dtype)
+                buffer[tuple(slice(0, n) for n in self.buffer.shape)] = self.buffer
+                self.buffer = buffer
+                present = np.zeros(capacity, dtype=bool)
+                present[: len(self.present)] = self.present
+                self.present = present
+        self.buffer[(row,) + tuple(slice(0, n) for n in value.shape)] = value
+        self.present[row] = True
+        self.num_rows = max(self.num_rows, row + 1)
+
+    def values(self, num_rows: int) -> np.ndarray:
+        """
+        Returns the values of the first num_rows packets
+        """
+
+        buffer: np.ndarray = self.buffer  # type: ignore
+        if num_rows <= len(buffer):
+            return buffer[:num_rows]
+        # the last packets do not have the field and are past the capacity of the buffer
+        values = np.zeros((num_rows,) + buffer.shape[1:], dtype=buffer.dtype)
+        values[: len(buffer)] = buffer
+        return values
+
+    def present_mask(self, num_rows: int) -> np.ndarray:
+        """
+        Returns whether the field exists in each of the first num_rows packets
+        """
+
+        present = np.zeros(num_rows, dtype=bool)
+        num_stored_rows = min(num_rows, self.num_rows)
+        present[:num_stored_rows] = self.present[:num_stored_rows]
+        return present
+
+
+class PacketStore:
+    """
+    Columnar store of the data of all packets sharing the same data record id,
+    with one PacketColumn per field
+    """
+
+    def __init__(self, first_packet: Optional["Ad2cpDataPacket"] = None):
+        # the first packet is kept to evaluate size and shape callables of the format fields
+        self.first_packet = first_packet
+        self.data_record_type = None if first_packet is None else first_packet.data_record_type
+        self.columns: Dict[str, PacketColumn] = dict()
+        self.num_packets = 0
+
+    def append(self, data: Dict[str, Any]) -> int:
+        """
+        Appends the data of a packet and returns its row within the store
+        """
+
+        row = self.num_packets
+        for field_name, value in data.items():
+            if field_name not in self.columns:
+                self.columns[field_name] = PacketColumn()
+            self.columns[field_name].set(row, value)
+        self.num_packets += 1
+        return row
+
+    def column(self, field_name: str) -> Optional[PacketColumn]:
+        """
+        Returns the column of the given field, or None if no packet has the field
+        """
+
+        return self.columns.get(field_name)
+
+
 class ParseAd2cp(ParseBase):
     def __init__(
         self,
@@ -228,7 +369,13 @@ class ParseAd2cp(ParseBase):
     ):
         super().__init__(file, storage_options, sonar_model)
         self.config = None
-        self.packets: List[Ad2cpDataPacket] = []
+        # {data record id: columnar store of the packets with that id}
+        self.packet_stores: Dict[int, PacketStore] = dict()
+        # order of all packets in the file: data record id, row within its store and timestamp
+        self.packet_index = PacketStore()
+        # the most recently parsed packet, which is stored once the next one is parsed
+        #   because parsing a packet can modify the previous one (see _postprocess)
+        self.last_packet: Optional[Ad2cpDataPacket] = None
 
     def parse_raw(self):
         """
@@ -239,18 +386,74 @@ class ParseAd2cp(ParseBase):
             while True:
                 try:
                     packet = Ad2cpDataPacket(f, self)
-                    self.packets.append(packet)
                 except NoMorePackets:
                     break
                 else:
                     if self.config is None and packet.is_string():
                         self.config = self.parse_config(packet.data["string_data"])
+                    if self.last_packet is not None:
+                        self._store_packet(self.last_packet)
+                    self.last_packet = packet
+        if self.last_packet is not None:
+            self._store_packet(self.last_packet)
 
         if self.config is not None and "GETCLOCKSTR" in self.config:
             self.ping_time.append(np.datetime64(self.config["GETCLOCKSTR"]["TIME"]))
         else:
             self.ping_time.append(np.datetime64())
 
+    def _store_packet(self, packet: "Ad2cpDataPacket"):
+        """
+        Appends the data of a parsed packet into the columnar store of its data record id
+        """
+
+        packet_id = int(packet.data["id"])
+        if packet_id not in self.packet_stores:
+            self.packet_stores[packet_id] = PacketStore(packet)
+        row = self.packet_stores[packet_id].append(packet.data)
+        self.packet_index.append(
+            {
+                "id": packet_id,
+                "row": row,
+                "timestamp": packet.timestamp if packet.has_timestamp() else np.datetime64("NaT"),
+            }
+        )
+
+    @property
+    def num_packets(self) -> int:
+        """
+        Returns the number of packets parsed from the file
+        """
+
+        return self.packet_index.num_packets
+
+    def packet_ids(self) -> np.ndarray:
+        """
+        Returns the data record id of every parsed packet, in file order
+        """
+
+        if self.num_packets == 0:
+            return np.zeros(0, dtype="<u8")
+        return self.packet_index.columns["id"].values(self.num_packets)
+
+    def packet_rows(self) -> np.ndarray:
+        """
+        Returns the row of every parsed packet within the store of its data record id
+        """
+
+        if self.num_packets == 0:
+            return np.zeros(0, dtype="<u8")
+        return self.packet_index.columns["row"].values(self.num_packets)
+
+    def packet_timestamps(self) -> np.ndarray:
+        """
+        Returns the timestamp of every parsed packet (NaT for string packets)
+        """
+
+        if self.num_packets == 0:
+            return np.zeros(0, dtype="M8[ns]")
+        return self.packet_index.columns["timestamp"].values(self.num_packets)
+
     @staticmethod
     def parse_config(data: np.ndarray) -> Dict[str, Dict[str, Any]]:
         """
@@ -407,7 +610,10 @@ class Ad2cpDataPacket:
         """
 
         self.data_record_format = HeaderOrDataRecordFormats.HEADER_FORMAT
-        raw_header = self._read_data(f, self.data_record_format)
+        # the second byte of the header is the size of the header
+        raw_header = self._read_exact(f, 2)
+        raw_header += self._read_exact(f, raw_header[1] - 2)
+        self._read_data(raw_header, self.data_record_format)
         # don't include the last 2 bytes, which is the header checksum itself
         calculated_checksum = self.checksum(raw_header[:-2])
         expected_checksum = self.data["header_checksum"]
@@ -453,27 +659,42 @@ class Ad2cpDataPacket:
             self.data_record_type
         )
 
-        raw_data_record = self._read_data(f, self.data_record_format)
+        # the whole data record is read with a single call and checked before it is decoded
+        raw_data_record = self._read_exact(f, int(self.data["data_record_size"]))
         calculated_checksum = self.checksum(raw_data_record)
         expected_checksum = self.data["data_record_checksum"]
         assert (
             calculated_checksum == expected_checksum
         ), f"invalid data record checksum: found {calculated_checksum}, expected {expected_checksum}"  # noqa
+        self._read_data(raw_data_record, self.data_record_format)
 
-    def _read_data(self, f: BinaryIO, data_format: "HeaderOrDataRecordFormat") -> bytes:
+    def _read_data(self, raw: bytes, data_format: "HeaderOrDataRecordFormat") -> int:
         """
-        Reads data from the stream, interpreting the data using the given format
+        Interprets the raw bytes of a header or data record using the given format
+        and returns the number of bytes that were decoded.
+
+        Consecutive fixed size fields are decoded together with a single
+        np.frombuffer call using the structured dtype precompiled by the format.
         """
 
-        raw_bytes = bytes()  # combination of all raw fields
-        for field_format in data_format.fields_iter():
-            field_name = field_format.field_name
+        offset = 0
+        for step in data_format.compiled_fields():
+            if isinstance(step, FixedFieldsBlock):
+                if offset + step.dtype.itemsize > len(raw):
+                    raise ValueError(f"{data_format.name} is longer than the data read")
+                values = np.frombuffer(raw, dtype=step.dtype, count=1, offset=offset)
+                offset += step.dtype.itemsize
+                for field_format in step.fields:
+                    parsed_field = values[field_format.field_name].reshape(field_format.field_shape)
+                    if field_format.field_entry_data_type == SIGNED_FRACTION:
+                        parsed_field = self._signed_fraction(parsed_field)
+                    self._set_field(field_format, parsed_field)
+                continue
+
+            field_format = step
             field_entry_size_bytes = field_format.field_entry_size_bytes
-            field_entry_data_type = field_format.field_entry_data_type
             field_shape = field_format.field_shape
-            field_unit_conversion = field_format.field_unit_conversion
-            field_exists_predicate = field_format.field_exists_predicate
-            if not field_exists_predicate(self):
+            if not field_format.field_exists_predicate(self):
                 continue
             if callable(field_entry_size_bytes):
                 field_entry_size_bytes = field_entry_size_bytes(self)
@@ -482,19 +703,30 @@ class Ad2cpDataPacket:
             if callable(field_shape):
                 field_shape = field_shape(self)
 
-            raw_field = self._read_exact(f, field_entry_size_bytes * int(np.prod(field_shape)))
-            raw_bytes += raw_field
+            field_size_bytes = field_entry_size_bytes * int(np.prod(field_shape))
+            if offset + field_size_bytes > len(raw):
+                raise ValueError(f"{data_format.name} is longer than the data read")
+            raw_field = raw[offset : offset + field_size_bytes]
+            offset += field_size_bytes
             # we cannot check for this before reading because some fields are placeholder fields
             # which, if not read in the correct order with other fields,
             # will offset the rest of the data
-            if field_name is not None:
-                parsed_field = self._parse(raw_field, field_entry_data_type, field_entry_size_bytes)
-                parsed_field = np.reshape(parsed_field, field_shape)
-                parsed_field = field_unit_conversion(self, parsed_field)
-                self.data[field_name] = parsed_field
-                self._postprocess(field_name)
+            if field_format.field_name is not None:
+                parsed_field = self._parse(
+                    raw_field, field_format.field_entry_data_type, field_entry_size_bytes
+                )
+                self._set_field(field_format, np.reshape(parsed_field, field_shape))
+
+        return offset
+
+    def _set_field(self, field_format: Field, parsed_field: np.ndarray):
+        """
+        Applies the unit conversion of a parsed field, stores it and postprocesses it
+        """
 
-        return raw_bytes
+        field_name = field_format.field_name
+        self.data[field_name] = field_format.field_unit_conversion(self, parsed_field)
+        self._postprocess(field_name)
 
     @staticmethod
     def _parse(value: bytes, data_type: DataType, size_bytes: int) -> np.ndarray:
@@ -510,14 +742,22 @@ class Ad2cpDataPacket:
         elif data_type == STRING:
             return np.array(value.decode("utf-8"))
         elif data_type == SIGNED_FRACTION:
-            # Although the specification states that the data is represented in a
-            # signed-magnitude format, an email exchange with Nortek revealed that it is
-            # actually in 2's complement form.
             dtype = np.dtype(DTYPES[(SIGNED_FRACTION, size_bytes)])  # type: ignore
-            return (np.frombuffer(value, dtype=dtype) / (np.iinfo(dtype).max + 1)).astype("<f8")
+            return Ad2cpDataPacket._signed_fraction(np.frombuffer(value, dtype=dtype))
         else:
             raise ValueError("unrecognized data type")
 
+    @staticmethod
+    def _signed_fraction(value: np.ndarray) -> np.ndarray:
+        """
+        Converts raw signed fraction integers into floats in [-1, 1)
+        """
+
+        # Although the specification states that the data is represented in a
+        # signed-magnitude format, an email exchange with Nortek revealed that it is
+        # actually in 2's complement form.
+        return (value / (np.iinfo(value.dtype).max + 1)).astype("<f8")
+
     @staticmethod
     def _read_exact(f: BinaryIO, total_num_bytes_to_read: int) -> bytes:
         """
@@ -702,11 +942,11 @@ class Ad2cpDataPacket:
                     self.data["dataset_description"],
                     [(3, 0), (7, 4), (11, 8), (16, 12)],
                 )
-                if (
-                    self.parser.packets[-1].is_echosounder_raw()
-                    or self.parser.packets[-1].is_echosounder_raw_transmit()
+                last_packet = self.parser.last_packet
+                if last_packet is not None and (
+                    last_packet.is_echosounder_raw() or last_packet.is_echosounder_raw_transmit()
                 ):
-                    self.parser.packets[-1].data["echosounder_raw_beam"] = self.data["beams"][0]
+                    last_packet.data["echosounder_raw_beam"] = self.data["beams"][0]
             elif field_name == "status0":
                 if self.data["status0"] & 0b1000_0000_0000_0000:
                     self._postprocess_bitfield(
@@ -809,13 +1049,15 @@ class Ad2cpDataPacket:
         """
 
         checksum = 0xB58C
-        for i in range(0, len(data), 2):
-            checksum += int.from_bytes(data[i : i + 2], byteorder="little")
-            checksum %= 2**16
+        num_words = len(data) // 2
+        if num_words > 0:
+            # summing as uint64 cannot overflow for any realistic data record size,
+            # so the modulo only needs to be taken once at the end
+            words = np.frombuffer(data, dtype="<u2", count=num_words)
+            checksum += int(words.sum(dtype="<u8"))
         if len(data) % 2 == 1:
             checksum += data[-1] << 8
-            checksum %= 2**16
-        return checksum
+        return checksum % 2**16
 
 
 RANGE_SAMPLES = {
@@ -827,6 +1069,32 @@ RANGE_SAMPLES = {
 }
 
 
+class FixedFieldsBlock:
+    """
+    A run of consecutive fixed size fields within a header or data record format,
+    decoded together with a single structured dtype
+    """
+
+    def __init__(self, fields: List[Field]):
+        names, formats, offsets = [], [], []
+        offset = 0
+        for field in fields:
+            size_bytes = field.field_entry_size_bytes * int(np.prod(field.field_shape))
+            # unnamed fields are placeholders, so they are only skipped over
+            if field.field_name is not None:
+                names.append(field.field_name)
+                if field.field_shape:
+                    formats.append((field.entry_dtype(), tuple(field.field_shape)))
+                else:
+                    formats.append(field.entry_dtype())
+                offsets.append(offset)
+            offset += size_bytes
+        self.fields = [field for field in fields if field.field_name is not None]
+        self.dtype = np.dtype(
+            {"names": names, "formats": formats, "offsets": offsets, "itemsize": offset}
+        )
+
+
 class HeaderOrDataRecordFormat:
     """
     A collection of fields which represents the header format or a data record format
@@ -835,6 +1103,7 @@ class HeaderOrDataRecordFormat:
     def __init__(self, name: str, fields: List[Field]):
         self.name = name
         self.fields = OrderedDict([(f.field_name, f) for f in fields])
+        self._compiled_fields: Optional[List[Union[Field, FixedFieldsBlock]]] = None
 
     def get_field(self, field_name: str) -> Optional[Field]:
         """
@@ -854,6 +1123,29 @@ class HeaderOrDataRecordFormat:
 
         return self.fields.values()
 
+    def compiled_fields(self) -> List[Union[Field, FixedFieldsBlock]]:
+        """
+        Returns the fields in this format with consecutive fixed size fields
+        grouped into blocks that can be decoded all at once.
+        The result is computed on first use and cached.
+        """
+
+        if self._compiled_fields is None:
+            compiled: List[Union[Field, FixedFieldsBlock]] = []
+            block: List[Field] = []
+            for field in self.fields_iter():
+                if field.is_fixed_size():
+                    block.append(field)
+                    continue
+                if block:
+                    compiled.append(FixedFieldsBlock(block))
+                    block = []
+                compiled.append(field)
+            if block:
+                compiled.append(FixedFieldsBlock(block))
+            self._compiled_fields = compiled
+        return self._compiled_fields
+
 
 class HeaderOrDataRecordFormats:
     @classmethod
@@ -2,7 +2,6 @@ import os
 import xml.etree.ElementTree as ET
 from collections import defaultdict
 from datetime import datetime as dt
-from struct import unpack
 
 import fsspec
 import numpy as np
@@ -100,6 +99,32 @@ HEADER_FIELDS = (
     ("ad", "u2", 2),  # AD channel 6 and 7
 )
 
+# Big-endian dtype of the header of each ping record
+HEADER_DTYPE = np.dtype([(field[0], ">" + field[1], *field[2:]) for field in HEADER_FIELDS])
+
+# Header fields that contain a value for each of the 4 possible channels
+FIELDS_W_FREQ = (
+    "dig_rate",
+    "lock_out_index",
+    "num_bins",
+    "range_samples_per_bin",
+    "data_type",
+    "gain",
+    "pulse_len",
+    "board_num",
+    "frequency",
+)
+
+# Header fields setting the layout of the ping records and the scaling of their counts
+LAYOUT_FIELDS = (
+    "num_chan",
+    "num_bins",
+    "data_type",
+    "avg_pings",
+    "ping_per_profile",
+    "range_samples_per_bin",
+)
+
 logger = _init_logger(__name__)
 
 
@@ -171,21 +196,19 @@ class ParseAZFP(ParseBase):
             if len(val) == 1:
                 self.parameters[key] = val[0]
 
-    def _compute_temperature(self, ping_num, is_valid):
+    def _compute_temperature(self, is_valid):
         """
-        Compute temperature in celsius.
+        Compute temperature in celsius for all pings.
 
         Parameters
         ----------
-        ping_num
-            ping number
         is_valid
             whether the associated parameters have valid values
         """
         if not is_valid:
-            return np.nan
+            return np.full(len(self.unpacked_data["ancillary"]), np.nan)
 
-        counts = self.unpacked_data["ancillary"][ping_num][4]
+        counts = self.unpacked_data["ancillary"][:, 4]
         v_in = 2.5 * (counts / 65535)
         R = (self.parameters["ka"] + self.parameters["kb"] * v_in) / (self.parameters["kc"] - v_in)
 
@@ -198,65 +221,59 @@ class ParseAZFP(ParseBase):
         # fmt: on
         return T
 
-    def _compute_tilt(self, ping_num, xy, is_valid):
+    def _compute_tilt(self, xy, is_valid):
         """
-        Compute instrument tilt.
+        Compute instrument tilt for all pings.
 
         Parameters
         ----------
-        ping_num
-            ping number
         xy
             either "X" or "Y"
         is_valid
             whether the associated parameters have valid values
         """
         if not is_valid:
-            return np.nan
+            return np.full(len(self.unpacked_data["ancillary"]), np.nan)
         else:
             idx = 0 if xy == "X" else 1
-            N = self.unpacked_data["ancillary"][ping_num][idx]
+            N = self.unpacked_data["ancillary"][:, idx].astype(np.float64)
             a = self.parameters[f"{xy}_a"]
             b = self.parameters[f"{xy}_b"]
             c = self.parameters[f"{xy}_c"]
             d = self.parameters[f"{xy}_d"]
             return a + b * N + c * N**2 + d * N**3
 
-    def _compute_battery(self, ping_num, battery_type):
+    def _compute_battery(self, battery_type):
         """
-        Compute battery voltage.
+        Compute battery voltage for all pings.
 
         Parameters
         ----------
-        ping_num
-            ping number
         type
             either "main" or "tx"
         """
         USL5_BAT_CONSTANT = (2.5 / 65536.0) * (86.6 + 475.0) / 86.6
 
         if battery_type == "main":
-            N = self.unpacked_data["ancillary"][ping_num][2]
+            N = self.unpacked_data["ancillary"][:, 2]
         elif battery_type == "tx":
-            N = self.unpacked_data["ad"][ping_num][0]
+            N = self.unpacked_data["ad"][:, 0]
 
         return N * USL5_BAT_CONSTANT
 
-    def _compute_pressure(self, ping_num, is_valid):
+    def _compute_pressure(self, is_valid):
         """
-        Compute pressure in decibar
+        Compute pressure in decibar for all pings.
 
         Parameters
         ----------
-        ping_num
-            ping number
         is_valid
             whether the associated parameters have valid values
         """
         if not is_valid or self.parameters["sensors_flag_pressure_sensor_installed"] == "no":
-            return np.nan
+            return np.full(len(self.unpacked_data["ancillary"]), np.nan)
 
-        counts = self.unpacked_data["ancillary"][ping_num][3]
+        counts = self.unpacked_data["ancillary"][:, 3]
         v_in = 2.5 * (counts / 65535)
         P = v_in * self.parameters["a1"] + self.parameters["a0"] - 10.125
         return P
@@ -283,74 +300,47 @@ class ParseAZFP(ParseBase):
         tilt_y_is_valid = _test_valid_params(["Y_a", "Y_b", "Y_c"])
 
         with fmap.fs.open(fmap.root, "rb") as file:
-            ping_num = 0
-            eof = False
-            while not eof:
-                header_chunk = file.read(self.HEADER_SIZE)
-                if header_chunk:
-                    header_unpacked = unpack(self.HEADER_FORMAT, header_chunk)
-                    # Reading will stop if the file contains an unexpected flag
-                    if self._split_header(file, header_unpacked):
-                        # Appends the actual 'data values' to unpacked_data
-                        self._add_counts(file, ping_num)
-                        if ping_num == 0:
-                            # Display information about the file that was loaded in
-                            self._print_status()
-                        # Compute temperature from unpacked_data[ii]['ancillary][4]
-                        self.unpacked_data["temperature"].append(
-                            self._compute_temperature(ping_num, temperature_is_valid)
-                        )
-                        # Compute pressure from unpacked_data[ii]['ancillary'][3]
-                        self.unpacked_data["pressure"].append(
-                            self._compute_pressure(ping_num, pressure_is_valid)
-                        )
-                        # compute x tilt from unpacked_data[ii]['ancillary][0]
-                        self.unpacked_data["tilt_x"].append(
-                            self._compute_tilt(ping_num, "X", tilt_x_is_valid)
-                        )
-                        # Compute y tilt from unpacked_data[ii]['ancillary][1]
-                        self.unpacked_data["tilt_y"].append(
-                            self._compute_tilt(ping_num, "Y", tilt_y_is_valid)
-                        )
-                        # Compute cos tilt magnitude from tilt x and y values
-                        self.unpacked_data["cos_tilt_mag"].append(
-                            np.cos(
-                                (
-                                    np.sqrt(
-                                        self.unpacked_data["tilt_x"][ping_num] ** 2
-                                        + self.unpacked_data["tilt_y"][ping_num] ** 2
-                                    )
-                                )
-                                * np.pi
-                                / 180
-                            )
-                        )
-                        # Calculate voltage of main battery pack
-                        self.unpacked_data["battery_main"].append(
-                            self._compute_battery(ping_num, battery_type="main")
-                        )
-                        # If there is a Tx battery pack
-                        self.unpacked_data["battery_tx"].append(
-                            self._compute_battery(ping_num, battery_type="tx")
-                        )
-                    else:
-                        break
-                else:
-                    # End of file
-                    eof = True
-                ping_num += 1
+            raw = np.frombuffer(file.read(), dtype=np.uint8)
+
+        # Find all ping records and unpack their headers
+        ping_offsets = self._find_ping_offsets(raw)
+        headers = self._read_blocks(raw, ping_offsets, self.HEADER_SIZE, HEADER_DTYPE)[:, 0]
+        self._split_header(headers)
+
+        # Display information about the file that was loaded in
+        self._print_status()
+
+        # The layout of all ping records is the same once the header values
+        # are checked to be constant for each ping
         self._check_uniqueness()
+
+        # Unpacks the actual 'data values' to unpacked_data
+        self._add_counts(raw, ping_offsets, headers)
+
+        # Compute temperature from unpacked_data['ancillary'][:, 4]
+        self.unpacked_data["temperature"] = self._compute_temperature(temperature_is_valid)
+        # Compute pressure from unpacked_data['ancillary'][:, 3]
+        self.unpacked_data["pressure"] = self._compute_pressure(pressure_is_valid)
+        # compute x tilt from unpacked_data['ancillary'][:, 0]
+        self.unpacked_data["tilt_x"] = self._compute_tilt("X", tilt_x_is_valid)
+        # Compute y tilt from unpacked_data['ancillary'][:, 1]
+        self.unpacked_data["tilt_y"] = self._compute_tilt("Y", tilt_y_is_valid)
+        # Compute cos tilt magnitude from tilt x and y values
+        self.unpacked_data["cos_tilt_mag"] = np.cos(
+            (np.sqrt(self.unpacked_data["tilt_x"] ** 2 + self.unpacked_data["tilt_y"] ** 2))
+            * np.pi
+            / 180
+        )
+        # Calculate voltage of main battery pack
+        self.unpacked_data["battery_main"] = self._compute_battery(battery_type="main")
+        # If there is a Tx battery pack
+        self.unpacked_data["battery_tx"] = self._compute_battery(battery_type="tx")
+
         self._get_ping_time()
 
         # Explicitly cast frequency to a float in accordance with the SONAR-netCDF4 convention
         self.unpacked_data["frequency"] = self.unpacked_data["frequency"].astype(np.float64)
 
-        # cast unpacked_data values to np arrays, so they are easier to reference
-        for key, val in self.unpacked_data.items():
-            # if it is not a nested list, make the value into a ndarray
-            if isinstance(val, list) and (not isinstance(val[0], list)):
-                self.unpacked_data[key] = np.asarray(val)
-
         # cast all list parameter values to np array, so they are easier to reference
         for key, val in self.parameters.items():
             if isinstance(val, list):
@@ -387,89 +377,132 @@ class ParseAZFP(ParseBase):
         pathstr, xml_name = os.path.split(self.xml_path)
         logger.info(f"parsing file {filename} with {xml_name}, " f"time of first ping: {timestr}")
 
-    def _split_header(self, raw, header_unpacked):
-        """Splits the header information into a dictionary.
-        Modifies self.unpacked_data
+    def _find_ping_offsets(self, raw):
+        """Scans the raw bytes once to find the byte offset of each ping record.
 
         Parameters
         ----------
         raw
-            open binary file
-        header_unpacked
-            output of struct unpack of raw file
+            bytes of the raw file as a uint8 array
 
         Returns
         -------
-            True or False depending on whether the unpacking was successful
+            Byte offsets of the ping records
         """
-        if (
-            header_unpacked[0] != self.FILE_TYPE
-        ):  # first field should match hard-coded FILE_TYPE from manufacturer
-            check_eof = raw.read(1)
-            if check_eof:
+        offsets = []
+        offset = 0
+        while offset + self.HEADER_SIZE <= raw.size:
+            header = np.frombuffer(raw, dtype=HEADER_DTYPE, count=1, offset=offset)[0]
+            # first field should match hard-coded FILE_TYPE from manufacturer
+            # reading will stop if the file contains an unexpected flag
+            if header["profile_flag"] != self.FILE_TYPE:
                 logger.error("Unknown file type")
-                return False
-        header_byte_cnt = 0
-
-        # fields with num_freq data still takes 4 bytes,
-        # the extra bytes contain random numbers
-        firmware_freq_len = 4
-
-        field_w_freq = (
-            "dig_rate",
-            "lock_out_index",
-            "num_bins",
-            "range_samples_per_bin",  # fields with num_freq data
-            "data_type",
-            "gain",
-            "pulse_len",
-            "board_num",
-            "frequency",
+                break
+            offsets.append(offset)
+
+            # counts are stored as 4-byte linear sums and 1-byte overflows
+            # for averaged data and as 2-byte values for raw data
+            num_chan = header["num_chan"]
+            bytes_per_bin = np.where(header["data_type"][:num_chan], 5, 2)
+            offset += self.HEADER_SIZE + int(np.sum(header["num_bins"][:num_chan] * bytes_per_bin))
+
+        return np.array(offsets, dtype=np.int64)
+
+    @staticmethod
+    def _read_blocks(raw, offsets, block_size, dtype):
+        """Reads a block of ``block_size`` bytes at each of ``offsets`` as an array of ``dtype``,
+        with one row per block.
+
+        Blocks at evenly spaced offsets, as in ping records of the same size,
+        are a strided view of ``raw`` and are not copied."""
+        if offsets.size == 0:
+            return np.empty((0, block_size), dtype=np.uint8).view(dtype)
+        if offsets[-1] + block_size > raw.size:
+            raise ValueError("Ping record extends beyond the end of the file")
+
+        dtype = np.dtype(dtype)
+        steps = np.unique(np.diff(offsets))
+        if steps.size > 1:
+            return np.stack([raw[offset : offset + block_size] for offset in offsets]).view(dtype)
+        blocks = np.ndarray(
+            shape=(offsets.size, block_size // dtype.itemsize),
+            dtype=dtype,
+            buffer=raw,
+            offset=int(offsets[0]),
+            strides=(int(steps[0]) if steps.size == 1 else block_size, dtype.itemsize),
         )
+        blocks.flags.writeable = False
+        return blocks
+
+    def _split_header(self, headers):
+        """Splits the header information of all pings into a dictionary.
+        Modifies self.unpacked_data
+
+        Parameters
+        ----------
+        headers
+            structured array of the headers of all pings
+        """
         for field in HEADER_FIELDS:
-            if field[0] in field_w_freq:  # fields with num_freq data
-                self.unpacked_data[field[0]].append(
-                    header_unpacked[header_byte_cnt : header_byte_cnt + self.parameters["num_freq"]]
-                )
-                header_byte_cnt += firmware_freq_len
-            elif len(field) == 3:  # other longer fields ('ancillary' and 'ad')
-                self.unpacked_data[field[0]].append(
-                    header_unpacked[header_byte_cnt : header_byte_cnt + field[2]]
-                )
-                header_byte_cnt += field[2]
-            else:
-                self.unpacked_data[field[0]].append(header_unpacked[header_byte_cnt])
-                header_byte_cnt += 1
-        return True
-
-    def _add_counts(self, raw, ping_num):
-        """Unpacks the echosounder raw data. Modifies self.unpacked_data."""
-        vv_tmp = [[]] * self.unpacked_data["num_chan"][ping_num]
-        for freq_ch in range(self.unpacked_data["num_chan"][ping_num]):
-            counts_byte_size = self.unpacked_data["num_bins"][ping_num][freq_ch]
-            if self.unpacked_data["data_type"][ping_num][freq_ch]:
-                if self.unpacked_data["avg_pings"][ping_num]:  # if pings are averaged over time
-                    divisor = (
-                        self.unpacked_data["ping_per_profile"][ping_num]
-                        * self.unpacked_data["range_samples_per_bin"][ping_num][freq_ch]
+            # fields with num_freq data still takes 4 values,
+            # the extra values contain random numbers
+            values = headers[field[0]].astype(np.int64)
+            if field[0] in FIELDS_W_FREQ:
+                values = values[:, : self.parameters["num_freq"]]
+            self.unpacked_data[field[0]] = values
+
+    @staticmethod
+    def _check_layout(headers):
+        """Check that the header values setting the layout of the ping records,
+        and the scaling of their counts, are the same for all pings."""
+        num_chan = headers["num_chan"][0]
+        for field in LAYOUT_FIELDS:
+            values = headers[field]
+            if values.ndim > 1:
+                values = values[:, :num_chan]
+            if np.any(values != values[:1]):
+                raise ValueError(f"Header value {field} is not constant for each ping")
+
+    def _add_counts(self, raw, ping_offsets, headers):
+        """Unpacks the echosounder raw data of all pings. Modifies self.unpacked_data.
+
+        Parameters
+        ----------
+        raw
+            bytes of the raw file as a uint8 array
+        ping_offsets
+            byte offsets of the ping records
+        headers
+            structured array of the headers of all pings,
+            which must set the same layout for all ping records
+        """
+        self._check_layout(headers)
+        header = headers[0]
+        counts = []
+        offset = ping_offsets + self.HEADER_SIZE
+        for freq_ch in range(header["num_chan"]):
+            counts_byte_size = int(header["num_bins"][freq_ch])
+            if header["data_type"][freq_ch]:
+                if header["avg_pings"]:  # if pings are averaged over time
+                    divisor = int(header["ping_per_profile"]) * int(
+                        header["range_samples_per_bin"][freq_ch]
                     )
                 else:
-                    divisor = self.unpacked_data["range_samples_per_bin"][ping_num][freq_ch]
-                ls = unpack(
-                    ">" + "I" * counts_byte_size, raw.read(counts_byte_size * 4)
-                )  # Linear sum
-                lso = unpack(
-                    ">" + "B" * counts_byte_size, raw.read(counts_byte_size * 1)
-                )  # linear sum overflow
-                v = (np.array(ls) + np.array(lso) * 4294967295) / divisor
-                v = (np.log10(v) - 2.5) * (8 * 65535) * self.parameters["DS"][freq_ch]
+                    divisor = int(header["range_samples_per_bin"][freq_ch])
+                ls = self._read_blocks(raw, offset, counts_byte_size * 4, ">u4")  # Linear sum
+                offset = offset + counts_byte_size * 4
+                lso = self._read_blocks(raw, offset, counts_byte_size, "u1")  # linear sum overflow
+                offset = offset + counts_byte_size
+                v = (ls.astype(np.int64) + lso.astype(np.int64) * 4294967295) / divisor
+                with np.errstate(divide="ignore"):
+                    v = (np.log10(v) - 2.5) * (8 * 65535) * self.parameters["DS"][freq_ch]
                 v[np.isinf(v)] = 0
-                vv_tmp[freq_ch] = v
+                counts.append(v)
             else:
-                counts_chunk = raw.read(counts_byte_size * 2)
-                counts_unpacked = unpack(">" + "H" * counts_byte_size, counts_chunk)
-                vv_tmp[freq_ch] = counts_unpacked
-        self.unpacked_data["counts"].append(vv_tmp)
+                counts_unpacked = self._read_blocks(raw, offset, counts_byte_size * 2, ">u2")
+                offset = offset + counts_byte_size * 2
+                counts.append(counts_unpacked.astype(np.int64))
+        self.unpacked_data["counts"] = counts
 
     def _check_uniqueness(self):
         """Check for ping-by-ping consistency of sampling parameters and reduce if identical."""
@@ -477,18 +510,6 @@ class ParseAZFP(ParseBase):
             self.parse_raw()
 
         if np.array(self.unpacked_data["profile_flag"]).size != 1:  # Only check uniqueness once.
-            # fields with num_freq data
-            field_w_freq = (
-                "dig_rate",
-                "lock_out_index",
-                "num_bins",
-                "range_samples_per_bin",
-                "data_type",
-                "gain",
-                "pulse_len",
-                "board_num",
-                "frequency",
-            )
             # fields to reduce size if the same for all pings
             field_include = (
                 "profile_flag",
@@ -501,7 +522,7 @@ class ParseAZFP(ParseBase):
                 "num_chan",
                 "spare_chan",
             )
-            for field in field_w_freq:
+            for field in FIELDS_W_FREQ:
                 uniq = np.unique(self.unpacked_data[field], axis=0)
                 if uniq.shape[0] == 1:
                     self.unpacked_data[field] = uniq.squeeze()
@@ -520,24 +541,17 @@ class ParseAZFP(ParseBase):
         if not self.unpacked_data:
             self.parse_raw()
 
-        ping_time = []
-        for ping_num, year in enumerate(self.unpacked_data["year"]):
-            ping_time.append(
-                np.datetime64(
-                    dt(
-                        year,
-                        self.unpacked_data["month"][ping_num],
-                        self.unpacked_data["day"][ping_num],
-                        self.unpacked_data["hour"][ping_num],
-                        self.unpacked_data["minute"][ping_num],
-                        int(
-                            self.unpacked_data["second"][ping_num]
-                            + self.unpacked_data["hundredths"][ping_num] / 100
-                        ),
-                    ).replace(tzinfo=None),
-                    "[ns]",
-                )
+        # seconds are truncated, dropping the hundredths of a second
+        ping_time = (
+            (self.unpacked_data["year"] - 1970).astype("datetime64[Y]")
+            + (self.unpacked_data["month"] - 1).astype("timedelta64[M]")
+            + (self.unpacked_data["day"] - 1).astype("timedelta64[D]")
+            + self.unpacked_data["hour"].astype("timedelta64[h]")
+            + self.unpacked_data["minute"].astype("timedelta64[m]")
+            + (self.unpacked_data["second"] + self.unpacked_data["hundredths"] // 100).astype(
+                "timedelta64[s]"
             )
+        ).astype("datetime64[ns]")
         self.ping_time = ping_time
 
     @staticmethod
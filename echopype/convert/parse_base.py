@@ -1,7 +1,8 @@
 import os
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime as dt
-from typing import Any, Dict, Literal, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple, Union
 
 import dask
 import dask.array as da
@@ -11,8 +12,9 @@ from dask.array.core import auto_chunks
 
 from ..utils.io import create_temp_zarr_store
 from ..utils.log import _init_logger
-from .utils.ek_raw_io import RawSimradFile, SimradEOF
-from .utils.ek_swap import calc_final_shapes
+from .utils.ek_raw_io import SimradEOF, open_raw_simrad_file
+from .utils.ek_stream import DEFAULT_PING_BLOCK_SIZE, PingBlockWriter
+from .utils.ek_swap import calc_final_shapes, get_peak_rss, plan_swap
 
 FILENAME_DATETIME_EK60 = (
     "(?P<survey>.+)?-?D(?P<date>\\w{1,8})-T(?P<time>\\w{1,6})-?(?P<postfix>\\w+)?.raw"
@@ -21,6 +23,34 @@ FILENAME_DATETIME_EK60 = (
 # Manufacturer-specific power conversion factor
 INDEX2POWER = 10.0 * np.log10(2.0) / 256.0
 
+# Value padding the shorter pings of the power and angle samples kept in their
+# native integer dtypes. Every value of these dtypes is a valid sample,
+# e.g. the angle wrap-around boundary, so the padding is tracked
+# with the number of samples of each ping instead.
+NATIVE_PADDING_VALUE = 0
+# CF encodings to store the power and angle samples as packed integers.
+# The padding, written as NaN, takes the smallest int16 value: for the power
+# samples it is reserved, as a power below -385 dB is read back as NaN,
+# and the int8 angle samples are stored in int16 to keep all their values.
+NATIVE_SAMPLE_ENCODINGS = {
+    "power": {
+        "dtype": "int16",
+        "scale_factor": np.float32(INDEX2POWER),
+        "_FillValue": np.iinfo(np.int16).min,
+    },
+    "angle": {
+        "dtype": "int16",
+        "_FillValue": np.iinfo(np.int16).min,
+    },
+}
+# Item size of each data type once rectangularized
+NATIVE_ITEMSIZES = {"power": 2, "angle": 1, "complex": 8}
+# Item size of each data type once rectangularized without keeping native dtypes
+EXPANDED_ITEMSIZES = {"power": 4, "angle": 8, "complex": 16}
+# Number of byte ranges of the raw file decoded by each worker process when parsing in parallel,
+# so that ranges decoding faster do not leave workers idle
+RANGES_PER_WORKER = 4
+
 logger = _init_logger(__name__)
 
 
@@ -69,6 +99,14 @@ class ParseEK(ParseBase):
         self.idx = defaultdict(list)  # Dictionary to store index file values
 
         self.CON1_datagram = None  # Holds the ME70 CON1 datagram
+        self.current_parameters = None  # Latest EK80 XML-parameter datagram
+        # CF encodings of the data types kept in their native dtypes when rectangularizing
+        self.sample_encodings = {}
+        # PingBlockWriter of each raw type, data type and channel when streaming samples
+        self.sample_writers = None
+        self.memory_plan = None  # Plan of the samples swapped to disk with use_swap="auto"
+        self.dgram_index = None  # Index of the datagrams when selectively decoding them
+        self.selected_channel_positions = None  # Positions of selected channels in the file
 
     def _print_status(self):
         time = dt.utcfromtimestamp(self.config_datagram["timestamp"].tolist() / 1e9).strftime(
@@ -109,54 +147,170 @@ class ParseEK(ParseBase):
 
         return all_data_shapes
 
-    def __should_use_swap(
-        self, expanded_data_shapes: Dict[str, Any], mem_mult: float = 0.4
-    ) -> bool:
-        import sys
-
-        import psutil
-
-        # Calculate expansion and current data sizes
-        total_req_mem = 0
-        current_data_size = 0
-        for raw_type, expanded_shapes in expanded_data_shapes.items():
+    def _get_expanded_sizes(self, native_dtypes: bool = False) -> Dict[Tuple[str, str, Any], int]:
+        """
+        Get the size in bytes of the rectangularized samples
+        of each raw type, data type, and channel kept in memory.
+        """
+        itemsizes = NATIVE_ITEMSIZES if native_dtypes else EXPANDED_ITEMSIZES
+        expanded_sizes = {}
+        for raw_type in self.raw_types:
             ping_data_dict = (
                 self.ping_data_dict_tx if raw_type == "transmit" else self.ping_data_dict
             )
-            for data_type, shape in expanded_shapes.items():
-                if shape:
-                    # Get current data size
-                    size = sum([sys.getsizeof(val) for val in ping_data_dict[data_type].values()])
-                    current_data_size += size
+            for data_type in self.data_types:
+                for ch_id, arr_list in ping_data_dict[data_type].items():
+                    arr_shapes = [arr.shape for arr in arr_list if arr is not None and arr.size > 0]
+                    if len(arr_shapes) == 0:
+                        continue
+                    # Each channel is padded to its longest ping when kept in memory
+                    expanded_shape = (len(arr_list),) + max(arr_shapes)
+                    expanded_sizes[(raw_type, data_type, ch_id)] = int(
+                        np.prod(expanded_shape) * itemsizes[data_type]
+                    )
+        return expanded_sizes
+
+    def plan_swap(self, native_dtypes: bool = False, mem_mult: float = 0.4) -> Dict[str, Any]:
+        """
+        Plan which rectangularized samples are kept in memory and which are swapped to disk,
+        based on their expanded sizes and the memory available to the process.
 
-                    # Estimate expansion sizes
-                    itemsize = np.dtype("float64").itemsize
-                    req_mem = np.prod(shape) * itemsize
-                    total_req_mem += req_mem
+        See ``echopype.convert.utils.ek_swap.plan_swap`` for the content of the plan.
+        """
+        return plan_swap(self._get_expanded_sizes(native_dtypes=native_dtypes), mem_mult=mem_mult)
 
-        # get statistics about system memory usage
-        mem = psutil.virtual_memory()
-        # approx. the amount of memory that will be used after expansion
-        req_mem = mem.used - current_data_size + total_req_mem
+    def stream_samples(
+        self,
+        ping_block_size: int = DEFAULT_PING_BLOCK_SIZE,
+        native_dtypes: bool = False,
+    ) -> None:
+        """
+        Stream the power, angle, and complex samples to a temporary zarr store
+        while parsing, instead of accumulating them in ``ping_data_dict``.
+
+        The samples of each channel are buffered in blocks of ``ping_block_size`` pings,
+        and each block is padded and appended to resizable zarr arrays,
+        so that the memory used does not grow with the size of the file.
+        Must be called before ``parse_raw``; ``rectangularize_data`` then
+        sets the samples in ``ping_data_dict`` as dask arrays read from these zarr arrays.
+        Power and angle samples are always stored in their native integer dtypes,
+        ``native_dtypes`` sets the packed integer encodings and float32 complex parts
+        as in ``rectangularize_data``.
+        """
+        self._stream_zarr_root = zarr.group(
+            store=create_temp_zarr_store(), overwrite=True, synchronizer=zarr.ThreadSynchronizer()
+        )
+        self._stream_ping_block_size = ping_block_size
+        self._stream_complex_part_dtype = "float32" if native_dtypes else "float64"
+        self.sample_writers = {
+            raw_type: {data_type: {} for data_type in self.data_types}
+            for raw_type in self.raw_types
+        }
+        if native_dtypes:
+            self.sample_encodings = {
+                data_type: dict(encoding) for data_type, encoding in NATIVE_SAMPLE_ENCODINGS.items()
+            }
+
+    def _make_sample_writer(self, raw_type: str, data_type: str, ch_id: Any) -> PingBlockWriter:
+        """Create the writer streaming the samples of one channel."""
+        path = os.path.join(raw_type, data_type, str(ch_id))
+        if data_type == "complex":
+            return PingBlockWriter(
+                self._stream_zarr_root,
+                path,
+                block_size=self._stream_ping_block_size,
+                split_block=lambda block: self._split_complex_samples(
+                    block, self._stream_complex_part_dtype
+                ),
+            )
+        return PingBlockWriter(
+            self._stream_zarr_root,
+            path,
+            block_size=self._stream_ping_block_size,
+            fill_value=NATIVE_PADDING_VALUE,
+        )
 
-        return mem.total * mem_mult < req_mem
+    def _set_streamed_samples(self) -> None:
+        """
+        Flush the streamed samples and set them in ``ping_data_dict``
+        as dask arrays read from the zarr arrays.
+        """
+        for raw_type, data_type_writers in self.sample_writers.items():
+            ping_data_dict = (
+                self.ping_data_dict_tx if raw_type == "transmit" else self.ping_data_dict
+            )
+            for data_type, writers in data_type_writers.items():
+                ping_data_dict[data_type] = {}
+                for ch_id, writer in writers.items():
+                    z_arrs = writer.finalize()
+                    if z_arrs is None:
+                        # No data in this channel
+                        ping_data_dict[data_type][ch_id] = None
+                        continue
+
+                    if raw_type == "receive":
+                        self.ch_ids[data_type].append(ch_id)
+
+                    if data_type == "complex":
+                        ping_data_dict[data_type][ch_id] = {
+                            complex_part: da.from_zarr(z_arr)
+                            for complex_part, z_arr in z_arrs.items()
+                        }
+                    else:
+                        ping_data_dict[data_type][ch_id] = self._decode_native_samples(
+                            da.from_zarr(z_arrs[None]), data_type, writer.sample_counts
+                        )
 
     def rectangularize_data(
         self,
         use_swap: "bool | Literal['auto']" = "auto",
         max_chunk_size: str = "100MB",
+        native_dtypes: bool = False,
     ) -> None:
         """
         Rectangularize the power, angle, and complex data.
         Additionally, convert the data to a numpy array
         indexed by channel.
+
+        With ``use_swap="auto"``, the samples of each raw type, data type, and channel
+        are kept in memory or swapped to disk following ``plan_swap``,
+        and the plan is stored in ``memory_plan`` along with the actual peak memory.
+
+        With ``native_dtypes=True``, the power and angle samples are padded
+        in their native int16 and int8 dtypes and exposed as lazily decoded float32 dask arrays,
+        with NaN after the number of samples of each ping,
+        and complex samples are split into float32 real and imaginary parts.
+
+        If the samples were streamed while parsing (see ``stream_samples``),
+        they are already padded and only need to be set in ``ping_data_dict``.
         """
+        if self.sample_writers is not None:
+            self._set_streamed_samples()
+            return
+
         # Compute the final expansion shapes for each data type
         expanded_data_shapes = self._get_data_shapes()
 
-        # Determine use_swap
+        # Determine use_swap for each variable
+        swap_vars = None
         if use_swap == "auto":
-            use_swap = self.__should_use_swap(expanded_data_shapes)
+            self.memory_plan = self.plan_swap(native_dtypes=native_dtypes)
+            swap_vars = {
+                var
+                for var, var_plan in self.memory_plan["variables"].items()
+                if var_plan["use_swap"]
+            }
+            use_swap = len(swap_vars) > 0
+            logger.info(
+                f"Swapping {len(swap_vars)} of {len(self.memory_plan['variables'])} "
+                "rectangularized variables to disk, with a predicted peak memory of "
+                f"{self.memory_plan['predicted_peak_rss'] / 2**20:.0f} MB"
+            )
+
+        if native_dtypes:
+            self.sample_encodings = {
+                data_type: dict(encoding) for data_type, encoding in NATIVE_SAMPLE_ENCODINGS.items()
+            }
 
         # Perform rectangularization
         zarr_root = None
@@ -170,17 +324,36 @@ class ParseEK(ParseBase):
 
         for raw_type in self.raw_types:
             data_type_shapes = expanded_data_shapes[raw_type]
+            ping_data_dict = (
+                self.ping_data_dict_tx if raw_type == "transmit" else self.ping_data_dict
+            )
             for data_type in self.data_types:
+                if swap_vars is None:
+                    data_use_swap = use_swap
+                else:
+                    data_use_swap = {
+                        ch_id: (raw_type, data_type, ch_id) in swap_vars
+                        for ch_id in ping_data_dict[data_type].keys()
+                    }
                 # Parse and pad the datagram
                 self._parse_and_pad_datagram(
                     data_type=data_type,
                     data_type_shapes=data_type_shapes,
                     raw_type=raw_type,
-                    use_swap=use_swap,
+                    use_swap=data_use_swap,
                     zarr_root=zarr_root,
                     max_chunk_size=max_chunk_size,
+                    native_dtypes=native_dtypes,
                 )
 
+        if swap_vars is not None:
+            self.memory_plan["actual_peak_rss"] = get_peak_rss()
+            logger.info(
+                "Rectangularized data with a predicted peak memory of "
+                f"{self.memory_plan['predicted_peak_rss'] / 2**20:.0f} MB "
+                f"and an actual peak memory of {self.memory_plan['actual_peak_rss'] / 2**20:.0f} MB"
+            )
+
     @staticmethod
     def _write_to_temp_zarr(
         arr: np.ndarray,
@@ -188,14 +361,16 @@ class ParseEK(ParseBase):
         path: str,
         shape: Tuple[int],
         chunks: Tuple[int],
+        fill_value: Any = np.nan,
+        dtype: Any = "f8",
     ) -> dask.array.Array:
         if shape == arr.shape:
             z_arr = zarr_root.array(
                 name=path,
                 data=arr,
-                fill_value=np.nan,
+                fill_value=fill_value,
                 chunks=chunks,
-                dtype="f8",
+                dtype=dtype,
                 write_empty_chunks=False,
             )
         else:
@@ -207,8 +382,8 @@ class ParseEK(ParseBase):
                 name=path,
                 shape=shape,
                 chunks=chunks,
-                dtype="f8",
-                fill_value=np.nan,  # same as float64
+                dtype=dtype,
+                fill_value=fill_value,
                 write_empty_chunks=False,
             )
 
@@ -224,10 +399,15 @@ class ParseEK(ParseBase):
         data_type,
         data_type_shapes: dict = {},
         raw_type: Literal["transmit", "receive"] = "receive",
-        use_swap: bool = False,
+        use_swap: Union[bool, Dict[Any, bool]] = False,
         zarr_root: Optional[zarr.Group] = None,
         max_chunk_size: str = "100MB",
+        native_dtypes: bool = False,
     ) -> None:
+        # use_swap may be given for each channel
+        ch_use_swap = use_swap if isinstance(use_swap, dict) else defaultdict(lambda: use_swap)
+        any_use_swap = any(use_swap.values()) if isinstance(use_swap, dict) else use_swap
+
         ping_data_dict = self.ping_data_dict_tx if raw_type == "transmit" else self.ping_data_dict
 
         # If there's no data, set and skip
@@ -236,12 +416,14 @@ class ParseEK(ParseBase):
             ping_data_dict[data_type] = no_data_dict
             return
 
-        # Set up zarr when using swap
-        # by determining the chunk sizes
-        if use_swap:
-            if zarr_root is None:
-                raise ValueError("zarr_root cannot be None when use_swap is True")
+        # Power and angle samples kept in their native integer dtypes
+        keep_native = native_dtypes and data_type in NATIVE_SAMPLE_ENCODINGS
 
+        # Set up zarr when using swap and dask arrays for native samples
+        # by determining the chunk sizes
+        if any_use_swap and zarr_root is None:
+            raise ValueError("zarr_root cannot be None when use_swap is True")
+        if any_use_swap or keep_native:
             # Get the final data shape
             data_shape = data_type_shapes[data_type]
 
@@ -271,30 +453,29 @@ class ParseEK(ParseBase):
             if raw_type == "receive":
                 self.ch_ids[data_type].append(ch_id)
 
-            # Pad shorter ping with NaN
+            # Pad shorter ping with NaN (or the padding value of native samples)
             # do this for each channel
             # this is the first small expansion
-            padded_arr = self.pad_shorter_ping(arr_list)
+            if keep_native:
+                padded_arr = self.pad_shorter_ping(arr_list, fill_value=NATIVE_PADDING_VALUE)
+                sample_counts = [len(arr) for arr in arr_list]
+            else:
+                padded_arr = self.pad_shorter_ping(arr_list)
 
             # POWER and COMPLEX Pre-processing --------
             # data_type="angle" does not require extra manipulation, so below
             # only handles power and complex data
 
             # Multiply power data by conversion factor
-            if data_type == "power":
+            # (native power samples are converted when decoded)
+            if data_type == "power" and not keep_native:
                 padded_arr = padded_arr.astype("float32") * INDEX2POWER
 
             # Split complex data into real and imaginary components
             if data_type == "complex":
-                # Split the complex data into real and imaginary components
-                padded_arr = {
-                    "real": np.real(padded_arr).astype("float64"),
-                    "imag": np.imag(padded_arr).astype("float64"),
-                }
-
-                # Take care of 0s in imaginary part data
-                imag_arr = padded_arr["imag"]
-                padded_arr["imag"] = np.where(imag_arr == 0, np.nan, imag_arr)
+                # Complex samples are complex64, so float32 components are lossless
+                complex_part_dtype = "float32" if native_dtypes else "float64"
+                padded_arr = self._split_complex_samples(padded_arr, complex_part_dtype)
 
             # END POWER and COMPLEX Pre-processing -------
 
@@ -302,7 +483,13 @@ class ParseEK(ParseBase):
             # Directly store the padded array
             # to the existing dictionary for the particular
             # data type and channel when not using swap
-            if not use_swap:
+            if not ch_use_swap[ch_id]:
+                if keep_native:
+                    padded_arr = self._decode_native_samples(
+                        da.from_array(padded_arr, chunks=chunks[: padded_arr.ndim]),
+                        data_type,
+                        sample_counts,
+                    )
                 ping_data_dict[data_type][ch_id] = padded_arr
                 continue
             # -------------------------------------------------------------------
@@ -330,6 +517,22 @@ class ParseEK(ParseBase):
                     )
                     ping_data_dict[data_type][ch_id][complex_part] = d_arr
 
+            elif keep_native:
+                d_arr = self._write_to_temp_zarr(
+                    padded_arr,
+                    zarr_root,
+                    os.path.join(raw_type, data_type, str(ch_id)),
+                    data_shape,
+                    chunks,
+                    fill_value=NATIVE_PADDING_VALUE,
+                    dtype=padded_arr.dtype,
+                )
+                # Pings expanded to the ping time of the channel hold no samples
+                sample_counts += [0] * (data_shape[0] - len(sample_counts))
+                ping_data_dict[data_type][ch_id] = self._decode_native_samples(
+                    d_arr, data_type, sample_counts
+                )
+
             else:
                 d_arr = self._write_to_temp_zarr(
                     padded_arr,
@@ -341,64 +544,453 @@ class ParseEK(ParseBase):
                 ping_data_dict[data_type][ch_id] = d_arr
             # -------------------------------------------------------------------
 
-    def parse_raw(self):
-        """Parse raw data file from Simrad EK60, EK80, and EA640 echosounders."""
-        with RawSimradFile(self.source_file, "r", storage_options=self.storage_options) as fid:
-            self.config_datagram = fid.read(1)
-            self.config_datagram["timestamp"] = np.datetime64(
-                self.config_datagram["timestamp"].replace(tzinfo=None), "[ns]"
+    @staticmethod
+    def _split_complex_samples(arr: np.ndarray, dtype: Any = "float64") -> Dict[str, np.ndarray]:
+        """
+        Split complex samples into real and imaginary components,
+        with NaN in place of 0s in the imaginary part.
+        """
+        real = np.real(arr).astype(dtype)
+        imag = np.imag(arr).astype(dtype)
+        return {"real": real, "imag": np.where(imag == 0, np.nan, imag)}
+
+    @staticmethod
+    def _decode_native_samples(
+        arr: da.Array, data_type: str, sample_counts: Iterable[int]
+    ) -> da.Array:
+        """
+        Lazily decode power or angle samples kept in their native integer dtypes
+        into float32 values, with NaN in place of the padding
+        after the ``sample_counts`` samples of each ping.
+        """
+        sample_counts = da.from_array(np.asarray(sample_counts), chunks=(arr.chunks[0],))
+        is_sample = (
+            da.arange(arr.shape[1], chunks=(arr.chunks[1],))[None, :] < sample_counts[:, None]
+        )
+        # Angle samples have an extra dimension for alongship and athwartship samples
+        is_sample = is_sample[(...,) + (None,) * (arr.ndim - 2)]
+
+        decoded = arr.astype(np.float32)
+        if data_type == "power":
+            decoded = decoded * np.float32(INDEX2POWER)
+        return da.where(is_sample, decoded, np.float32(np.nan))
+
+    @staticmethod
+    def _get_dgram_types_needed(include: Iterable[str]) -> List[str]:
+        """
+        Get the (3-character) types of the datagrams needed to set the groups in ``include``.
+
+        XML datagrams and the headers of RAW datagrams are always needed,
+        since they hold the ping times and the environment and instrument parameters.
+        """
+        dgram_types = ["XML", "RAW"]
+        if "Platform" in include or "Platform/NMEA" in include:
+            dgram_types.append("NME")
+        if "Platform" in include:
+            dgram_types.append("MRU")
+        if "Vendor_specific" in include:
+            dgram_types.append("FIL")
+        if "Sonar" in include:
+            dgram_types += ["TAG", "DEP"]
+        return dgram_types
+
+    def _select_channels(self, channels: List[str]) -> List[str]:
+        """
+        Remove the channels not in ``channels`` from the configuration datagram.
+
+        Returns the keys of the selected channels in the datagram index,
+        which are channel numbers for EK60 files and channel IDs for EK80 files.
+        """
+        # Only EK80 files have configuration in self.config_datagram
+        if "configuration" in self.config_datagram:
+            config = self.config_datagram["configuration"]
+            ch_keys = {ch: ch for ch in config.keys()}
+        else:
+            config = self.config_datagram["transceivers"]
+            ch_keys = {v["channel_id"]: ch for ch, v in config.items()}
+
+        missing_channels = [ch for ch in channels if ch not in ch_keys]
+        if missing_channels:
+            raise ValueError(f"Channels {missing_channels} are not in {self.source_file}")
+
+        # Positions of the selected channels in the file, used to subset BOT datagrams
+        self.selected_channel_positions = [
+            i for i, ch in enumerate(ch_keys.keys()) if ch in channels
+        ]
+        for ch, ch_key in ch_keys.items():
+            if ch not in channels:
+                config.pop(ch_key)
+
+        return [str(ch_keys[ch]) for ch in channels]
+
+    def _select_dgrams(
+        self,
+        dgram_index: np.ndarray,
+        include: Optional[List[str]] = None,
+        time_range: Optional[Tuple[np.datetime64, np.datetime64]] = None,
+        channels: Optional[List[str]] = None,
+    ) -> np.ndarray:
+        """
+        Select from ``dgram_index`` the datagrams needed for the groups in ``include``,
+        within ``time_range`` and belonging to ``channels`` (or not tied to a channel).
+        """
+        dgram_types = dgram_index["type"].astype("U3")
+        selected = np.ones(len(dgram_index), dtype=bool)
+        if include is not None:
+            selected &= np.isin(dgram_types, self._get_dgram_types_needed(include))
+        if time_range is not None:
+            # Configuration, parameter and filter datagrams apply to all later pings
+            # and are kept regardless of their time
+            in_time_range = (dgram_index["timestamp"] >= np.datetime64(time_range[0], "ns")) & (
+                dgram_index["timestamp"] <= np.datetime64(time_range[1], "ns")
             )
+            selected &= in_time_range | ~np.isin(dgram_types, ["RAW", "NME", "MRU", "BOT", "IDX"])
+        if channels is not None:
+            selected &= (dgram_index["channel"] == "") | np.isin(dgram_index["channel"], channels)
+        return dgram_index[selected]
 
-            # Only EK80 files have configuration in self.config_datagram
-            if "configuration" in self.config_datagram:
-                # Remove EC150 (ADCP) from config
-                channel_id = list(self.config_datagram["configuration"].keys())
-                channel_id_rm = [ch for ch in channel_id if "EC150" in ch]
-                for ch in channel_id_rm:
-                    _ = self.config_datagram["configuration"].pop(ch)
-
-                for v in self.config_datagram["configuration"].values():
-                    if "pulse_duration" not in v and "pulse_length" in v:
-                        # it seems like sometimes this field can appear with the name "pulse_length"
-                        # and in the form of floats separated by semicolons
-                        v["pulse_duration"] = [float(x) for x in v["pulse_length"].split(";")]
-
-            # print the usual converting message
-            self._print_status()
-
-            # Check if reading an ME70 file with a CON1 datagram.
-            next_datagram = fid.peek()
-            if next_datagram == "CON1":
-                self.CON1_datagram = fid.read(1)
-            else:
-                self.CON1_datagram = None
+    def _read_config_datagrams(self, fid, channels: Optional[List[str]] = None):
+        """
+        Read the configuration datagrams at the start of the file,
+        leaving ``fid`` at the first datagram following them.
+
+        Returns the keys of the selected channels in the datagram index,
+        or ``None`` if ``channels`` is not given.
+        """
+        self.config_datagram = fid.read(1)
+        self.config_datagram["timestamp"] = np.datetime64(
+            self.config_datagram["timestamp"].replace(tzinfo=None), "[ns]"
+        )
+
+        # Only EK80 files have configuration in self.config_datagram
+        if "configuration" in self.config_datagram:
+            # Remove EC150 (ADCP) from config
+            channel_id = list(self.config_datagram["configuration"].keys())
+            channel_id_rm = [ch for ch in channel_id if "EC150" in ch]
+            for ch in channel_id_rm:
+                _ = self.config_datagram["configuration"].pop(ch)
+
+            for v in self.config_datagram["configuration"].values():
+                if "pulse_duration" not in v and "pulse_length" in v:
+                    # it seems like sometimes this field can appear with the name "pulse_length"
+                    # and in the form of floats separated by semicolons
+                    v["pulse_duration"] = [float(x) for x in v["pulse_length"].split(";")]
+
+        # Remove unselected channels from config
+        ch_keys = self._select_channels(channels) if channels is not None else None
+
+        # print the usual converting message
+        self._print_status()
+
+        # Check if reading an ME70 file with a CON1 datagram.
+        next_datagram = fid.peek()
+        if next_datagram == "CON1":
+            self.CON1_datagram = fid.read(1)
+        else:
+            self.CON1_datagram = None
+
+        return ch_keys
+
+    def parse_raw(
+        self,
+        include: Optional[List[str]] = None,
+        time_range: Optional[Tuple[Any, Any]] = None,
+        channels: Optional[List[str]] = None,
+        n_workers: int = 1,
+    ):
+        """Parse raw data file from Simrad EK60, EK80, and EA640 echosounders.
+
+        If any of ``include``, ``time_range`` or ``channels`` is given,
+        the file is first indexed and only the selected datagrams are decoded.
+        The file is also indexed with ``n_workers > 1``, and split into datagram-aligned
+        byte ranges that are parsed by worker processes, see ``_read_datagrams_parallel``.
+
+        Parameters
+        ----------
+        include : list of str, optional
+            Names of the groups that will be set from the parsed data.
+            Only the datagrams needed by these groups are decoded, and the samples
+            of RAW datagrams are only decoded if ``"Sonar"`` is included.
+            Defaults to ``None``, which decodes the datagrams needed by all groups.
+        time_range : tuple, optional
+            Start and end times (inclusive) of the ping, NMEA and MRU datagrams to decode.
+        channels : list of str, optional
+            IDs of the channels to decode.
+        n_workers : int, default 1
+            Number of worker processes parsing the datagrams of the file.
+        """
+        if n_workers > 1 and self.sample_writers is not None:
+            raise ValueError("Samples cannot be streamed when parsing with several workers")
+
+        with open_raw_simrad_file(
+            self.source_file, storage_options=self.storage_options, mode="r"
+        ) as fid:
+            ch_keys = self._read_config_datagrams(fid, channels)
 
             # IDs of the channels found in the dataset
             # self.ch_ids = list(self.config_datagram['configuration'].keys())
 
             # Read the rest of datagrams
-            self._read_datagrams(fid)
+            select = include is not None or time_range is not None or channels is not None
+            if not select and n_workers == 1:
+                self._read_datagrams(fid)
+            else:
+                self.dgram_index = self._select_dgrams(
+                    fid.build_dgram_index(), include, time_range, ch_keys
+                )
+                decode_samples = include is None or "Sonar" in include
+                if n_workers > 1:
+                    self._read_datagrams_parallel(fid, self.dgram_index, decode_samples, n_workers)
+                else:
+                    self._read_datagrams(
+                        fid, dgram_index=self.dgram_index, decode_samples=decode_samples
+                    )
+                if select and not self.ping_time:
+                    raise ValueError(f"No pings selected from {self.source_file}")
 
         # Read bottom datagrams if `self.bot_file`` is not empty
         if self.bot_file != "":
-            bot_datagrams = RawSimradFile(self.bot_file, "r", storage_options=self.storage_options)
+            bot_datagrams = open_raw_simrad_file(
+                self.bot_file, storage_options=self.storage_options, mode="r"
+            )
             bot_datagrams.read(1)  # Read everything after the `.CON` config datagram
-            self._read_datagrams(bot_datagrams)
+            if time_range is None:
+                self._read_datagrams(bot_datagrams)
+            else:
+                self._read_datagrams(
+                    bot_datagrams,
+                    dgram_index=self._select_dgrams(
+                        bot_datagrams.build_dgram_index(), time_range=time_range
+                    ),
+                )
+            if channels is not None:
+                # BOT datagrams hold the depths of all channels in the file
+                self.bot["depth"] = [
+                    np.asarray(depth)[self.selected_channel_positions]
+                    for depth in self.bot["depth"]
+                ]
 
         # Read index datagrams if `self.idx_file`` is not empty
         if self.idx_file != "":
-            idx_datagrams = RawSimradFile(self.idx_file, "r", storage_options=self.storage_options)
+            idx_datagrams = open_raw_simrad_file(
+                self.idx_file, storage_options=self.storage_options, mode="r"
+            )
             idx_datagrams.read(1)  # Read everything after the `.CON` config datagram
-            self._read_datagrams(idx_datagrams)
+            if time_range is None:
+                self._read_datagrams(idx_datagrams)
+            else:
+                self._read_datagrams(
+                    idx_datagrams,
+                    dgram_index=self._select_dgrams(
+                        idx_datagrams.build_dgram_index(), time_range=time_range
+                    ),
+                )
 
         # Convert ping time to 1D numpy array, stored in dict indexed by channel,
         #  this will help merge data from all channels into a cube
         for ch, val in self.ping_time.items():
             self.ping_time[ch] = np.array(val, dtype="datetime64[ns]")
 
-    def _read_datagrams(self, fid):
+    def parse_raw_from(self, offset: Optional[int] = None, hold_last_ping: bool = False) -> int:
+        """
+        Parse the complete datagrams of the raw file from byte ``offset`` on.
+
+        This allows parsing a file still being written in successive steps:
+        a trailing datagram that is not completely written yet is not parsed,
+        and is picked up by the next step from the returned offset.
+        The configuration datagrams are read if ``offset`` is ``None``,
+        otherwise ``config_datagram`` and the other state carried
+        from one datagram to the next must be set from the previous step.
+
+        Parameters
+        ----------
+        offset : int, optional
+            Byte offset of the first datagram to parse.
+            Defaults to ``None``, which parses the file from its start.
+        hold_last_ping : bool, default False
+            Do not parse the datagrams of the last ping time and the datagrams following them,
+            since the datagrams of some channels of the last ping may not be written yet.
+            They are picked up by the next step from the returned offset.
+
+        Returns
+        -------
+        int
+            Byte offset following the last complete datagram parsed.
+        """
+        with open_raw_simrad_file(
+            self.source_file, storage_options=self.storage_options, mode="r"
+        ) as fid:
+            if offset is None:
+                self._read_config_datagrams(fid)
+            dgram_index = fid.build_dgram_index(start_offset=offset)
+            end = self._find_last_ping(dgram_index) if hold_last_ping else len(dgram_index)
+            self.dgram_index = dgram_index[:end]
+            self._read_datagrams(fid, dgram_index=self.dgram_index)
+
+        if end < len(dgram_index):
+            offset = int(dgram_index["offset"][end])
+        elif len(dgram_index) > 0:
+            # Each datagram is framed by its size before and after its contents
+            offset = int(dgram_index["offset"][-1]) + int(dgram_index["size"][-1]) + 8
+
+        for ch, val in self.ping_time.items():
+            self.ping_time[ch] = np.array(val, dtype="datetime64[ns]")
+
+        return offset
+
+    @staticmethod
+    def _find_last_ping(dgram_index: np.ndarray) -> int:
+        """
+        Find the position in ``dgram_index`` of the first datagram of the last ping time,
+        which is its first RAW datagram, or the EK80 XML datagrams preceding it
+        with the parameters of the ping. Returns the length of ``dgram_index``
+        if it holds no RAW datagrams.
+        """
+        is_raw = np.char.startswith(dgram_index["type"], "RAW")
+        if not is_raw.any():
+            return len(dgram_index)
+        last_ping_time = dgram_index["timestamp"][is_raw].max()
+        start = int(np.flatnonzero(is_raw & (dgram_index["timestamp"] == last_ping_time))[0])
+        while start > 0 and dgram_index["type"][start - 1].startswith("XML"):
+            start -= 1
+        return start
+
+    @staticmethod
+    def _split_dgram_index(dgram_index: np.ndarray, num_ranges: int) -> List[np.ndarray]:
+        """
+        Split ``dgram_index`` into at most ``num_ranges`` consecutive ranges of datagrams
+        spanning about the same number of bytes of the file.
+        """
+        if len(dgram_index) == 0:
+            return []
+        ends = np.cumsum(dgram_index["size"].astype("int64"))
+        cuts = np.searchsorted(ends, ends[-1] * np.arange(1, num_ranges) / num_ranges)
+        bounds = np.unique(np.concatenate([[0], cuts, [len(dgram_index)]]))
+        return [dgram_index[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    def _find_parameters(self, fid, dgram_index: np.ndarray, start: int):
+        """
+        Find the latest EK80 XML-parameter datagram in ``dgram_index``
+        preceding position ``start``, which holds the parameters of the pings
+        following it. Returns ``current_parameters`` if there is none.
+        """
+        is_xml = np.char.startswith(dgram_index["type"][:start], "XML")
+        for pos in np.flatnonzero(is_xml)[::-1]:
+            datagram = fid.read_at(int(dgram_index["offset"][pos]))
+            if (
+                datagram.get("subtype") == "parameter"
+                and "EC150" not in datagram["parameter"]["channel_id"]
+            ):
+                return datagram["parameter"]
+        return self.current_parameters
+
+    def _read_datagrams_parallel(
+        self, fid, dgram_index: np.ndarray, decode_samples: bool, n_workers: int
+    ):
+        """
+        Read the datagrams in ``dgram_index`` with ``n_workers`` worker processes.
+
+        ``dgram_index`` is split into datagram-aligned byte ranges, each parsed
+        by ``_read_datagrams`` in a worker into its own per-channel ping lists,
+        starting from the latest XML-parameter datagram preceding the range.
+        The ping lists of each channel are then merged in timestamp order,
+        and the NMEA and MRU data in file order.
+        """
+        ranges = self._split_dgram_index(dgram_index, n_workers * RANGES_PER_WORKER)
+        starts = np.cumsum([0] + [len(dgram_range) for dgram_range in ranges[:-1]])
+        parameters = [self._find_parameters(fid, dgram_index, start) for start in starts]
+
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            range_states = list(
+                pool.map(
+                    _read_dgram_range,
+                    [type(self)] * len(ranges),
+                    [self.source_file] * len(ranges),
+                    [self.storage_options] * len(ranges),
+                    [self.sonar_model] * len(ranges),
+                    parameters,
+                    ranges,
+                    [decode_samples] * len(ranges),
+                )
+            )
+
+        for state in range_states:
+            for key, values in state["nmea"].items():
+                self.nmea[key].extend(values)
+            for key, values in state["mru"].items():
+                self.mru[key].extend(values)
+            for ch_id, coeffs in state["fil_coeffs"].items():
+                self.fil_coeffs[ch_id].update(coeffs)
+            for ch_id, decimation_factors in state["fil_df"].items():
+                self.fil_df[ch_id].update(decimation_factors)
+            if state["environment"] is not None:
+                self.environment = state["environment"]
+            self.current_parameters = state["current_parameters"]
+
+        for raw_type, ping_data_dict in [
+            ("receive", self.ping_data_dict),
+            ("transmit", self.ping_data_dict_tx),
+        ]:
+            range_dicts = [
+                {
+                    key: {ch_id: _unpack_pings(pings) for ch_id, pings in val.items()}
+                    for key, val in state[raw_type].items()
+                }
+                for state in range_states
+            ]
+            ch_ids = dict.fromkeys(
+                ch_id for range_dict in range_dicts for ch_id in range_dict.get("timestamp", {})
+            )
+            for ch_id in ch_ids:
+                timestamps = np.array(
+                    [
+                        timestamp
+                        for range_dict in range_dicts
+                        for timestamp in range_dict.get("timestamp", {}).get(ch_id, [])
+                    ],
+                    dtype="datetime64[ns]",
+                )
+                if (np.diff(timestamps) >= np.timedelta64(0)).all():
+                    order = None
+                else:
+                    # A stable sort keeps the file order of pings with the same timestamp
+                    order = np.argsort(timestamps, kind="stable")
+                keys = dict.fromkeys(key for range_dict in range_dicts for key in range_dict)
+                for key in keys:
+                    values = [
+                        value
+                        for range_dict in range_dicts
+                        for value in range_dict.get(key, {}).get(ch_id, [])
+                    ]
+                    if values:
+                        ping_data_dict[key][ch_id].extend(
+                            values if order is None else [values[i] for i in order]
+                        )
+                if raw_type == "receive":
+                    self.ping_time[ch_id].extend(timestamps if order is None else timestamps[order])
+
+    @staticmethod
+    def _iter_datagrams(fid, dgram_index=None, decode_samples=True):
+        """
+        Iterate over the datagrams from the current position of ``fid``,
+        or over the datagrams in ``dgram_index`` if given.
+        """
+        if dgram_index is None:
+            while True:
+                try:
+                    yield fid.read(1)
+                except SimradEOF:
+                    return
+        else:
+            for offset in dgram_index["offset"]:
+                yield fid.read_at(int(offset), header_only=not decode_samples)
+
+    def _read_datagrams(self, fid, dgram_index=None, decode_samples=True):
         """Read all datagrams.
 
+        If ``dgram_index`` is given, only the datagrams it lists are read,
+        and with ``decode_samples=False`` only the headers of RAW datagrams are decoded.
+
         A sample EK60 RAW0 datagram:
             {'type': 'RAW0',
             'low_date': 71406392,
@@ -469,16 +1061,7 @@ class ParseEK(ParseBase):
         """  # noqa
         num_datagrams_parsed = 0
 
-        while True:
-            try:
-                # TODO: @ngkvain: what I need in the code to not PARSE the raw0/3 datagram
-                #  when users only want CONFIG or ENV, but the way this is implemented
-                #  the raw0/3 datagrams are still parsed, you are just not saving them
-                new_datagram = fid.read(1)
-
-            except SimradEOF:
-                break
-
+        for new_datagram in self._iter_datagrams(fid, dgram_index, decode_samples):
             # Convert the timestamp to a datetime64 object.
             new_datagram["timestamp"] = np.datetime64(
                 new_datagram["timestamp"].replace(tzinfo=None), "[ns]"
@@ -504,7 +1087,7 @@ class ParseEK(ParseBase):
                         #        f"{new_datagram['parameter']['channel_id']} from XML-parameter "
                         #        "-- NOT SKIPPING"
                         #    )
-                        current_parameters = new_datagram["parameter"]
+                        self.current_parameters = new_datagram["parameter"]
                 # else:
                 #     print(f"{new_datagram['parameter']['channel_id']} from XML-parameter")
 
@@ -528,14 +1111,14 @@ class ParseEK(ParseBase):
                     curr_ch_id = new_datagram["channel_id"]
                     # Check if the proceeding Parameter XML does not
                     # match with data in this RAW3 datagram
-                    if current_parameters["channel_id"] != curr_ch_id:
+                    if self.current_parameters["channel_id"] != curr_ch_id:
                         raise ValueError("Parameter ID does not match RAW")
 
                     # Save channel-specific ping time
                     self.ping_time[curr_ch_id].append(new_datagram["timestamp"])
 
                     # Append ping by ping data
-                    new_datagram.update(current_parameters)
+                    new_datagram.update(self.current_parameters)
                     self._append_channel_ping_data(new_datagram)
                 # else:
                 #     print(f"{new_datagram['channel_id']} from RAW3")
@@ -547,14 +1130,14 @@ class ParseEK(ParseBase):
                     curr_ch_id = new_datagram["channel_id"]
                     # Check if the proceeding Parameter XML does not
                     # match with data in this RAW4 datagram
-                    if current_parameters["channel_id"] != curr_ch_id:
+                    if self.current_parameters["channel_id"] != curr_ch_id:
                         raise ValueError("Parameter ID does not match RAW")
 
                     # Ping time is identical to the immediately following RAW3 datagram
                     # so does not need to be stored separately
 
                     # Append ping by ping data
-                    new_datagram.update(current_parameters)
+                    new_datagram.update(self.current_parameters)
                     self._append_channel_ping_data(new_datagram, raw_type="transmit")
                 # else:
                 #     print(f"{new_datagram['channel_id']} from RAW4")
@@ -633,13 +1216,19 @@ class ParseEK(ParseBase):
         ch_id = datagram["channel_id"] if "channel_id" in datagram else datagram["channel"]
 
         for k, v in datagram.items():
-            if raw_type == "receive":
+            if self.sample_writers is not None and k in self.data_types:
+                # Stream the samples in blocks of pings when enabled
+                writers = self.sample_writers[raw_type][k]
+                if ch_id not in writers:
+                    writers[ch_id] = self._make_sample_writer(raw_type, k, ch_id)
+                writers[ch_id].append(v)
+            elif raw_type == "receive":
                 self.ping_data_dict[k][ch_id].append(v)
             else:
                 self.ping_data_dict_tx[k][ch_id].append(v)
 
     @staticmethod
-    def pad_shorter_ping(data_list) -> np.ndarray:
+    def pad_shorter_ping(data_list, fill_value=np.nan) -> np.ndarray:
         """
         Pad shorter ping with NaN: power, angle, complex samples.
 
@@ -648,12 +1237,15 @@ class ParseEK(ParseBase):
         data_list : list
             Power, angle, or complex samples for each channel from RAW3 datagram.
             Each ping is one entry in the list.
+        fill_value : scalar, default np.nan
+            Value used to pad shorter pings.
+            A non-NaN fill value keeps the dtype of the samples.
 
         Returns
         -------
         out_array : np.ndarray
             Numpy array containing samplings from all pings.
-            The array is NaN-padded if some pings are of different lengths.
+            The array is padded with ``fill_value`` if some pings are of different lengths.
         """
         lens = np.array([len(item) for item in data_list])
         if np.unique(lens).size != 1:  # if some pings have different lengths along range
@@ -669,18 +1261,91 @@ class ParseEK(ParseBase):
             else:
                 mask = lens[:, None] > np.arange(lens.max())
 
-            # Create output array from mask
-            out_array = np.full(mask.shape, np.nan)
-
             # Concatenate short pings
             concat_short_pings = np.concatenate(data_list).reshape(-1)  # reshape in case data > 1D
 
-            # Take care of problem of np.nan being implicitly "real"
-            if concat_short_pings.dtype == np.complex64:
-                out_array = out_array.astype(np.complex64)
+            # Create output array from mask
+            if np.isnan(fill_value):
+                out_array = np.full(mask.shape, np.nan)
+                # Take care of problem of np.nan being implicitly "real"
+                if concat_short_pings.dtype == np.complex64:
+                    out_array = out_array.astype(np.complex64)
+            else:
+                out_array = np.full(mask.shape, fill_value, dtype=concat_short_pings.dtype)
 
             # Fill in values
             out_array[mask] = concat_short_pings
         else:
             out_array = np.array(data_list)
         return out_array
+
+
+def _read_dgram_range(
+    parser_class,
+    file,
+    storage_options,
+    sonar_model,
+    current_parameters,
+    dgram_index,
+    decode_samples,
+):
+    """
+    Parse the datagrams of ``file`` listed in ``dgram_index`` in a worker process,
+    starting from the EK80 XML-parameter datagram ``current_parameters``.
+
+    Returns the per-channel ping data of the receive and transmit raw types,
+    packed by ``_pack_pings``, and the other data parsed from the datagrams
+    as plain dictionaries.
+    """
+    parser = parser_class(
+        file, bot_file="", idx_file="", storage_options=storage_options, sonar_model=sonar_model
+    )
+    parser.current_parameters = current_parameters
+    parser.environment = None
+    with open_raw_simrad_file(file, storage_options=storage_options, mode="r") as fid:
+        parser._read_datagrams(fid, dgram_index=dgram_index, decode_samples=decode_samples)
+
+    return {
+        "receive": {
+            key: {ch_id: _pack_pings(pings) for ch_id, pings in val.items()}
+            for key, val in parser.ping_data_dict.items()
+        },
+        "transmit": {
+            key: {ch_id: _pack_pings(pings) for ch_id, pings in val.items()}
+            for key, val in parser.ping_data_dict_tx.items()
+        },
+        "nmea": dict(parser.nmea),
+        "mru": dict(parser.mru),
+        "fil_coeffs": dict(parser.fil_coeffs),
+        "fil_df": dict(parser.fil_df),
+        "environment": parser.environment,
+        "current_parameters": parser.current_parameters,
+    }
+
+
+def _pack_pings(pings: list):
+    """
+    Pack the ping values of a channel into a single array if they are arrays
+    of the same dtype and trailing dimensions, or timestamps,
+    which sends them between processes much faster than one object per ping.
+    Returns a ``(data, lengths)`` tuple, or ``pings`` unchanged if they cannot be packed.
+    """
+    if all(isinstance(ping, np.datetime64) for ping in pings):
+        return np.array(pings, dtype="datetime64[ns]"), None
+    if (
+        pings
+        and all(isinstance(ping, np.ndarray) and ping.ndim > 0 for ping in pings)
+        and len({(ping.dtype, ping.shape[1:]) for ping in pings}) == 1
+    ):
+        return np.concatenate(pings), np.array([len(ping) for ping in pings])
+    return pings
+
+
+def _unpack_pings(packed) -> list:
+    """Unpack the ping values of a channel packed by ``_pack_pings``."""
+    if not isinstance(packed, tuple):
+        return packed
+    data, lengths = packed
+    if lengths is None:
+        return list(data)
+    return np.split(data, np.cumsum(lengths)[:-1])
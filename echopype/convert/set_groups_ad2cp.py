@@ -26,6 +26,23 @@ class BeamGroup(Enum):
     ECHOSOUNDER_RAW = auto()
 
 
+STRING_PACKET_ID = 0xA0
+# data record ids of the packets along each ping time dimension
+TIME_DIM_PACKET_IDS: Dict[Dimension, Tuple[int, ...]] = {
+    Dimension.PING_TIME_AVERAGE: (0x16,),
+    Dimension.PING_TIME_BURST: (0x15, 0x18),
+    Dimension.PING_TIME_ECHOSOUNDER: (0x1C,),
+    Dimension.PING_TIME_ECHOSOUNDER_RAW: (0x23,),
+    Dimension.PING_TIME_ECHOSOUNDER_RAW_TRANSMIT: (0x24,),
+}
+BEAM_GROUP_TIME_DIMS: Dict[BeamGroup, Dimension] = {
+    BeamGroup.AVERAGE: Dimension.PING_TIME_AVERAGE,
+    BeamGroup.BURST: Dimension.PING_TIME_BURST,
+    BeamGroup.ECHOSOUNDER: Dimension.PING_TIME_ECHOSOUNDER,
+    BeamGroup.ECHOSOUNDER_RAW: Dimension.PING_TIME_ECHOSOUNDER_RAW,
+}
+
+
 class SetGroupsAd2cp(SetGroupsBase):
     """Class for saving groups to netcdf or zarr from Ad2cp data files."""
 
@@ -35,79 +52,88 @@ class SetGroupsAd2cp(SetGroupsBase):
         # resulting in index error in setting ds["pulse_compressed"]
         self.pulse_compressed = self.parser_obj.get_pulse_compressed()
         self._make_time_coords()
+        self.beam_coords = self._make_beam_coords()
         with resources.open_text(convert, "ad2cp_fields.yaml") as f:
             self.field_attrs: Dict[str, Dict[str, Dict[str, str]]] = yaml.safe_load(f)  # type: ignore # noqa
 
     def _make_time_coords(self):
-        timestamps = []
-        times_idx = {
-            Dimension.PING_TIME_AVERAGE: [],
-            Dimension.PING_TIME_BURST: [],
-            Dimension.PING_TIME_ECHOSOUNDER: [],
-            Dimension.PING_TIME_ECHOSOUNDER_RAW: [],
-            Dimension.PING_TIME_ECHOSOUNDER_RAW_TRANSMIT: [],
+        packet_ids = self.parser_obj.packet_ids()
+        has_timestamp = packet_ids != STRING_PACKET_ID
+        # data record id and store row of each packet with a timestamp, in file order
+        self.packet_ids = packet_ids[has_timestamp]
+        self.packet_rows = self.parser_obj.packet_rows()[has_timestamp]
+        self.timestamps = self.parser_obj.packet_timestamps()[has_timestamp]
+
+        # data record ids in the order in which they first appear in the file
+        unique_ids, first_idx = np.unique(self.packet_ids, return_index=True)
+        self.unique_packet_ids = [int(packet_id) for packet_id in unique_ids[np.argsort(first_idx)]]
+        self.packet_id_masks = {
+            packet_id: self.packet_ids == packet_id for packet_id in self.unique_packet_ids
         }
 
-        for packet in self.parser_obj.packets:
-            if not packet.has_timestamp():
-                continue
-            timestamps.append(packet.timestamp)
-            i = len(timestamps) - 1
-            if packet.is_average():
-                times_idx[Dimension.PING_TIME_AVERAGE].append(i)
-            elif packet.is_burst():
-                times_idx[Dimension.PING_TIME_BURST].append(i)
-            elif packet.is_echosounder():
-                times_idx[Dimension.PING_TIME_ECHOSOUNDER].append(i)
-            elif packet.is_echosounder_raw():
-                times_idx[Dimension.PING_TIME_ECHOSOUNDER_RAW].append(i)
-            elif packet.is_echosounder_raw_transmit():
-                times_idx[Dimension.PING_TIME_ECHOSOUNDER_RAW_TRANSMIT].append(i)
-
         self.times_idx = {
-            time_dim: np.array(time_values, dtype="u8")
-            for time_dim, time_values in times_idx.items()
+            time_dim: np.flatnonzero(np.isin(self.packet_ids, time_dim_ids)).astype("u8")
+            for time_dim, time_dim_ids in TIME_DIM_PACKET_IDS.items()
         }
-        self.timestamps = np.array(timestamps)
         _, unique_ping_time_idx = np.unique(self.timestamps, return_index=True)
         self.times_idx[Dimension.PING_TIME] = unique_ping_time_idx
 
+    def _make_beam_coords(self) -> Optional[np.ndarray]:
+        """
+        Returns the beams of the first packet with the largest number of beams
+        """
+
+        # number of beams in each packet, -1 if the packet does not have beams
+        num_beams = np.full(len(self.packet_ids), -1)
+        beams = np.zeros((len(self.packet_ids), 0), dtype="<u8")
+        for packet_id in self.unique_packet_ids:
+            store = self.parser_obj.packet_stores[packet_id]
+            column = store.column("beams")
+            if column is None:
+                continue
+            mask = self.packet_id_masks[packet_id]
+            rows = self.packet_rows[mask]
+            values = column.values(store.num_packets)[rows]
+            if values.shape[1] > beams.shape[1]:
+                beams = np.pad(beams, ((0, 0), (0, values.shape[1] - beams.shape[1])))
+            beams[mask, : values.shape[1]] = values
+            # beams are always positive, the zeros are padding
+            num_beams[mask] = np.where(
+                column.present_mask(store.num_packets)[rows],
+                np.count_nonzero(values, axis=1),
+                -1,
+            )
+        if len(num_beams) == 0 or num_beams.max() < 0:
+            return None
+        i = np.argmax(num_beams)
+        return beams[i, : num_beams[i]]
+
     def _make_dataset(self, var_names: Dict[str, str]) -> xr.Dataset:
         """
         Constructs a dataset of the given variables using parser_obj data
         var_names maps parser_obj field names to output dataset variable names
         """
 
-        # {field_name: [field_value]}
-        #   [field_value] lines up with time_dim
-        fields: Dict[str, List[np.ndarray]] = {field_name: [] for field_name in var_names.keys()}
+        # {field_name: field_value}
+        #   field_value lines up with time_dim
+        combined_fields: Dict[str, np.ndarray] = dict()
         # {field_name: [Dimension]}
         dims: Dict[str, List[Dimension]] = dict()
         # {field_name: field dtype}
         dtypes: Dict[str, np.dtype] = dict()
         # {field_name: attrs}
         attrs: Dict[str, Dict[str, str]] = dict()
-        # {field_name: [idx of padding]}
-        pad_idx: Dict[str, List[int]] = {field_name: [] for field_name in var_names.keys()}
         # {field_name: field exists}
         field_exists: Dict[str, bool] = {field_name: False for field_name in var_names.keys()}
-        beam_coords: Optional[np.ndarray] = None
-        # separate by time dim
-        for packet in self.parser_obj.packets:
-            if not packet.has_timestamp():
-                continue
-            if "beams" in packet.data:
-                if beam_coords is None:
-                    beam_coords = packet.data["beams"]
-                else:
-                    beam_coords = max(beam_coords, packet.data["beams"], key=lambda x: len(x))
+        # look up the format of each data record id in the order they appear in the file
+        for packet_id in self.unique_packet_ids:
+            store = self.parser_obj.packet_stores[packet_id]
             data_record_format = HeaderOrDataRecordFormats.data_record_format(
-                packet.data_record_type
+                store.data_record_type
             )
             for field_name in var_names.keys():
                 field = data_record_format.get_field(field_name)
                 if field is None:
-                    field_dimensions = Field.default_dimensions()
                     # can't store in dims yet because there might be another data record format
                     #   which does have this field
 
@@ -115,30 +141,19 @@ class SetGroupsAd2cp(SetGroupsBase):
                         if field_name in self.field_attrs["POSTPROCESSED"]:
                             attrs[field_name] = self.field_attrs["POSTPROCESSED"][field_name]
                 else:
-                    field_dimensions = field.dimensions(packet.data_record_type)
-
                     if field_name not in dims:
-                        dims[field_name] = field_dimensions
+                        dims[field_name] = field.dimensions(store.data_record_type)
                     if field_name not in dtypes:
                         field_entry_size_bytes = field.field_entry_size_bytes
                         if callable(field_entry_size_bytes):
-                            field_entry_size_bytes = field_entry_size_bytes(packet)
+                            field_entry_size_bytes = field_entry_size_bytes(store.first_packet)
                         dtypes[field_name] = field.field_entry_data_type.dtype(
                             field_entry_size_bytes
                         )
                     if field_name not in attrs:
                         attrs[field_name] = self.field_attrs[data_record_format.name][field_name]
 
-                if field_name in packet.data:  # field is in this packet
-                    fields[field_name].append(packet.data[field_name])
-                    field_exists[field_name] = True
-                else:  # field is not in this packet
-                    # pad the list of field values with an empty array so that
-                    #   the time dimension still lines up with the field values
-                    fields[field_name].append(np.array(0))
-                    pad_idx[field_name].append(len(fields[field_name]) - 1)
-
-        for field_name in fields.keys():
+        for field_name in var_names.keys():
             # add dimensions to dims if they were not found
             #   (the desired fields did not exist in any of the packet's data records
             #   because they are in a different packet OR it is a field created by echopype
@@ -152,44 +167,40 @@ class SetGroupsAd2cp(SetGroupsBase):
             if field_name not in dtypes:
                 dtypes[field_name] = DataType.default_dtype()
 
-        # replace padding with correct shaped padding
-        #   (earlier we padded along the time dimension but we didn't necessarily know the shape
-        #   of the padding itself)
-        for field_name, pad_idxs in pad_idx.items():
-            for i in pad_idxs:
-                fields[field_name][i] = np.zeros(
-                    np.ones(len(dims[field_name]) - 1, dtype="u1"),  # type: ignore
-                    dtype=dtypes[field_name],
-                )
-
-        # {field_name: field_value}
-        #   field_value is now combined along time_dim
-        combined_fields: Dict[str, np.ndarray] = dict()
-        # pad to max shape and stack
-        for field_name, field_values in fields.items():
-            if field_exists[field_name]:
-                if len(dims[field_name]) > 1:
-                    shapes = [field_value.shape for field_value in field_values]
-                    max_shape = np.amax(
-                        np.stack(shapes),
-                        axis=0,
-                    )
-                    field_values = [
-                        np.pad(
-                            field_value,
-                            tuple(
-                                (0, max_axis_len - field_value.shape[i])
-                                for i, max_axis_len in enumerate(max_shape)  # type: ignore
-                            ),
-                        )
-                        for field_value in field_values
-                    ]
-                field_values = np.stack(field_values)
-                combined_fields[field_name] = field_values
-
-        # slice fields to time_dim
-        for field_name, field_value in combined_fields.items():
-            combined_fields[field_name] = field_value[self.times_idx[dims[field_name][0]]]
+            # packets without the field are padded with zeros, and values are padded
+            #   with zeros to the largest shape of the field across packets
+            present = np.zeros(len(self.packet_ids), dtype=bool)
+            columns = []
+            for packet_id in self.unique_packet_ids:
+                store = self.parser_obj.packet_stores[packet_id]
+                column = store.column(field_name)
+                if column is None:
+                    continue
+                mask = self.packet_id_masks[packet_id]
+                present[mask] = column.present_mask(store.num_packets)[self.packet_rows[mask]]
+                columns.append((packet_id, store, column))
+            if not present.any():
+                continue
+            field_exists[field_name] = True
+
+            dtype = np.result_type(*[column.buffer.dtype for _, _, column in columns])
+            shape = np.amax([column.buffer.shape[1:] for _, _, column in columns], axis=0)
+            if not present.all():
+                dtype = np.result_type(dtype, dtypes[field_name])
+                shape = np.maximum(shape, 1)
+
+            # slice fields to time_dim
+            time_idx = self.times_idx[dims[field_name][0]]
+            packet_ids = self.packet_ids[time_idx]
+            packet_rows = self.packet_rows[time_idx]
+            field_value = np.zeros((len(time_idx),) + tuple(shape), dtype=dtype)
+            for packet_id, store, column in columns:
+                selected = packet_ids == packet_id
+                if not selected.any():
+                    continue
+                values = column.values(store.num_packets)[packet_rows[selected]]
+                field_value[(selected,) + tuple(slice(0, n) for n in values.shape[1:])] = values
+            combined_fields[field_name] = field_value
 
         # make ds
         used_dims: Set[Dimension] = {
@@ -220,8 +231,8 @@ class SetGroupsAd2cp(SetGroupsBase):
         for ahrs_dim, ahrs_coords in AHRS_COORDS.items():
             if ahrs_dim in used_dims:
                 coords[ahrs_dim.dimension_name()] = ahrs_coords
-        if Dimension.BEAM in used_dims and beam_coords is not None:
-            coords[Dimension.BEAM.dimension_name()] = beam_coords
+        if Dimension.BEAM in used_dims and self.beam_coords is not None:
+            coords[Dimension.BEAM.dimension_name()] = self.beam_coords
         ds = xr.Dataset(data_vars=data_vars, coords=coords)
         # make arange coords for the remaining dims
         non_coord_dims = {dim.dimension_name() for dim in used_dims} - set(ds.coords.keys())
@@ -255,20 +266,11 @@ class SetGroupsAd2cp(SetGroupsBase):
         # and range_bin_echosounder)?
         beam_groups = []
         self._beamgroups = []
-        beam_groups_exist = set()
-
-        for packet in self.parser_obj.packets:
-            if packet.is_average():
-                beam_groups_exist.add(BeamGroup.AVERAGE)
-            elif packet.is_burst():
-                beam_groups_exist.add(BeamGroup.BURST)
-            elif packet.is_echosounder():
-                beam_groups_exist.add(BeamGroup.ECHOSOUNDER)
-            elif packet.is_echosounder_raw():
-                beam_groups_exist.add(BeamGroup.ECHOSOUNDER_RAW)
-
-            if len(beam_groups_exist) == len(BeamGroup):
-                break
+        beam_groups_exist = {
+            beam_group
+            for beam_group, time_dim in BEAM_GROUP_TIME_DIMS.items()
+            if len(self.times_idx[time_dim]) > 0
+        }
 
         # average
         if BeamGroup.AVERAGE in beam_groups_exist:
@@ -503,19 +505,18 @@ class SetGroupsAd2cp(SetGroupsBase):
         beam_groups_vars, beam_groups_coord = self._beam_groups_vars()
         ds = xr.Dataset(beam_groups_vars, coords=beam_groups_coord)
 
+        serial_numbers = []
+        for store in self.parser_obj.packet_stores.values():
+            column = store.column("serial_number")
+            if column is not None:
+                present = column.present_mask(store.num_packets)
+                serial_numbers.extend(str(v) for v in column.values(store.num_packets)[present])
+
         # Assemble sonar group global attribute dictionary
         sonar_attr_dict = {
             "sonar_manufacturer": "Nortek",
             "sonar_model": "AD2CP",
-            "sonar_serial_number": ", ".join(
-                np.unique(
-                    [
-                        str(packet.data["serial_number"])
-                        for packet in self.parser_obj.packets
-                        if "serial_number" in packet.data
-                    ]
-                )
-            ),
+            "sonar_serial_number": ", ".join(np.unique(serial_numbers)),
             "sonar_software_name": "",
             "sonar_software_version": "",
             "sonar_firmware_version": "",
@@ -342,11 +342,7 @@ class SetGroupsAZFP(SetGroupsBase):
         # Build variables in the output xarray Dataset
         N = []  # for storing backscatter_r values for each frequency
         for ich in self.parser_obj.freq_ind_sorted:
-            N.append(
-                np.array(
-                    [unpacked_data["counts"][p][ich] for p in range(len(unpacked_data["year"]))]
-                )
-            )
+            N.append(unpacked_data["counts"][ich])
 
         # Largest number of counts along the range dimension among the different channels
         longest_range_sample = np.max(unpacked_data["num_bins"])
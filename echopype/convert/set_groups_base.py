@@ -1,17 +1,23 @@
 import abc
-import warnings
-from typing import List, Set
+from typing import Dict, List, Set
 
 import numpy as np
-import pynmea2
 import xarray as xr
 
 from ..echodata.convention import sonarnetcdf_1
 from ..utils.coding import COMPRESSION_SETTINGS, DEFAULT_TIME_ENCODING, set_time_encodings
 from ..utils.prov import echopype_prov_attrs, source_files_vars
+from .utils.nmea import decode_nmea_latlon
 
 NMEA_SENTENCE_DEFAULT = ["GGA", "GLL", "RMC"]
 
+# Parser data types of the backscatter sample variables in the beam groups
+SAMPLE_DATA_TYPES = {
+    "backscatter_r": "power",
+    "angle_athwartship": "angle",
+    "angle_alongship": "angle",
+}
+
 
 class SetGroupsBase(abc.ABC):
     """Base class for saving groups to netcdf or zarr from echosounder data files."""
@@ -179,48 +185,10 @@ class SetGroupsBase(abc.ABC):
     # TODO: move this to be part of parser as it is not a "set" operation
     def _extract_NMEA_latlon(self):
         """Get the lat and lon values from the raw nmea data"""
-        messages = [string[3:6] for string in self.parser_obj.nmea["nmea_string"]]
-        idx_loc = np.argwhere(np.isin(messages, NMEA_SENTENCE_DEFAULT)).squeeze()
-        if idx_loc.size == 1:  # in case of only 1 matching message
-            idx_loc = np.expand_dims(idx_loc, axis=0)
-        nmea_msg = []
-        for x in idx_loc:
-            try:
-                nmea_msg.append(pynmea2.parse(self.parser_obj.nmea["nmea_string"][x]))
-            except (
-                pynmea2.ChecksumError,
-                pynmea2.SentenceTypeError,
-                AttributeError,
-                pynmea2.ParseError,
-            ):
-                nmea_msg.append(None)
-        if nmea_msg:
-            lat, lon = [], []
-            for x in nmea_msg:
-                try:
-                    lat.append(x.latitude if hasattr(x, "latitude") else np.nan)
-                except ValueError as ve:
-                    lat.append(np.nan)
-                    warnings.warn(
-                        "At least one latitude entry is problematic and "
-                        f"are assigned None in the converted data: {str(ve)}"
-                    )
-                try:
-                    lon.append(x.longitude if hasattr(x, "longitude") else np.nan)
-                except ValueError as ve:
-                    lon.append(np.nan)
-                    warnings.warn(
-                        f"At least one longitude entry is problematic and "
-                        f"are assigned None in the converted data: {str(ve)}"
-                    )
-        else:
-            lat, lon = [np.nan], [np.nan]
-        msg_type = (
-            [x.sentence_type if hasattr(x, "sentence_type") else np.nan for x in nmea_msg]
-            if nmea_msg
-            else [np.nan]
+        idx_loc, msg_type, lat, lon = decode_nmea_latlon(
+            self.parser_obj.nmea["nmea_string"], NMEA_SENTENCE_DEFAULT
         )
-        if nmea_msg:
+        if idx_loc.size > 0:
             time1, _, _ = xr.coding.times.encode_cf_datetime(
                 np.array(self.parser_obj.nmea["timestamp"])[idx_loc],
                 **{
@@ -229,7 +197,7 @@ class SetGroupsBase(abc.ABC):
                 },
             )
         else:
-            time1 = [np.nan]
+            time1, msg_type, lat, lon = [np.nan], [np.nan], [np.nan], [np.nan]
 
         return time1, msg_type, lat, lon
 
@@ -363,6 +331,23 @@ class SetGroupsBase(abc.ABC):
         self._add_ping_time_dim(ds, beam_ping_time_names, ping_time_only_names)
         self._add_beam_dim(ds, beam_only_names, beam_ping_time_names)
 
+    def _set_sample_encodings(self, ds: xr.Dataset, var_data_types: Dict[str, str]) -> None:
+        """
+        Attach the CF encodings of the samples kept in their native dtypes
+        by the parser, so that they are stored as packed integers.
+
+        Parameters
+        ----------
+        ds : xr.Dataset
+            Dataset corresponding to ``Beam_groupX``.
+        var_data_types : Dict[str, str]
+            Mapping of variable names to the parser data types, e.g. ``"power"``.
+        """
+        sample_encodings = getattr(self.parser_obj, "sample_encodings", {})
+        for var_name, data_type in var_data_types.items():
+            if var_name in ds and data_type in sample_encodings:
+                ds[var_name].encoding.update(sample_encodings[data_type])
+
     def _add_index_data_to_platform_ds(
         self,
         platform_ds: xr.Dataset,
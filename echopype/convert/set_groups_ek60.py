@@ -8,7 +8,7 @@ from ..utils.coding import set_time_encodings
 from ..utils.log import _init_logger
 
 # fmt: off
-from .set_groups_base import SetGroupsBase
+from .set_groups_base import SAMPLE_DATA_TYPES, SetGroupsBase
 
 # fmt: on
 
@@ -708,6 +708,9 @@ class SetGroupsEK60(SetGroupsBase):
             ds, self.beam_only_names, self.beam_ping_time_names, self.ping_time_only_names
         )
 
+        # Store power and angle samples as packed integers when kept so by the parser
+        self._set_sample_encodings(ds, SAMPLE_DATA_TYPES)
+
         return [set_time_encodings(ds)]
 
     def set_vendor(self) -> xr.Dataset:
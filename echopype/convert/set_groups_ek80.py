@@ -7,7 +7,7 @@ from numpy.typing import NDArray
 
 from ..utils.coding import set_time_encodings
 from ..utils.log import _init_logger
-from .set_groups_base import SetGroupsBase
+from .set_groups_base import SAMPLE_DATA_TYPES, SetGroupsBase
 
 logger = _init_logger(__name__)
 
@@ -1126,6 +1126,13 @@ class SetGroupsEK80(SetGroupsBase):
             ds_beam, self.beam_only_names, self.beam_ping_time_names, self.ping_time_only_names
         )
 
+        # Store power and angle samples as packed integers when kept so by the parser
+        # (backscatter_r holds the real part of complex samples in the complex beam group)
+        if isinstance(ds_beam_power, xr.Dataset):
+            self._set_sample_encodings(ds_beam_power, SAMPLE_DATA_TYPES)
+        elif len(ds_complex) == 0:
+            self._set_sample_encodings(ds_beam, SAMPLE_DATA_TYPES)
+
         return [ds_beam, ds_beam_power]
 
     def set_vendor(self) -> xr.Dataset:
@@ -6,19 +6,28 @@ by Rick Towler <rick.towler@noaa.gov> at NOAA AFSC.
 Contains low-level functions called by ./ek_raw_parsers.py
 """
 
+import mmap
 import struct
 from io import SEEK_CUR, SEEK_END, SEEK_SET, BufferedReader, FileIO
 
 import fsspec
+import numpy as np
 from fsspec.implementations.local import LocalFileSystem
 
 from ...utils.log import _init_logger
 from . import ek_raw_parsers as parsers
 
-__all__ = ["RawSimradFile"]
+__all__ = ["RawSimradFile", "RawSimradMmapFile", "open_raw_simrad_file"]
 
 logger = _init_logger(__name__)
 
+#: Number of 100 ns intervals between the NT epoch (1601-01-01) and the unix epoch
+NT_UNIX_EPOCH_OFFSET = 116444736000000000
+
+#: Byte offset of the channel ID from the start of the datagram type,
+#: for datagrams that are tied to a channel through a channel ID
+DGRAM_CHANNEL_ID_OFFSET = {"RAW3": 12, "RAW4": 12, "FIL1": 16}
+
 
 class SimradEOF(Exception):
     def __init__(self, message="EOF Reached!"):
@@ -364,7 +373,7 @@ class RawSimradFile(BufferedReader):
         #  11/26/19 - RHT - Modified this method to pass through the number of
         #  bytes read so we can bubble that up to the user.
 
-        dgram_type = raw_datagram_string[:3].decode()
+        dgram_type = bytes(raw_datagram_string[:3]).decode()
         try:
             parser = self.DGRAM_TYPE_KEY[dgram_type]
         except KeyError:
@@ -470,6 +479,126 @@ class RawSimradFile(BufferedReader):
 
         return dgram_list
 
+    def build_dgram_index(self, start_offset=None):
+        """
+        :param start_offset: byte offset of the first datagram to scan,
+            defaults to the current position
+        :type start_offset: int
+
+        Scans the file once from the current position, or from ``start_offset`` if given,
+        recording the location, type, channel and timestamp of every datagram
+        without decoding its contents. Scanning stops at the first datagram
+        that is not completely written.
+        The file position is reset back to the original location afterwards.
+
+        :returns: numpy structured array with fields
+            offset (byte offset of the datagram in the file), size (datagram size),
+            type (e.g. 'RAW3'), channel (channel number for RAW0 datagrams,
+            channel ID for RAW3/RAW4/FIL1 datagrams, empty otherwise) and timestamp
+        """
+
+        old_file_pos = self._tell_bytes()
+        old_dgram_offset = self.tell()
+        if start_offset is not None:
+            self._seek_bytes(start_offset, SEEK_SET)
+
+        offsets, sizes, types, channels, low_dates, high_dates = [], [], [], [], [], []
+        while True:
+            offset = self._tell_bytes()
+            try:
+                header = self._read_dgram_header()
+            except (DatagramReadError, SimradEOF):
+                break
+
+            if header["size"] < 16:
+                #  size can't be smaller than the header size
+                try:
+                    self._find_next_datagram()
+                except SimradEOF:
+                    break
+                continue
+
+            self._seek_bytes(offset + header["size"] + 4, SEEK_SET)
+            try:
+                dgram_size_check = self._read_dgram_size()
+            except DatagramReadError:
+                break
+            if header["size"] != dgram_size_check:
+                try:
+                    self._find_next_datagram()
+                except SimradEOF:
+                    break
+                continue
+
+            #  skip datagrams with invalid time data as the datagram reader does
+            if (header["low_date"], header["high_date"]) == (0, 0):
+                continue
+
+            #  get the channel the datagram belongs to, if any
+            end_pos = self._tell_bytes()
+            if header["type"] == "RAW0":
+                self._seek_bytes(offset + 16, SEEK_SET)
+                channel = str(struct.unpack("=h", self._read_bytes(2))[0])
+            elif header["type"] in DGRAM_CHANNEL_ID_OFFSET:
+                self._seek_bytes(offset + 4 + DGRAM_CHANNEL_ID_OFFSET[header["type"]], SEEK_SET)
+                channel = self._read_bytes(128).decode("latin_1").strip("\x00")
+            else:
+                channel = ""
+            self._seek_bytes(end_pos, SEEK_SET)
+
+            offsets.append(offset)
+            sizes.append(header["size"])
+            types.append(header["type"])
+            channels.append(channel)
+            low_dates.append(header["low_date"])
+            high_dates.append(header["high_date"])
+
+        self._seek_bytes(old_file_pos, SEEK_SET)
+        self._current_dgram_offset = old_dgram_offset
+
+        nt_dates = (np.array(high_dates, dtype="int64") << 32) + np.array(low_dates, dtype="int64")
+        timestamps = ((nt_dates - NT_UNIX_EPOCH_OFFSET) * 100).astype("datetime64[ns]")
+
+        return np.rec.fromarrays(
+            [
+                np.array(offsets, dtype="int64"),
+                np.array(sizes, dtype="int32"),
+                np.array(types, dtype="U4"),
+                np.array(channels, dtype="U"),
+                timestamps,
+            ],
+            names=["offset", "size", "type", "channel", "timestamp"],
+        ).view(np.ndarray)
+
+    def read_at(self, offset, header_only=False):
+        """
+        :param offset: byte offset of the datagram, e.g. from self.build_dgram_index()
+        :type offset: int
+
+        :param header_only: only decode the header of RAW datagrams, skipping their samples
+        :type header_only: bool
+
+        Reads the datagram starting at the given byte offset.
+        """
+
+        self._seek_bytes(offset, SEEK_SET)
+        if not header_only:
+            return self._read_next_dgram()
+
+        header = self._read_dgram_header()
+        if not header["type"].startswith("RAW"):
+            self._seek_bytes(offset, SEEK_SET)
+            return self._read_next_dgram()
+
+        #  only read the bytes of the header, without the samples
+        parser = self.DGRAM_TYPE_KEY["RAW"]
+        header_size = parser.header_size(int(header["type"][3]))
+        raw_header = header["raw_bytes"] + self._read_bytes(header_size - 12)
+        self._seek_bytes(offset + header["size"] + 8, SEEK_SET)
+        self._current_dgram_offset += 1
+
+        return parser.header_from_string(raw_header, header["size"] + 20)
+
     def _find_next_datagram(self):
         old_file_pos = self._tell_bytes()
         logger.warning("Attempting to find next valid datagram...")
@@ -677,3 +806,114 @@ class RawSimradFile(BufferedReader):
         self._current_dgram_offset = 0
         self._total_dgram_count = None
         self._seek_bytes(0, SEEK_SET)
+
+
+class RawSimradMmapFile(RawSimradFile):
+    """
+    A memory-mapped variant of RawSimradFile for reading local SIMRAD RAW files.
+
+    Datagrams are located directly in the memory map instead of being assembled
+    from several buffered reads. The parsers of sample datagrams (RAW and FIL) are
+    handed ``memoryview`` slices of the map, so that the sample arrays they create
+    with ``np.frombuffer`` are views of the file rather than copies.
+    All other datagrams are parsed from copied bytes, as in RawSimradFile.
+    """
+
+    #: Datagram types whose parsers accept ``memoryview`` slices
+    ZERO_COPY_DGRAM_TYPES = ("RAW", "FIL")
+
+    def __init__(self, name, mode="rb", closefd=True, return_raw=False):
+        super().__init__(name, mode=mode, closefd=closefd, return_raw=return_raw)
+        self._mmap = mmap.mmap(self.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._pos = 0
+
+    def _seek_bytes(self, bytes_, whence=0):
+        if whence == SEEK_SET:
+            pos = bytes_
+        elif whence == SEEK_CUR:
+            pos = self._pos + bytes_
+        else:
+            pos = len(self._mmap) + bytes_
+
+        if pos < 0:
+            raise IOError("Cannot seek to a negative byte offset")
+        self._pos = pos
+
+    def _tell_bytes(self):
+        return self._pos
+
+    def _read_bytes(self, k):
+        buf = self._mmap[self._pos : self._pos + k]
+        self._pos += len(buf)
+        return buf
+
+    def at_eof(self):
+        return self._pos >= len(self._mmap)
+
+    def _read_next_dgram(self):
+        """
+        Attempts to read the next datagram from the memory map.
+
+        Well-formed datagrams are sliced out of the map without copying. Datagrams
+        failing any of the sanity checks are handed to RawSimradFile._read_next_dgram,
+        which logs the problem and searches for the next valid datagram.
+        """
+
+        pos = self._pos
+        try:
+            dgram_size, _, low_date, high_date = struct.unpack_from("=l4s2L", self._mmap, pos)
+            valid = (low_date, high_date) != (0, 0) and dgram_size >= 16
+            if valid:
+                dgram_size_check = struct.unpack_from("=l", self._mmap, pos + 4 + dgram_size)[0]
+                valid = dgram_size == dgram_size_check
+        except struct.error:
+            # truncated datagram
+            valid = False
+
+        if not valid:
+            return super()._read_next_dgram()
+
+        raw_dgram = self._view[pos + 4 : pos + 4 + dgram_size]
+        self._pos = pos + dgram_size + 8
+        self._current_dgram_offset += 1
+
+        if self._return_raw:
+            return raw_dgram.tobytes()
+        else:
+            #  as in RawSimradFile, add the header (16 bytes) and repeated size (4 bytes)
+            #  to the payload bytes
+            return self._convert_raw_datagram(raw_dgram, dgram_size + 20)
+
+    def _convert_raw_datagram(self, raw_datagram_string, bytes_read):
+        if (
+            isinstance(raw_datagram_string, memoryview)
+            and bytes(raw_datagram_string[:3]).decode() not in self.ZERO_COPY_DGRAM_TYPES
+        ):
+            raw_datagram_string = raw_datagram_string.tobytes()
+
+        return super()._convert_raw_datagram(raw_datagram_string, bytes_read)
+
+    def close(self):
+        if not self.closed:
+            try:
+                self._view.release()
+                self._mmap.close()
+            except BufferError:
+                #  parsed sample arrays still reference the map, which is
+                #  unmapped once the last of them is garbage collected
+                pass
+        super().close()
+
+
+def open_raw_simrad_file(name, storage_options={}, **kwargs):
+    """
+    Opens a SIMRAD RAW file for reading datagrams,
+    memory-mapping it if it is a non-empty local file.
+    """
+
+    fmap = fsspec.get_mapper(name, **storage_options)
+    if isinstance(fmap.fs, LocalFileSystem) and fmap.fs.size(fmap.root) > 0:
+        return RawSimradMmapFile(name, **kwargs)
+    else:
+        return RawSimradFile(name, storage_options=storage_options, **kwargs)
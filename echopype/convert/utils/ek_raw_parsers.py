@@ -74,7 +74,7 @@ class _SimradDatagramParser(object):
         return type_, version
 
     def from_string(self, raw_string, bytes_read):
-        header = raw_string[:4]
+        header = bytes(raw_string[:4])
         if sys.version_info.major > 2:
             header = header.decode()
         id_, version = self.validate_data_header(header)
@@ -1637,7 +1637,16 @@ class SimradRawParser(_SimradDatagramParser):
         }
         _SimradDatagramParser.__init__(self, "RAW", headers)
 
-    def _unpack_contents(self, raw_string, bytes_read, version):
+    def header_from_string(self, raw_string, bytes_read):
+        """
+        Parse only the header of a raw sample datagram, without decoding
+        its power, angle or complex samples.
+        """
+        header = bytes(raw_string[:4]).decode()
+        id_, version = self.validate_data_header(header)
+        return self._unpack_header(raw_string, bytes_read, version)
+
+    def _unpack_header(self, raw_string, bytes_read, version):
         header_values = struct.unpack(
             self.header_fmt(version), raw_string[: self.header_size(version)]
         )
@@ -1652,6 +1661,15 @@ class SimradRawParser(_SimradDatagramParser):
         data["timestamp"] = nt_to_unix((data["low_date"], data["high_date"]))
         data["bytes_read"] = bytes_read
 
+        if version == 3 or version == 4:
+            #  clean up the channel ID
+            data["channel_id"] = data["channel_id"].strip("\x00")
+
+        return data
+
+    def _unpack_contents(self, raw_string, bytes_read, version):
+        data = self._unpack_header(raw_string, bytes_read, version)
+
         if version == 0:
             if data["count"] > 0:
                 block_size = data["count"] * 2
@@ -1681,9 +1699,6 @@ class SimradRawParser(_SimradDatagramParser):
         elif version == 3 or version == 4:
             # result = 1j*Data[...,1]; result += Data[...,0]
 
-            #  clean up the channel ID
-            data["channel_id"] = data["channel_id"].strip("\x00")
-
             if data["count"] > 0:
                 #  set the initial block size and indx value.
                 block_size = data["count"] * 2
@@ -0,0 +1,135 @@
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import zarr
+
+# Default number of pings buffered per channel before being flushed to zarr
+DEFAULT_PING_BLOCK_SIZE = 1000
+
+
+class PingBlockWriter:
+    """
+    Buffer the samples of one channel in blocks of pings and append each block,
+    padded to its longest ping, to resizable zarr arrays.
+
+    The arrays grow along the ping dimension as blocks are flushed,
+    and along the range sample dimension whenever a block holds longer pings
+    than the previous ones; the new regions are set to the fill value by zarr.
+    Memory use is therefore bounded by one block of pings
+    instead of all pings of the file.
+    The number of samples of each ping is kept in ``sample_counts``,
+    so that the padding can be told apart when the fill value is also a valid sample.
+
+    Parameters
+    ----------
+    zarr_root : zarr.Group
+        Group in which the arrays are created.
+    path : str
+        Path of the arrays in ``zarr_root``.
+    block_size : int
+        Number of pings buffered before being flushed.
+    fill_value : scalar
+        Value used to pad shorter pings.
+    dtype : dtype, optional
+        Dtype of the stored samples. Defaults to the dtype of the first non-empty ping.
+    split_block : callable, optional
+        Function splitting a padded block into a dict of named parts
+        that are stored in separate arrays under ``path``,
+        e.g. the real and imaginary parts of complex samples.
+    """
+
+    def __init__(
+        self,
+        zarr_root: zarr.Group,
+        path: str,
+        block_size: int = DEFAULT_PING_BLOCK_SIZE,
+        fill_value: Any = np.nan,
+        dtype: Any = None,
+        split_block: Optional[Callable[[np.ndarray], Dict[str, np.ndarray]]] = None,
+    ):
+        if block_size < 1:
+            raise ValueError("block_size must be a positive integer")
+        self.zarr_root = zarr_root
+        self.path = path
+        self.block_size = block_size
+        self.fill_value = fill_value
+        self.dtype = None if dtype is None else np.dtype(dtype)
+        self.split_block = split_block
+
+        self.num_pings = 0  # number of pings flushed
+        self.sample_counts: List[int] = []  # number of samples of each ping appended
+        self.has_data = False  # whether any ping holds samples
+        self._block: List[Optional[np.ndarray]] = []
+        self._trailing_shape = None
+        self._arrays: Dict[Optional[str], zarr.Array] = {}
+
+    def append(self, samples: Optional[np.ndarray]) -> None:
+        """Append the samples of one ping, flushing the block once full."""
+        if samples is not None and samples.size > 0:
+            if not self.has_data:
+                self.has_data = True
+                self._trailing_shape = samples.shape[1:]
+                if self.dtype is None:
+                    self.dtype = samples.dtype
+        else:
+            samples = None
+        self.sample_counts.append(0 if samples is None else len(samples))
+        self._block.append(samples)
+        if len(self._block) >= self.block_size:
+            self.flush()
+
+    def _pad_block(self) -> np.ndarray:
+        """Pad the pings of the buffered block into one array."""
+        max_len = max(len(samples) for samples in self._block if samples is not None)
+        block = np.full(
+            (len(self._block), max_len) + self._trailing_shape, self.fill_value, dtype=self.dtype
+        )
+        for i, samples in enumerate(self._block):
+            if samples is not None:
+                block[i, : len(samples)] = samples
+        return block
+
+    def flush(self) -> None:
+        """Write the buffered block of pings to the zarr arrays."""
+        if not self._block:
+            return
+        num_pings = len(self._block)
+        if not self.has_data:
+            # No samples so far: only count the pings,
+            # the arrays are created with the fill value when the first samples come in
+            self.num_pings += num_pings
+            self._block = []
+            return
+
+        block = self._pad_block()
+        parts = self.split_block(block) if self.split_block is not None else {None: block}
+        start, stop = self.num_pings, self.num_pings + num_pings
+        for name, part in parts.items():
+            z_arr = self._arrays.get(name)
+            if z_arr is None:
+                z_arr = self.zarr_root.full(
+                    name=self.path if name is None else f"{self.path}/{name}",
+                    shape=(stop,) + part.shape[1:],
+                    chunks=(self.block_size,) + part.shape[1:],
+                    dtype=part.dtype,
+                    fill_value=self.fill_value,
+                    write_empty_chunks=False,
+                )
+                self._arrays[name] = z_arr
+            else:
+                z_arr.resize((stop, max(z_arr.shape[1], part.shape[1])) + part.shape[2:])
+            z_arr[start:stop, : part.shape[1]] = part
+
+        self.num_pings = stop
+        self._block = []
+
+    def finalize(self) -> Optional[Dict[Optional[str], zarr.Array]]:
+        """
+        Flush the remaining pings and return the zarr arrays,
+        keyed by part name (``None`` when the block is not split),
+        or ``None`` if no ping holds samples.
+        """
+        self.flush()
+        if not self.has_data:
+            return None
+        return self._arrays
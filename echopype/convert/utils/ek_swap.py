@@ -1,6 +1,17 @@
+import sys
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
+import psutil
+
+# cgroup v2 and v1 files holding the memory limit and usage of the container
+CGROUP_MEMORY_FILES = [
+    ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory.current"),
+    (
+        "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+        "/sys/fs/cgroup/memory/memory.usage_in_bytes",
+    ),
+]
 
 
 def _get_datagram_max_shape(datagram_dict: Dict[Any, List[np.ndarray]]) -> Optional[Tuple[int]]:
@@ -91,3 +102,107 @@ def calc_final_shapes(
             data_type_shapes[data_type] = datagram_max_shapes[data_type]
 
     return data_type_shapes
+
+
+def _read_cgroup_memory() -> Optional[Tuple[int, int]]:
+    """
+    Read the memory limit and usage of the cgroup of the process,
+    or ``None`` if there is no cgroup memory limit.
+    """
+    for limit_file, usage_file in CGROUP_MEMORY_FILES:
+        try:
+            with open(limit_file) as f:
+                limit = f.read().strip()
+            with open(usage_file) as f:
+                usage = int(f.read().strip())
+        except (OSError, ValueError):
+            continue
+        # cgroup v2 reports "max" and cgroup v1 a huge number when there is no limit
+        if limit == "max" or int(limit) >= psutil.virtual_memory().total:
+            return None
+        return int(limit), usage
+    return None
+
+
+def get_memory_info() -> Tuple[int, int]:
+    """
+    Get the total and available memory in bytes,
+    honoring the memory limit of the cgroup of the process, e.g. in containers.
+    """
+    mem = psutil.virtual_memory()
+    total, available = mem.total, mem.available
+    cgroup_memory = _read_cgroup_memory()
+    if cgroup_memory is not None:
+        limit, usage = cgroup_memory
+        total = min(total, limit)
+        available = max(min(available, limit - usage), 0)
+    return total, available
+
+
+def get_peak_rss() -> int:
+    """Get the peak resident set size of the process in bytes."""
+    try:
+        import resource
+
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+    except ImportError:
+        # resource is not available on Windows
+        return psutil.Process().memory_info().rss
+
+
+def plan_swap(var_sizes: Dict[Any, int], mem_mult: float = 0.4) -> Dict[str, Any]:
+    """
+    Decide which expanded variables to keep in memory and which to swap to disk.
+
+    Variables are kept in memory from the smallest to the largest,
+    as long as the memory used after their expansion stays within
+    ``mem_mult`` of the total memory. The remaining, largest variables are swapped.
+
+    Example output:
+    ```
+    {
+        'total_memory': 8589934592,
+        'available_memory': 4294967296,
+        'predicted_peak_rss': 1395864371,
+        'variables': {
+            ('receive', 'power', 'GPT  18 kHz 009072058c8d 1-1 ES18-11'): {
+                'nbytes': 413401600, 'use_swap': False
+            },
+            ...
+        }
+    }
+    ```
+
+    Parameters
+    ----------
+    var_sizes : dict
+        Expanded size in bytes of each variable
+    mem_mult : float, default 0.4
+        Fraction of the total memory that can be used after expansion
+
+    Returns
+    -------
+    dict
+        Memory plan with the total and available memory, the predicted peak RSS
+        of the process, and the expanded size and swap decision of each variable
+    """
+    total, available = get_memory_info()
+    budget = total * mem_mult - (total - available)
+    rss = psutil.Process().memory_info().rss
+
+    variables = {}
+    kept_size = 0
+    for var, nbytes in sorted(var_sizes.items(), key=lambda item: item[1]):
+        use_swap = kept_size + nbytes > budget
+        if not use_swap:
+            kept_size += nbytes
+        variables[var] = {"nbytes": int(nbytes), "use_swap": use_swap}
+
+    return {
+        "total_memory": int(total),
+        "available_memory": int(available),
+        "predicted_peak_rss": int(rss + kept_size),
+        "variables": {var: variables[var] for var in var_sizes},
+    }
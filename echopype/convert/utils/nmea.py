@@ -0,0 +1,259 @@
+import warnings
+from typing import List, Sequence, Tuple
+
+import numpy as np
+import pynmea2
+
+# Number of sentences decoded at once, bounding the memory of the character arrays
+NMEA_BLOCK_SIZE = 100_000
+
+# Positions of the latitude, latitude direction, longitude and longitude direction fields
+# following the sentence identifier, as in pynmea2
+LATLON_FIELDS = {"GGA": (1, 2, 3, 4), "GLL": (0, 1, 2, 3), "RMC": (2, 3, 4, 5)}
+
+
+def _is_word_char(codes: np.ndarray) -> np.ndarray:
+    """Check which ASCII character codes are word characters (``\\w``)."""
+    return (
+        ((codes >= ord("0")) & (codes <= ord("9")))
+        | ((codes >= ord("A")) & (codes <= ord("Z")))
+        | ((codes >= ord("a")) & (codes <= ord("z")))
+        | (codes == ord("_"))
+    )
+
+
+def _hex_values(codes: np.ndarray) -> np.ndarray:
+    """Get the values of hexadecimal digit character codes, -1 for other characters."""
+    values = np.full(codes.shape, -1, dtype=np.int64)
+    for first, last, offset in [("0", "9", 0), ("A", "F", 10), ("a", "f", 10)]:
+        in_range = (codes >= ord(first)) & (codes <= ord(last))
+        values[in_range] = codes[in_range].astype(np.int64) - ord(first) + offset
+    return values
+
+
+def _type_codes(sentence_type: str) -> np.ndarray:
+    """Get the character codes of a sentence type."""
+    return np.array([ord(char) for char in sentence_type], dtype=np.uint32)
+
+
+def _gather(codes: np.ndarray, start: np.ndarray, stop: np.ndarray) -> np.ndarray:
+    """Gather the characters between ``start`` and ``stop`` of each row, padded with nulls."""
+    width = max(int((stop - start).max(initial=0)), 1)
+    idx = start[:, None] + np.arange(width)
+    chars = np.take_along_axis(codes, np.minimum(idx, codes.shape[1] - 1), axis=1)
+    return np.where(idx < stop[:, None], chars, 0).astype(np.uint8)
+
+
+def _to_float(chars: np.ndarray) -> np.ndarray:
+    """Convert rows of null-padded decimal characters to floats."""
+    # Same correctly rounded conversion of decimal strings as the float builtin
+    chars = np.ascontiguousarray(chars)
+    return chars.view(f"S{chars.shape[1]}").ravel().astype(np.float64)
+
+
+def _field_table(commas: np.ndarray, end: np.ndarray, num_fields: int) -> np.ndarray:
+    """
+    Get the positions of the commas of each row in order, padded with ``end``,
+    so that data field ``i`` lies between columns ``i`` and ``i + 1``.
+    """
+    comma_rows, comma_cols = np.nonzero(commas)
+    num_commas = np.bincount(comma_rows, minlength=len(commas))
+    rank = np.arange(len(comma_rows)) - np.repeat(np.cumsum(num_commas) - num_commas, num_commas)
+    table = np.repeat(end[:, None], max(int(num_commas.max(initial=0)), num_fields + 1), axis=1)
+    table[comma_rows, rank] = comma_cols
+    return table
+
+
+def _decode_dm(
+    field: np.ndarray, direction: np.ndarray, hemispheres: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert "degrees/minutes" coordinate fields (``dddmm.mmmm``) to signed decimal degrees,
+    following ``pynmea2.nmea_utils.dm_to_sd`` and the ``latitude`` and ``longitude`` properties.
+
+    ``field`` holds the null-padded characters of the fields, ``direction`` the
+    direction characters, and ``hemispheres`` the positive and negative directions,
+    "NS" or "EW". Returns the coordinates and whether the fields are well-formed.
+    """
+    length = (field != 0).sum(axis=1)
+    is_dot = field == ord(".")
+    is_digit = (field >= ord("0")) & (field <= ord("9"))
+    dot = is_dot.argmax(axis=1)
+
+    # Empty and "0" fields are 0 degrees
+    zero = (length == 0) | ((length == 1) & (field[:, 0] == ord("0")))
+    # At least 3 digits before a single dot and 1 digit after it
+    dm = (
+        (is_dot.sum(axis=1) == 1)
+        & (is_digit.sum(axis=1) == length - 1)
+        & (dot >= 3)
+        & (length - dot >= 2)
+    )
+
+    sd = np.zeros(len(field))
+    if dm.any():
+        field, dot, length = field[dm], dot[dm], length[dm]
+        degrees = _gather(field, np.zeros_like(dot), dot - 2)
+        minutes = _gather(field, dot - 2, length)
+        sd[dm] = _to_float(degrees) + _to_float(minutes) / 60
+    positive, negative = ord(hemispheres[0]), ord(hemispheres[1])
+    coord = np.where(direction == positive, sd, np.where(direction == negative, -sd, 0.0))
+    return coord, dm | zero
+
+
+def _decode_pynmea2(nmea_string: str) -> Tuple[object, float, float]:
+    """Decode the sentence type, latitude and longitude of one sentence with pynmea2."""
+    try:
+        msg = pynmea2.parse(nmea_string)
+    except (
+        pynmea2.ChecksumError,
+        pynmea2.SentenceTypeError,
+        AttributeError,
+        pynmea2.ParseError,
+    ):
+        return np.nan, np.nan, np.nan
+
+    try:
+        lat = msg.latitude if hasattr(msg, "latitude") else np.nan
+    except ValueError as ve:
+        lat = np.nan
+        warnings.warn(
+            "At least one latitude entry is problematic and "
+            f"are assigned None in the converted data: {str(ve)}"
+        )
+    try:
+        lon = msg.longitude if hasattr(msg, "longitude") else np.nan
+    except ValueError as ve:
+        lon = np.nan
+        warnings.warn(
+            f"At least one longitude entry is problematic and "
+            f"are assigned None in the converted data: {str(ve)}"
+        )
+    msg_type = msg.sentence_type if hasattr(msg, "sentence_type") else np.nan
+    return msg_type, lat, lon
+
+
+def _decode_block(
+    nmea_strings: Sequence[str], sentence_types: Sequence[str]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Decode one block of sentences, see ``decode_nmea_latlon``."""
+    strings = np.asarray(nmea_strings, dtype=str)
+    # One character code per column, with at least one trailing null character
+    width = max(strings.dtype.itemsize // 4, 6) + 1
+    codes = strings.astype(f"U{width}").view(np.uint32).reshape(len(strings), width)
+
+    # Select the sentence types from the characters following the talker ID
+    selected = np.zeros(len(strings), dtype=bool)
+    for sentence_type in sentence_types:
+        selected |= (codes[:, 3:6] == _type_codes(sentence_type)).all(axis=1)
+    idx = np.flatnonzero(selected)
+    # ASCII character codes, non-ASCII characters being mapped to the non-printable DEL
+    codes = np.minimum(codes[idx], 0x7F).astype(np.uint8)
+    length = np.char.str_len(strings[idx])
+    rows = np.arange(len(idx))
+    pos = np.arange(width)
+    in_str = pos < length[:, None]
+
+    # Sentences with a trailing checksum "*HH" or none
+    is_star = (codes == ord("*")) & in_str
+    num_stars = is_star.sum(axis=1)
+    checksum = 16 * _hex_values(codes[rows, length - 2]) + _hex_values(codes[rows, length - 1])
+    has_checksum = (num_stars == 1) & is_star[rows, length - 3] & (checksum >= 0)
+    end = np.where(has_checksum, length - 3, length)
+
+    # Printable ASCII sentences starting with "$", a talker ID and the sentence type
+    # are decoded here, other sentences are left to pynmea2
+    fast = (
+        (((codes >= 0x21) & (codes <= 0x7E)) | ~in_str).all(axis=1)
+        & (codes[:, 0] == ord("$"))
+        & _is_word_char(codes[:, 1])
+        & _is_word_char(codes[:, 2])
+        # Sentences starting with "$P" are proprietary sentences for pynmea2
+        & (codes[:, 1] != ord("P"))
+        & (codes[:, 1] != ord("p"))
+        & (codes[:, 6] == ord(","))
+        & ((num_stars == 0) | has_checksum)
+    )
+    # Sentences of types without known coordinate fields are also left to pynmea2
+    decoded_types = [t for t in sentence_types if t in LATLON_FIELDS]
+    is_type = {t: (codes[:, 3:6] == _type_codes(t)).all(axis=1) for t in decoded_types}
+    fast &= np.any([is_type[t] for t in decoded_types], axis=0)
+    xor = np.bitwise_xor.reduce(
+        np.where((pos >= 1) & (pos < end[:, None]), codes, 0), axis=1
+    ).astype(np.int64)
+    valid = ~has_checksum | (xor == checksum)
+
+    msg_type = np.full(len(idx), np.nan, dtype=object)
+    lat = np.full(len(idx), np.nan)
+    lon = np.full(len(idx), np.nan)
+
+    # The data fields follow the comma ending the sentence identifier
+    commas = (codes == ord(",")) & (pos > 6) & (pos < end[:, None])
+    table = np.concatenate([np.full((len(idx), 1), 6), _field_table(commas, end, 6)], axis=1)
+    for sentence_type in decoded_types:
+        sel = np.flatnonzero(fast & valid & is_type[sentence_type])
+        if len(sel) == 0:
+            continue
+        fields = LATLON_FIELDS[sentence_type]
+        coords = []
+        for (coord_field, dir_field), hemispheres in zip([fields[:2], fields[2:]], ["NS", "EW"]):
+            field = _gather(codes[sel], table[sel, coord_field] + 1, table[sel, coord_field + 1])
+            direction = _gather(codes[sel], table[sel, dir_field] + 1, table[sel, dir_field + 1])
+            # Direction fields of a single character
+            direction = np.where(direction[:, 1:].any(axis=1), 0, direction[:, 0])
+            coords.append(_decode_dm(field, direction, hemispheres))
+        (lat_sel, lat_ok), (lon_sel, lon_ok) = coords
+        # Malformed coordinates raise warnings in pynmea2
+        decoded = lat_ok & lon_ok
+        fast[sel[~decoded]] = False
+        sel = sel[decoded]
+        msg_type[sel] = sentence_type
+        lat[sel] = lat_sel[decoded]
+        lon[sel] = lon_sel[decoded]
+
+    for i in np.flatnonzero(~fast):
+        msg_type[i], lat[i], lon[i] = _decode_pynmea2(nmea_strings[idx[i]])
+
+    return idx, msg_type, lat, lon
+
+
+def decode_nmea_latlon(
+    nmea_strings: Sequence[str], sentence_types: Sequence[str]
+) -> Tuple[np.ndarray, List[object], np.ndarray, np.ndarray]:
+    """
+    Decode the sentence type, latitude and longitude of NMEA sentences.
+
+    Sentences are decoded in blocks with vectorized operations on their characters:
+    the sentence types are selected, the checksums validated, and the coordinate fields
+    converted as in ``pynmea2``. Only sentences that are not well-formed
+    are decoded one by one with ``pynmea2``.
+
+    Parameters
+    ----------
+    nmea_strings : sequence of str
+        NMEA sentences, e.g. ``"$GPGGA,154807.00,4730.1234,N,12218.5678,W,..."``.
+    sentence_types : sequence of str
+        Types of the sentences to decode, e.g. ``["GGA", "GLL", "RMC"]``.
+
+    Returns
+    -------
+    idx : np.ndarray
+        Positions in ``nmea_strings`` of the sentences of the selected types.
+    msg_type : list
+        Type of each selected sentence, ``np.nan`` if the sentence could not be parsed.
+    lat, lon : np.ndarray
+        Latitude and longitude of each selected sentence in signed decimal degrees,
+        NaN if the sentence or the coordinate could not be parsed.
+    """
+    starts = range(0, len(nmea_strings), NMEA_BLOCK_SIZE)
+    blocks = [
+        _decode_block(nmea_strings[start : start + NMEA_BLOCK_SIZE], sentence_types)
+        for start in starts
+    ]
+    if len(blocks) == 0:
+        return np.array([], dtype=np.int64), [], np.array([]), np.array([])
+    idx = np.concatenate([block[0] + start for block, start in zip(blocks, starts)])
+    msg_type = np.concatenate([block[1] for block in blocks]).tolist()
+    lat = np.concatenate([block[2] for block in blocks])
+    lon = np.concatenate([block[3] for block in blocks])
+    return idx, msg_type, lat, lon
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Dict
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 if TYPE_CHECKING:
     from ..core import PathHint
@@ -9,6 +9,8 @@ from .echodata import EchoData
 def open_converted(
     converted_raw_path: "PathHint",
     storage_options: Dict[str, str] = None,
+    groups: Optional[List[str]] = None,
+    lazy: bool = False,
     **kwargs
     # kwargs: Dict[str, Any] = {'chunks': 'auto'} # TODO: do we need this?
 ):
@@ -20,6 +22,14 @@ def open_converted(
         path to converted data file
     storage_options : dict
         options for cloud storage
+    groups : list of str, optional
+        Paths of the groups to open, e.g. ``["Sonar", "Sonar/Beam_group1"]``.
+        The Top-level group is always opened, and the other groups are left out.
+        Defaults to ``None``, which opens all groups.
+    lazy : bool, default False
+        Only open each group on first access, e.g. with ``ed["Sonar/Beam_group1"]``,
+        instead of opening all groups up front.
+        The consolidated metadata of zarr stores are read once for all groups.
     kwargs : dict
         optional keyword arguments to be passed
         into xr.open_dataset
@@ -33,4 +43,6 @@ def open_converted(
         converted_raw_path=converted_raw_path,
         storage_options=storage_options,
         open_kwargs=kwargs,
+        groups=groups,
+        lazy=lazy,
     )
@@ -0,0 +1,299 @@
+"""
+Spatiotemporal catalog of converted files, stored as a local SQLite database,
+to find the files holding data of given channels, time range and area
+without opening every file.
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from ..core import PathHint
+
+from ..utils.log import _init_logger
+from .echodata import EchoData
+
+logger = _init_logger(__name__)
+
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    file_id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    sonar_model TEXT,
+    conversion_version TEXT,
+    source_filenames TEXT,
+    time_start INTEGER,
+    time_end INTEGER,
+    lat_min REAL,
+    lat_max REAL,
+    lon_min REAL,
+    lon_max REAL
+);
+CREATE TABLE IF NOT EXISTS channels (
+    file_id INTEGER NOT NULL REFERENCES files(file_id) ON DELETE CASCADE,
+    beam_group TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    frequency_nominal REAL
+);
+CREATE INDEX IF NOT EXISTS files_time ON files (time_start, time_end);
+CREATE INDEX IF NOT EXISTS files_lat ON files (lat_min, lat_max);
+CREATE INDEX IF NOT EXISTS channels_file ON channels (file_id);
+CREATE INDEX IF NOT EXISTS channels_frequency ON channels (frequency_nominal);
+CREATE INDEX IF NOT EXISTS channels_channel ON channels (channel);
+"""
+
+
+def _to_ns(time: Any) -> Optional[int]:
+    """Convert a time to integer nanoseconds since the epoch, ``None`` for NaT."""
+    time = np.datetime64(time, "ns")
+    return None if np.isnat(time) else int(time.astype(np.int64))
+
+
+def _extent(values: np.ndarray) -> Tuple[Optional[float], Optional[float]]:
+    """Get the minimum and maximum of the finite ``values``, ``None`` if there are none."""
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return None, None
+    return float(values.min()), float(values.max())
+
+
+def _catalog_entry(
+    converted_raw_path: "PathHint", storage_options: Dict[str, Any]
+) -> Tuple[Dict[str, Any], List[Tuple[str, str, Optional[float]]]]:
+    """
+    Read the catalog entry of a converted file: the conversion version and source filenames
+    in the Provenance group, the latitude and longitude in the Platform group
+    and the channels, nominal frequencies and ping times of the beam groups.
+    Only the Top-level group and these groups are opened, and only these variables are read.
+    """
+    echodata = EchoData.from_file(
+        converted_raw_path=converted_raw_path, storage_options=storage_options, lazy=True
+    )
+    beam_groups = [group for group in echodata.group_paths if group.startswith("Sonar/Beam_group")]
+
+    lat_min = lat_max = lon_min = lon_max = None
+    platform = echodata["Platform"]
+    if platform is not None and "latitude" in platform and "longitude" in platform:
+        lat_min, lat_max = _extent(np.asarray(platform["latitude"].values, dtype=np.float64))
+        lon_min, lon_max = _extent(np.asarray(platform["longitude"].values, dtype=np.float64))
+
+    provenance = echodata["Provenance"]
+    source_filenames = (
+        [str(f) for f in provenance["source_filenames"].values]
+        if "source_filenames" in provenance
+        else []
+    )
+
+    channels = []
+    ping_times = []
+    for group in beam_groups:
+        ds = echodata[group]
+        frequency = (
+            ds["frequency_nominal"].values
+            if "frequency_nominal" in ds
+            else np.full(ds.sizes.get("channel", 0), np.nan)
+        )
+        channels += [
+            (group, str(ch), None if np.isnan(freq) else float(freq))
+            for ch, freq in zip(ds["channel"].values, frequency)
+        ]
+        if "ping_time" in ds.coords:
+            ping_times.append(ds["ping_time"].values.astype("datetime64[ns]"))
+
+    # Ping times of all beam groups
+    ping_times = np.concatenate(ping_times) if ping_times else np.array([], dtype="datetime64[ns]")
+    ping_times = ping_times[~np.isnat(ping_times)]
+
+    entry = {
+        "path": str(converted_raw_path),
+        "sonar_model": echodata.sonar_model,
+        "conversion_version": provenance.attrs.get("conversion_software_version"),
+        "source_filenames": ";".join(source_filenames),
+        "time_start": _to_ns(ping_times.min()) if ping_times.size > 0 else None,
+        "time_end": _to_ns(ping_times.max()) if ping_times.size > 0 else None,
+        "lat_min": lat_min,
+        "lat_max": lat_max,
+        "lon_min": lon_min,
+        "lon_max": lon_max,
+    }
+    return entry, channels
+
+
+def build_catalog(
+    converted_raw_paths: Sequence["PathHint"],
+    catalog_path: "PathHint",
+    storage_options: Dict[str, Any] = {},
+    overwrite: bool = False,
+) -> int:
+    """
+    Build or update a catalog of converted files.
+
+    For each converted file, only the Provenance group, the channels, nominal frequencies
+    and ping times of the Sonar beam groups and the Platform latitude and longitude are read,
+    and the file path, ping time range, latitude and longitude extents
+    and channels are stored in a SQLite database with indexes on times,
+    latitudes and frequencies.
+
+    Parameters
+    ----------
+    converted_raw_paths : sequence of str
+        Paths to converted netcdf or zarr files
+    catalog_path : str
+        Path to the local SQLite file of the catalog, created if it does not exist
+    storage_options : dict
+        Options for cloud storage of the converted files
+    overwrite : bool, default False
+        If True, entries already in the catalog are read again from their files,
+        otherwise files already in the catalog are skipped
+
+    Returns
+    -------
+    int
+        Number of files added to the catalog
+    """
+    num_added = 0
+    with sqlite3.connect(str(catalog_path)) as conn:
+        conn.executescript(CATALOG_SCHEMA)
+        conn.execute("PRAGMA foreign_keys = ON")
+        cataloged = {path for (path,) in conn.execute("SELECT path FROM files")}
+        for converted_raw_path in converted_raw_paths:
+            path = str(converted_raw_path)
+            if path in cataloged and not overwrite:
+                continue
+            entry, channels = _catalog_entry(converted_raw_path, storage_options)
+
+            conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            cursor = conn.execute(
+                f"INSERT INTO files ({', '.join(entry)}) "
+                f"VALUES ({', '.join('?' * len(entry))})",
+                tuple(entry.values()),
+            )
+            conn.executemany(
+                "INSERT INTO channels VALUES (?, ?, ?, ?)",
+                [(cursor.lastrowid, *channel) for channel in channels],
+            )
+            conn.commit()
+            num_added += 1
+            logger.info(f"cataloged {path}")
+    conn.close()
+    return num_added
+
+
+def query_catalog(
+    catalog_path: "PathHint",
+    time_range: Optional[Tuple[Any, Any]] = None,
+    bbox: Optional[Tuple[float, float, float, float]] = None,
+    frequency_nominal: Optional[Union[float, List[float]]] = None,
+    channels: Optional[List[str]] = None,
+    sonar_model: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Find the converted files of a catalog holding data within a time range and area,
+    from given channels.
+
+    Parameters
+    ----------
+    catalog_path : str
+        Path to the SQLite file of a catalog built with ``build_catalog``
+    time_range : tuple, optional
+        Start and end times, as strings or ``np.datetime64``, e.g.
+        ``("2017-04-01", "2017-05-01")``. Either can be ``None`` for an open range.
+    bbox : tuple of float, optional
+        Bounding box ``(lon_min, lat_min, lon_max, lat_max)`` in decimal degrees.
+        Files without latitude and longitude do not match a bounding box.
+    frequency_nominal : float or list of float, optional
+        Nominal frequencies in Hz of the channels to find, e.g. ``38000``
+    channels : list of str, optional
+        Names of the channels to find
+    sonar_model : str, optional
+        Sonar model of the files to find
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per matching file, sorted by ``time_start``, with columns:
+
+        - ``path``, the path of the converted file, e.g. to ``open_converted``
+        - ``time_start`` and ``time_end``, the ping times of the file
+          clipped to ``time_range``, e.g. to slice ``ping_time``
+        - ``channel``, the list of matching channels, e.g. to ``channel_selection``
+          in ``combine_echodata``
+        - ``sonar_model``, ``lat_min``, ``lat_max``, ``lon_min`` and ``lon_max``
+
+    Examples
+    --------
+    >>> files = echopype.query_catalog(
+    ...     "catalog.db", time_range=("2017-04-01", "2017-05-01"),
+    ...     bbox=(-126, 45, -123, 49), frequency_nominal=38000,
+    ... )
+    >>> ed = echopype.combine_echodata(
+    ...     [echopype.open_converted(path) for path in files["path"]],
+    ...     channel_selection=sorted(set(files["channel"].sum())),
+    ... )
+    """
+    conditions, params = [], []
+    if sonar_model is not None:
+        conditions.append("f.sonar_model = ?")
+        params.append(sonar_model)
+
+    start_ns = end_ns = None
+    if time_range is not None:
+        start, end = time_range
+        if start is not None:
+            start_ns = _to_ns(start)
+            conditions.append("f.time_end >= ?")
+            params.append(start_ns)
+        if end is not None:
+            end_ns = _to_ns(end)
+            conditions.append("f.time_start <= ?")
+            params.append(end_ns)
+
+    if bbox is not None:
+        lon_min, lat_min, lon_max, lat_max = bbox
+        conditions += ["f.lat_max >= ?", "f.lat_min <= ?", "f.lon_max >= ?", "f.lon_min <= ?"]
+        params += [lat_min, lat_max, lon_min, lon_max]
+
+    if frequency_nominal is not None:
+        frequencies = np.atleast_1d(frequency_nominal).astype(float).tolist()
+        conditions.append(f"c.frequency_nominal IN ({', '.join('?' * len(frequencies))})")
+        params += frequencies
+    if channels is not None:
+        conditions.append(f"c.channel IN ({', '.join('?' * len(channels))})")
+        params += list(channels)
+
+    query = (
+        "SELECT f.path, f.time_start, f.time_end, c.channel, f.sonar_model, "
+        "f.lat_min, f.lat_max, f.lon_min, f.lon_max "
+        "FROM files f JOIN channels c ON f.file_id = c.file_id"
+    )
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY f.time_start, f.path, c.channel"
+
+    if not Path(catalog_path).exists():
+        raise FileNotFoundError(f"The catalog {catalog_path} does not exist!")
+    with sqlite3.connect(str(catalog_path)) as conn:
+        df = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+
+    columns = ["path", "time_start", "time_end", "channel", "sonar_model"]
+    columns += ["lat_min", "lat_max", "lon_min", "lon_max"]
+    df = (
+        df.groupby(["path"], sort=False)
+        .agg({col: "first" for col in columns if col not in ["path", "channel"]})
+        .join(df.groupby("path", sort=False)["channel"].agg(lambda ch: sorted(set(ch))))
+        .reset_index()[columns]
+    )
+
+    # Clip the times to the queried range
+    if start_ns is not None:
+        df["time_start"] = df["time_start"].clip(lower=start_ns)
+    if end_ns is not None:
+        df["time_end"] = df["time_end"].clip(upper=end_ns)
+    for col in ["time_start", "time_end"]:
+        df[col] = pd.to_datetime(df[col], unit="ns")
+    return df
@@ -1,20 +1,26 @@
 import itertools
+import json
 import re
 from collections import ChainMap
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Tuple, Union
 from warnings import warn
 
 import fsspec
 import numpy as np
 import pandas as pd
 import xarray as xr
+import zarr
 from datatree import DataTree
 
-from ..utils.io import validate_output_path
+if TYPE_CHECKING:
+    from ..core import PathHint
+
+from ..utils.io import _match_stored_dims, validate_output_path
 from ..utils.log import _init_logger
 from ..utils.prov import echopype_prov_attrs
 from .echodata import EchoData
+from .summary import SUMMARY_ATTR, compute_vendor_hashes, get_summaries, get_summary
 
 logger = _init_logger(__name__)
 
@@ -383,6 +389,7 @@ def _create_channel_selection_dict(
 def _check_echodata_channels(
     echodata_list: List[EchoData],
     user_channel_selection: Optional[Union[List, Dict[str, list]]] = None,
+    summaries: Optional[List[Dict[str, Any]]] = None,
 ) -> Dict[str, Optional[List[str]]]:
     """
     Coordinates the routines that check to make sure each ``EchoData`` group with a ``channel``
@@ -396,6 +403,9 @@ def _check_echodata_channels(
     user_channel_selection: list or dict, optional
         A user provided input that will be used to specify which channels will be
         selected for each ``EchoData`` group
+    summaries: list of dict, optional
+        The metadata summaries of the elements in ``echodata_list``
+        (see ``summary.get_summary``), obtained from ``echodata_list`` if not provided
 
     Returns
     -------
@@ -416,10 +426,17 @@ def _check_echodata_channels(
     function ``_check_channel_consistency``.
     """
 
+    if summaries is None:
+        summaries = get_summaries(echodata_list)
+
+    # get the channels of each EchoData group, None if there is no channel dimension
+    group_chans = [
+        {grp: summary["groups"].get(grp, {}).get("channel") for grp in echodata_list[0].group_paths}
+        for summary in summaries
+    ]
+
     # determine if the EchoData group contains a channel dimension
-    has_chan_dim = {
-        grp: "channel" in echodata_list[0][grp].dims for grp in echodata_list[0].group_paths
-    }
+    has_chan_dim = {grp: chans is not None for grp, chans in group_chans[0].items()}
 
     # create dictionary specifying the channels that should be selected for each group
     channel_selection = _create_channel_selection_dict(
@@ -427,9 +444,9 @@ def _check_echodata_channels(
     )
 
     for ed_group in echodata_list[0].group_paths:
-        if "channel" in echodata_list[0][ed_group].dims:
+        if has_chan_dim[ed_group]:
             # get each EchoData's channels as a list of list
-            all_chan_list = [list(ed[ed_group].channel.values) for ed in echodata_list]
+            all_chan_list = [ed_chans[ed_group] or [] for ed_chans in group_chans]
 
             # make sure each EchoData does not have repeating channels
             all_chan_unique = [len(set(ed_chans)) == len(ed_chans) for ed_chans in all_chan_list]
@@ -455,7 +472,7 @@ def _check_echodata_channels(
     return channel_selection
 
 
-def _check_ascending_ds_times(ds_list: List[xr.Dataset], ed_group: str) -> None:
+def _check_ascending_ds_times(summaries: List[Dict[str, Any]], ed_group: str) -> None:
     """
     A minimal check that the first time value of each Dataset is less than
     the first time value of the subsequent Dataset. If each first time value
@@ -463,8 +480,9 @@ def _check_ascending_ds_times(ds_list: List[xr.Dataset], ed_group: str) -> None:
 
     Parameters
     ----------
-    ds_list: list of xr.Dataset
-        List of Datasets to be combined
+    summaries: list of dict
+        The metadata summaries (see ``summary.get_summary``)
+        of the ``EchoData`` objects to be combined
     ed_group: str
         The name of the ``EchoData`` group being combined
 
@@ -481,21 +499,14 @@ def _check_ascending_ds_times(ds_list: List[xr.Dataset], ed_group: str) -> None:
     """
 
     # get all time dimensions of the input Datasets
-    ed_time_dim = set(ds_list[0].dims).intersection(POSSIBLE_TIME_DIMS)
+    ed_time_dim = summaries[0]["groups"][ed_group]["times"].keys()
 
     for time in ed_time_dim:
         # gather the first time of each Dataset
-        first_times = []
-        for ds in ds_list:
-            times = ds[time].values
-            if isinstance(times, np.ndarray):
-                # store first time if we have an array
-                first_times.append(times[0])
-            else:
-                # store first time if we have a single value
-                first_times.append(times)
-
-        first_times = np.array(first_times)
+        first_times = np.array(
+            [summary["groups"][ed_group]["times"][time][0] for summary in summaries],
+            dtype="datetime64[ns]",
+        )
 
         # skip check if all first times are NaT
         if not np.isnan(first_times).all():
@@ -509,21 +520,25 @@ def _check_ascending_ds_times(ds_list: List[xr.Dataset], ed_group: str) -> None:
 
 
 def _check_no_append_vendor_params(
-    ds_list: List[xr.Dataset], ed_group: Literal["Vendor_specific"], ds_append_dims: set
+    summaries: List[Dict[str, Any]],
+    ed_group: Literal["Vendor_specific"],
+    channel_selection: Optional[List[str]] = None,
 ) -> None:
     """
     Check for identical params for all inputs without an
-    appending dimension in Vendor specific group
+    appending dimension in Vendor specific group,
+    comparing the hashes of the params in the metadata summaries
 
     Parameters
     ----------
-    ds_list: list of xr.Dataset
-        List of Datasets to be combined
+    summaries: list of dict
+        The metadata summaries (see ``summary.get_summary``)
+        of the ``EchoData`` objects to be combined
     ed_group: "Vendor_specific"
         The name of the ``EchoData`` group being combined,
         this only works for "Vendor_specific" group.
-    ds_append_dims: set
-        A set of datasets append dimensions
+    channel_selection: list of str, optional
+        The channels selected in the group, all channels if ``None``
 
     Returns
     -------
@@ -539,22 +554,22 @@ def _check_no_append_vendor_params(
     if ed_group != "Vendor_specific":
         raise ValueError("Group must be `Vendor_specific`!")
 
-    if len(ds_append_dims) > 0:
-        # If there's a dataset appending dimension, drop for comparison
-        # of the other values... everything else should be identical
-        ds_list = [ds.drop_dims(ds_append_dims) for ds in ds_list]
-
-    it = iter(ds_list)
-    # Init as identical, must stay True.
-    is_identical = True
-    dataset = next(it)
-    for next_dataset in it:
-        is_identical = dataset.identical(next_dataset)
-        if not is_identical:
+    def _selected_hashes(vendor_hashes):
+        # Append dimensions are already dropped from the hashed params,
+        # everything else should be identical
+        chan_hashes = vendor_hashes["channel"]
+        if chan_hashes is not None and channel_selection is not None:
+            chan_hashes = {ch: chan_hashes.get(ch) for ch in channel_selection}
+        return chan_hashes, vendor_hashes["other"]
+
+    it = iter(summaries)
+    hashes = _selected_hashes(next(it)["vendor"])
+    for summary in it:
+        next_hashes = _selected_hashes(summary["vendor"])
+        if next_hashes != hashes:
             raise RuntimeError(
                 f"Non identical filter parameters in {ed_group} group. " "Objects cannot be merged!"
             )
-        dataset = next_dataset
 
 
 def _merge_attributes(attributes: List[Dict[str, str]]) -> Dict[str, str]:
@@ -693,6 +708,8 @@ def _combine(
     eds: List[EchoData] = [],
     echodata_filenames: List[str] = [],
     ed_group_chan_sel: Dict[str, Optional[List[str]]] = {},
+    virtual: bool = False,
+    summaries: Optional[List[Dict[str, Any]]] = None,
 ) -> Dict[str, xr.Dataset]:
     """
     Combines the echodata objects and export to a dictionary tree.
@@ -710,6 +727,13 @@ def _combine(
         and values specify what channels should be selected within that
         group. If a value is ``None``, then a subset of channels should
         not be selected.
+    virtual: bool, default False
+        If True, variables without an append dimension are taken from
+        the first ``EchoData`` object without being compared across objects,
+        so that lazily opened data are only concatenated and never loaded
+    summaries: list of dict, optional
+        The metadata summaries of the elements in ``eds``
+        (see ``summary.get_summary``), obtained from ``eds`` if not provided
 
     Returns
     -------
@@ -721,6 +745,8 @@ def _combine(
     all_group_paths = dict.fromkeys(
         itertools.chain.from_iterable([list(ed.group_paths) for ed in eds])
     ).keys()
+    if summaries is None:
+        summaries = get_summaries(eds)
     # For dealing with attributes
     attrs_dict = {}
 
@@ -788,18 +814,24 @@ def _combine(
                         attrs = [ds.attrs]
                     ds_attrs += attrs
 
+            if ed_group == "Provenance":
+                # The summaries are recomputed for the combined object
+                ds_attrs = [
+                    {k: v for k, v in attrs.items() if k != SUMMARY_ATTR} for attrs in ds_attrs
+                ]
+
             # Attribute holding
             attrs_dict[ed_group] = ds_attrs
 
             # Checks for ascending time in dataset list
-            _check_ascending_ds_times(ds_list, ed_group)
+            _check_ascending_ds_times(summaries, ed_group)
 
             # get all dimensions in ds that are append dimensions
             ds_append_dims = set(ds_list[0].dims).intersection(APPEND_DIMS)
 
             # Checks for filter parameters for "Vendor_specific" ONLY
-            if ed_group == "Vendor_specific":
-                _check_no_append_vendor_params(ds_list, ed_group, ds_append_dims)
+            if ed_group == "Vendor_specific" and not virtual:
+                _check_no_append_vendor_params(summaries, ed_group, ed_group_chan_sel[ed_group])
 
             if len(ds_append_dims) == 0:
                 combined_ds = ds_list[0]
@@ -812,7 +844,7 @@ def _combine(
                         dim=dim,
                         coords="minimal",
                         data_vars="minimal",
-                        compat="no_conflicts",
+                        compat="override" if virtual else "no_conflicts",
                     )
                     combined_ds = combined_ds.assign(sub_ds.variables)
 
@@ -857,9 +889,187 @@ def _combine(
     return tree_dict
 
 
+def _match_prov_vars(ds: xr.Dataset, zarr_group: zarr.Group) -> xr.Dataset:
+    """
+    Match the provenance attribute variables of ``ds`` along ``echodata_filename``
+    with those already stored in the Provenance ``zarr_group``.
+
+    Attributes only found in ``ds`` are dropped,
+    and those only found in the stored group are set to empty strings.
+    """
+    stored_vars = {
+        name
+        for name, z_arr in zarr_group.arrays()
+        if ED_FILENAME in z_arr.attrs.get("_ARRAY_DIMENSIONS", []) and name != ED_FILENAME
+    }
+    ds_vars = {name for name, var in ds.data_vars.items() if ED_FILENAME in var.dims}
+    if ds_vars - stored_vars:
+        logger.warning(
+            f"Attributes {sorted(ds_vars - stored_vars)} not found in the first "
+            "EchoData object are not stored in the Provenance group"
+        )
+    ds = ds.drop_vars(list(ds_vars - stored_vars))
+    for name in stored_vars - ds_vars:
+        ds[name] = xr.DataArray(
+            np.full(ds.sizes[ED_FILENAME], "", dtype=str),
+            dims=[ED_FILENAME],
+            attrs=zarr_group[name].attrs.asdict(),
+        )
+        del ds[name].attrs["_ARRAY_DIMENSIONS"]
+    return ds
+
+
+def _append_group_to_zarr(
+    ds: xr.Dataset, zarr_path: str, ed_group: str, storage_options: Dict[str, Any]
+) -> None:
+    """
+    Append ``ds`` along its append dimensions to the ``ed_group`` group
+    of the combined zarr store at ``zarr_path``.
+
+    Parameters
+    ----------
+    ds: xr.Dataset
+        The group Dataset of the ``EchoData`` object to append
+    zarr_path: str
+        The path to the combined zarr store
+    ed_group: str
+        The ``EchoData`` group path
+    storage_options: dict
+        Any additional parameters for the storage
+        backend (ignored for local paths)
+    """
+    store = fsspec.get_mapper(zarr_path, **storage_options)
+    group = None if ed_group == "Top-level" else ed_group
+    zarr_group = zarr.open_group(store, path=group or "", mode="r+")
+
+    ds = _match_stored_dims(ds, zarr_group)
+    if ed_group == "Provenance":
+        ds = _match_prov_vars(ds, zarr_group)
+        # Continue the numbering of the source files
+        ds = ds.assign_coords({FILENAMES: ds[FILENAMES] + zarr_group[FILENAMES].shape[0]})
+
+    # The encodings of the stored arrays are used for the appended data
+    for var in ds.variables.values():
+        var.encoding = {}
+
+    ds_append_dims = set(ds.dims).intersection(APPEND_DIMS.union({ED_FILENAME}))
+    for dim in ds_append_dims:
+        drop_dims = [c_dim for c_dim in ds_append_dims if c_dim != dim]
+        ds_dim = ds.drop_dims(drop_dims)
+        # Only write the variables along the appended dimension and the indexes
+        ds_dim = ds_dim.drop_vars(
+            [
+                name
+                for name, var in ds_dim.variables.items()
+                if dim not in var.dims and name not in ds_dim.dims
+            ]
+        )
+        ds_dim = _chunk_as_stored(ds_dim, zarr_group)
+        ds_dim.to_zarr(store, group=group, mode="a", append_dim=dim, consolidated=False)
+
+
+def _chunk_as_stored(ds: xr.Dataset, zarr_group: zarr.Group) -> xr.Dataset:
+    """
+    Rechunk the dask arrays of ``ds`` to the chunks of the arrays stored in ``zarr_group``,
+    so that each dask chunk is written to whole chunks of the stored arrays.
+    """
+    ds = ds.copy()
+    for name, var in list(ds.variables.items()):
+        if var.chunks is not None and name in zarr_group:
+            ds[name] = var.chunk(dict(zip(var.dims, zarr_group[name].chunks)))
+    return ds
+
+
+def _combine_to_zarr(
+    sonar_model: str,
+    eds: List[EchoData],
+    echodata_filenames: List[str],
+    channel_selection: Optional[Union[List, Dict[str, list]]],
+    zarr_path: str,
+    storage_options: Dict[str, Any] = {},
+) -> None:
+    """
+    Combines the echodata objects by streaming them one at a time into a zarr store.
+
+    The first ``EchoData`` object is written to the store, and the groups of each
+    subsequent object are checked against those already written and appended
+    along their append dimensions, so that only one object is loaded at a time.
+
+    Parameters
+    ----------
+    sonar_model : str
+        The sonar model used for all elements in ``eds``
+    eds: list of EchoData object
+        The list of ``EchoData`` objects to be combined
+    echodata_filenames : list of str
+        The filenames of the echodata objects
+    channel_selection: list of str or dict, optional
+        Specifies what channels should be selected for an ``EchoData`` group
+        with a ``channel`` dimension (before combination).
+    zarr_path: str
+        The validated path to the combined zarr store
+    storage_options: dict
+        Any additional parameters for the storage
+        backend (ignored for local paths)
+    """
+    first_ed = eds[0]
+    first_summary = get_summary(first_ed)
+    ed_group_chan_sel = _check_echodata_channels([first_ed], channel_selection, [first_summary])
+    tree_dict = _combine(
+        sonar_model,
+        [first_ed],
+        echodata_filenames[:1],
+        ed_group_chan_sel,
+        summaries=[first_summary],
+    )
+
+    ed_comb = EchoData(sonar_model=sonar_model)
+    ed_comb._set_tree(DataTree.from_dict(tree_dict, name="root"))
+    ed_comb._load_tree()
+    ed_comb.to_zarr(zarr_path, output_storage_options=storage_options, consolidated=False)
+    logger.info(f"combined {echodata_filenames[0]} into {zarr_path}")
+
+    prev_summary = first_summary
+    for ed, filename in zip(eds[1:], echodata_filenames[1:]):
+        if set(ed.group_paths) != set(first_ed.group_paths):
+            raise RuntimeError(
+                f"The groups of the EchoData object from {filename} differ "
+                "from those of the first EchoData object, combine cannot be used!"
+            )
+        # Incremental checks against the first and previous objects
+        summary = get_summary(ed)
+        _check_echodata_channels([first_ed, ed], channel_selection, [first_summary, summary])
+        for ed_group in summary["groups"]:
+            _check_ascending_ds_times([prev_summary, summary], ed_group)
+        if summary["vendor"] is not None:
+            _check_no_append_vendor_params(
+                [first_summary, summary],
+                "Vendor_specific",
+                ed_group_chan_sel.get("Vendor_specific"),
+            )
+
+        tree_dict = _combine(sonar_model, [ed], [filename], ed_group_chan_sel, summaries=[summary])
+        for ed_group, ds in tree_dict.items():
+            _append_group_to_zarr(
+                ds, zarr_path, "Top-level" if ed_group == "/" else ed_group, storage_options
+            )
+        logger.info(f"combined {filename} into {zarr_path}")
+        prev_summary = summary
+
+    # Replace the Vendor_specific hashes of the first object with those of the combined store
+    store = fsspec.get_mapper(zarr_path, **storage_options)
+    zarr.consolidate_metadata(store)
+    hashes = compute_vendor_hashes(EchoData.from_file(zarr_path, storage_options=storage_options))
+    zarr.open_group(store, path="Provenance", mode="r+").attrs[SUMMARY_ATTR] = json.dumps(hashes)
+    zarr.consolidate_metadata(store)
+
+
 def combine_echodata(
     echodata_list: List[EchoData] = None,
     channel_selection: Optional[Union[List, Dict[str, list]]] = None,
+    zarr_path: Optional[Union[str, Path]] = None,
+    storage_options: Dict[str, Any] = {},
+    overwrite: bool = False,
 ) -> EchoData:
     """
     Combines multiple ``EchoData`` objects into a single ``EchoData`` object.
@@ -878,6 +1088,15 @@ def combine_echodata(
         groups (e.g. "Sonar/Beam_group1") and values as a list of channel names to select
         within that beam group. The rest of the ``EchoData`` groups with a ``channel`` dimension
         will have their selected channels chosen automatically.
+    zarr_path: str or Path, optional
+        The full save path to a combined zarr store. If provided, the ``EchoData`` objects
+        are streamed one at a time into the store instead of being combined in memory,
+        and the combined ``EchoData`` object is lazily loaded from the store.
+    storage_options: dict
+        Any additional parameters for the storage backend of ``zarr_path``
+        (ignored for local paths)
+    overwrite: bool, default False
+        If True, overwrites the zarr store at ``zarr_path`` if it already exists
 
     Returns
     -------
@@ -919,6 +1138,8 @@ def combine_echodata(
     RuntimeError
         If ``channel_selection=None`` and the ``channel`` dimensions are not the
         same across the same group under each object in ``echodata_list``.
+    RuntimeError
+        If ``zarr_path`` already exists and ``overwrite=False``
     NotImplementedError
         If ``channel_selection`` is a list and the listed channels are not contained
         in the ``EchoData`` group across all objects in ``echodata_list``.
@@ -928,6 +1149,13 @@ def combine_echodata(
     * ``EchoData`` objects are combined by appending their groups individually.
     * All attributes (besides attributes whose values are arrays) from all groups before the
       combination will be stored in the ``Provenance`` group.
+    * When streaming into ``zarr_path``, memory use does not grow with the number of
+      ``EchoData`` objects. The checks are done as each object is appended, so an error
+      leaves the objects appended so far in the store. The group attributes are those
+      of the first object, and the ``range_sample`` dimension is extended with missing values
+      when an object holds longer pings. Variables without an append dimension are those
+      of the first object: unlike the in-memory combination, they are not checked for
+      conflicting values (``compat="no_conflicts"``) across the objects.
 
     Examples
     --------
@@ -942,6 +1170,11 @@ def combine_echodata(
     >>> ed1 = echopype.open_raw(raw_file="EK60_file1.raw", sonar_model="EK60")
     >>> ed2 = echopype.open_raw(raw_file="EK60_file2.raw", sonar_model="EK60")
     >>> combined = echopype.combine_echodata(echodata_list=[ed1, ed2])
+
+    Stream ``EchoData`` objects into a combined zarr store:
+
+    >>> eds = [echopype.open_converted(path) for path in sorted(glob.glob("cruise/*.zarr"))]
+    >>> combined = echopype.combine_echodata(eds, zarr_path="cruise_combined.zarr")
     """
     # return empty EchoData object, if no EchoData objects are provided
     if echodata_list is None:
@@ -954,8 +1187,24 @@ def combine_echodata(
     # make sure channel_selection is the appropriate type and only contains the beam groups
     _check_channel_selection_form(channel_selection)
 
+    if zarr_path is not None:
+        # stream the echodata objects into the zarr store and open the combined store
+        validated_path = check_zarr_path(zarr_path, storage_options, overwrite)
+        _combine_to_zarr(
+            sonar_model=sonar_model,
+            eds=echodata_list,
+            echodata_filenames=echodata_filenames,
+            channel_selection=channel_selection,
+            zarr_path=validated_path,
+            storage_options=storage_options,
+        )
+        return EchoData.from_file(validated_path, storage_options=storage_options)
+
+    # get the metadata summaries used by the checks, stored in converted files
+    summaries = get_summaries(echodata_list)
+
     # perform channel check and get channel selection for each EchoData group
-    ed_group_chan_sel = _check_echodata_channels(echodata_list, channel_selection)
+    ed_group_chan_sel = _check_echodata_channels(echodata_list, channel_selection, summaries)
 
     # combine the echodata objects and get the tree dict
     tree_dict = _combine(
@@ -963,6 +1212,7 @@ def combine_echodata(
         eds=echodata_list,
         echodata_filenames=echodata_filenames,
         ed_group_chan_sel=ed_group_chan_sel,
+        summaries=summaries,
     )
 
     # create datatree from tree dictionary
@@ -974,3 +1224,79 @@ def combine_echodata(
     ed_comb._load_tree()
 
     return ed_comb
+
+
+def open_mfconverted(
+    converted_raw_paths: List["PathHint"],
+    storage_options: Dict[str, str] = None,
+    channel_selection: Optional[Union[List, Dict[str, list]]] = None,
+    **kwargs,
+) -> EchoData:
+    """Create a virtual EchoData object over multiple converted netcdf or zarr files.
+
+    The groups of all files are lazily opened and concatenated along their
+    append dimensions (``ping_time``, ``time1``, ``time2``, ``time3`` and ``filenames``)
+    as in ``combine_echodata``, without loading or writing any data,
+    so that the combined data can be sliced by time and channel
+    before any data is read.
+
+    Parameters
+    ----------
+    converted_raw_paths : list of str
+        paths to converted data files, in ascending time order
+    storage_options : dict
+        options for cloud storage
+    channel_selection: list of str or dict, optional
+        Specifies what channels should be selected for an ``EchoData`` group
+        with a ``channel`` dimension, see ``combine_echodata``.
+    kwargs : dict
+        optional keyword arguments to be passed
+        into xr.open_dataset, by default data are opened
+        as dask arrays with the chunks of the files (``chunks={}``)
+
+    Returns
+    -------
+    EchoData object
+
+    Notes
+    -----
+    Only the coordinates, attributes and metadata summary of each file are read
+    to check and combine the files. Variables without an append dimension,
+    e.g. the filter coefficients in ``Vendor_specific``, are taken from the first file
+    without being compared across files: use ``combine_echodata`` to check them.
+
+    Examples
+    --------
+    >>> ed = echopype.open_mfconverted(sorted(glob.glob("cruise/*.zarr")))
+    >>> ed["Sonar/Beam_group1"].sel(ping_time=slice("2017-06-15", "2017-06-16"))
+    """
+    open_kwargs = {"chunks": {}, **kwargs}
+    echodata_list = [
+        EchoData.from_file(
+            converted_raw_path=path,
+            storage_options=storage_options,
+            open_kwargs=open_kwargs,
+            lazy=True,
+        )
+        for path in converted_raw_paths
+    ]
+
+    sonar_model, echodata_filenames = check_eds(echodata_list)
+    _check_channel_selection_form(channel_selection)
+    summaries = get_summaries(echodata_list)
+    ed_group_chan_sel = _check_echodata_channels(echodata_list, channel_selection, summaries)
+
+    tree_dict = _combine(
+        sonar_model=sonar_model,
+        eds=echodata_list,
+        echodata_filenames=echodata_filenames,
+        ed_group_chan_sel=ed_group_chan_sel,
+        virtual=True,
+        summaries=summaries,
+    )
+    tree = DataTree.from_dict(tree_dict, name="root")
+
+    ed_virtual = EchoData(sonar_model=sonar_model, open_kwargs=open_kwargs)
+    ed_virtual._set_tree(tree)
+    ed_virtual._load_tree()
+    return ed_virtual
@@ -2,14 +2,17 @@ import datetime
 import warnings
 from html import escape
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, Optional, Set, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 import dask.array
 import fsspec
+import netCDF4
 import numpy as np
 import xarray as xr
-from datatree import DataTree, open_datatree
+import zarr
+from datatree import DataTree
 from zarr.errors import GroupNotFoundError, PathNotFoundError
+from zarr.storage import ConsolidatedMetadataStore
 
 if TYPE_CHECKING:
     from ..core import EngineHint, FileFormatHint, PathHint, SonarModelsHint
@@ -35,9 +38,54 @@ TVG_CORRECTION_FACTOR = {
     "EA640": 0,
 }
 
+# Arguments of xr.open_dataset controlling the CF decoding of the variables
+CF_DECODE_KWARGS = [
+    "mask_and_scale",
+    "decode_times",
+    "concat_characters",
+    "decode_coords",
+    "use_cftime",
+    "decode_timedelta",
+]
+
 logger = _init_logger(__name__)
 
 
+def _iter_zarr_groups(zarr_group: zarr.Group, parent: str = "") -> Iterator[str]:
+    """Iterate over the paths of all subgroups of a zarr group."""
+    for name, subgroup in zarr_group.groups():
+        path = f"{parent}{name}"
+        yield path
+        yield from _iter_zarr_groups(subgroup, parent=f"{path}/")
+
+
+def _set_float32_scale_factors(ds: xr.Dataset) -> xr.Dataset:
+    """
+    Set the ``scale_factor`` of the variables of an undecoded ``ds`` packed as
+    integers of up to 16 bits to float32, so that they are decoded to float32,
+    e.g. the power samples kept in their native dtype by ``open_raw``.
+    Attributes of zarr stores are read back as float64, which xarray
+    otherwise decodes to float64.
+    """
+    for var in ds.variables.values():
+        if (
+            "scale_factor" in var.attrs
+            and "add_offset" not in var.attrs
+            and var.dtype.kind in "iu"
+            and var.dtype.itemsize <= 2
+        ):
+            var.attrs["scale_factor"] = np.float32(var.attrs["scale_factor"])
+    return ds
+
+
+def _iter_nc_groups(nc_group: netCDF4.Group, parent: str = "") -> Iterator[str]:
+    """Iterate over the paths of all subgroups of a netCDF group."""
+    for name, subgroup in nc_group.groups.items():
+        path = f"{parent}{name}"
+        yield path
+        yield from _iter_nc_groups(subgroup, parent=f"{path}/")
+
+
 class EchoData:
     """Echo data model class for handling raw converted data,
     including multiple files associated with the same data set.
@@ -65,7 +113,14 @@ class EchoData:
         self.xml_path: Optional["PathHint"] = xml_path
         self.sonar_model: Optional["SonarModelsHint"] = sonar_model
         self.converted_raw_path: Optional["PathHint"] = converted_raw_path
+        # Plan of the samples swapped to disk when converting with use_swap="auto"
+        self.memory_plan: Optional[Dict[str, Any]] = None
         self._tree: Optional["DataTree"] = None
+        # Paths of the groups not opened yet when lazily opening a converted file
+        self._lazy_groups: Set[str] = set()
+        self._group_store: Optional[Any] = None
+        self._group_chunk_store: Optional[Any] = None
+        self._group_engine: Optional["EngineHint"] = None
 
         self.__setup_groups()
         # self.__read_converted(converted_raw_path)
@@ -91,6 +146,10 @@ class EchoData:
                     zarr_stores = [
                         v.store for k, v in dask_graph.items() if "original-from-zarr" in k
                     ]
+                    # Dask arrays may not be read from a swap zarr store,
+                    # e.g. lazily decoded or padded samples
+                    if len(zarr_stores) == 0:
+                        continue
                     fs = zarr_stores[0].fs
                     from ..utils.io import delete_zarr_store
 
@@ -157,6 +216,8 @@ class EchoData:
         converted_raw_path: str,
         storage_options: Optional[Dict[str, Any]] = None,
         open_kwargs: Dict[str, Any] = {},
+        groups: Optional[List[str]] = None,
+        lazy: bool = False,
     ) -> "EchoData":
         echodata = cls(
             converted_raw_path=converted_raw_path,
@@ -166,12 +227,7 @@ class EchoData:
         echodata._check_path(converted_raw_path)
         converted_raw_path = echodata._sanitize_path(converted_raw_path)
         suffix = echodata._check_suffix(converted_raw_path)
-        tree = open_datatree(
-            converted_raw_path,
-            engine=XARRAY_ENGINE_MAP[suffix],
-            **echodata.open_kwargs,
-        )
-        tree.name = "root"
+        tree = echodata._open_groups(converted_raw_path, suffix, groups=groups, lazy=lazy)
 
         echodata._set_tree(tree)
 
@@ -183,11 +239,86 @@ class EchoData:
         echodata._load_tree()
         return echodata
 
+    def _open_groups(
+        self,
+        filepath: "PathHint",
+        suffix: "FileFormatHint",
+        groups: Optional[List[str]] = None,
+        lazy: bool = False,
+    ) -> DataTree:
+        """
+        Open the Top-level group and the groups in ``groups`` (all groups if ``None``)
+        into a tree. With ``lazy=True``, only the structure of the other groups is set,
+        and each group is opened on first access.
+        """
+        self._group_engine = XARRAY_ENGINE_MAP[suffix]
+        if self._group_engine == "zarr":
+            try:
+                # Read the consolidated metadata of all groups once,
+                # the chunks are still read from the store itself
+                self._group_store = ConsolidatedMetadataStore(filepath)
+                self._group_chunk_store = filepath
+            except KeyError:
+                self._group_store = filepath
+            zarr_root = zarr.open_group(self._group_store, mode="r")
+            group_paths = list(_iter_zarr_groups(zarr_root))
+        else:
+            self._group_store = filepath
+            with netCDF4.Dataset(str(filepath), mode="r") as nc_root:
+                group_paths = list(_iter_nc_groups(nc_root))
+
+        if groups is not None:
+            missing_groups = [g for g in groups if g not in group_paths + ["Top-level"]]
+            if missing_groups:
+                raise ValueError(
+                    f"Groups {missing_groups} not found in {filepath}: "
+                    f"must be among {group_paths}"
+                )
+            group_paths = [g for g in group_paths if g in groups]
+
+        tree = DataTree.from_dict(
+            {"/": self._open_group(None), **{g: None for g in group_paths}}, name="root"
+        )
+        if lazy:
+            self._lazy_groups = {f"/{g}" for g in group_paths}
+        else:
+            for g in group_paths:
+                tree[g].ds = self._open_group(g)
+        return tree
+
+    def _open_group(self, group: Optional[str]) -> xr.Dataset:
+        """Open a group of the converted file opened with ``_open_groups``."""
+        open_kwargs = self.open_kwargs
+        if isinstance(self._group_store, ConsolidatedMetadataStore):
+            # Metadata are served from the consolidated metadata already read
+            open_kwargs = {
+                **open_kwargs,
+                "consolidated": False,
+                "chunk_store": self._group_chunk_store,
+            }
+        if not open_kwargs.get("decode_cf", True):
+            return xr.open_dataset(
+                self._group_store, group=group, engine=self._group_engine, **open_kwargs
+            )
+        # The variables are decoded once the scale factors of packed samples are set
+        decode_kwargs = {k: v for k, v in open_kwargs.items() if k in CF_DECODE_KWARGS}
+        ds = xr.open_dataset(
+            self._group_store,
+            group=group,
+            engine=self._group_engine,
+            decode_cf=False,
+            **{k: v for k, v in open_kwargs.items() if k not in CF_DECODE_KWARGS + ["decode_cf"]},
+        )
+        return xr.decode_cf(_set_float32_scale_factors(ds), **decode_kwargs)
+
     def _load_tree(self) -> None:
         if self._tree is None:
             raise ValueError("Datatree not found!")
 
         for group, value in self.group_map.items():
+            # Lazily opened groups are set on first access
+            if value["ep_group"] is not None and f"/{value['ep_group']}" in self._lazy_groups:
+                continue
             # EK80 data may have a Beam_power group if both complex and power data exist.
             ds = None
             try:
@@ -206,6 +337,14 @@ class EchoData:
             if isinstance(ds, xr.Dataset):
                 setattr(self, group, node)
 
+    def __load_lazy_group(self, node: DataTree) -> None:
+        """Open a lazily opened group on first access."""
+        self._lazy_groups.discard(node.path)
+        node.ds = self._open_group(node.path[1:])
+        for group, value in self.group_map.items():
+            if value["ep_group"] == node.path[1:] and self.__get_dataset(node) is not None:
+                setattr(self, group, node)
+
     @property
     def version_info(self) -> Union[Tuple[int], None]:
         def _get_version_tuple(provenance_type):
@@ -249,7 +388,10 @@ class EchoData:
         if key in ["Top-level", "/"]:
             # Access to root
             return self._tree
-        return self._tree[key]
+        node = self._tree[key]
+        if node.path in self._lazy_groups:
+            self.__load_lazy_group(node)
+        return node
 
     def __getitem__(self, __key: Optional[str]) -> Optional[xr.Dataset]:
         if self._tree:
@@ -544,7 +686,7 @@ class EchoData:
             whether or not to overwrite existing files
             Defaults to ``False``
         parallel : bool
-            whether or not to use parallel processing. (Not yet implemented)
+            whether or not to use parallel processing. (Not yet implemented for netCDF)
         output_storage_options : dict
             Additional keywords to pass to the filesystem class.
         **kwargs : dict, optional
@@ -587,7 +729,9 @@ class EchoData:
             whether or not to overwrite existing files
             Defaults to ``False``
         parallel : bool
-            whether or not to use parallel processing. (Not yet implemented)
+            whether or not to write all groups concurrently in a single dask graph,
+            consolidating metadata once at the end.
+            Defaults to ``False``
         output_storage_options : dict
             Additional keywords to pass to the filesystem class.
         consolidated : bool
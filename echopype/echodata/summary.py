@@ -0,0 +1,208 @@
+"""
+Lightweight metadata summary of an ``EchoData`` object,
+used to validate a combination without reading the data of each group.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import xarray as xr
+
+from .echodata import EchoData
+
+# Provenance attribute holding the Vendor_specific hashes of the summary in converted files
+SUMMARY_ATTR = "echodata_summary"
+# Version of the summary layout, stored hashes of other versions are recomputed
+SUMMARY_VERSION = 2
+
+POSSIBLE_TIME_DIMS = {"time1", "time2", "time3", "ping_time"}
+
+
+def _hash_variables(ds: xr.Dataset) -> str:
+    """
+    Hash the names, dimensions, values and attributes of all variables of ``ds``
+    along with its attributes, so that identical Datasets have the same hash.
+    """
+    sha = hashlib.sha256()
+    for name in sorted(ds.variables):
+        var = ds.variables[name]
+        sha.update(json.dumps([name, var.dims, str(var.dtype)]).encode())
+        values = var.values
+        if values.dtype.kind in "OU":
+            sha.update(json.dumps(values.tolist(), default=str).encode())
+        else:
+            sha.update(np.ascontiguousarray(values).tobytes())
+        sha.update(json.dumps(var.attrs, sort_keys=True, default=str).encode())
+    sha.update(json.dumps(ds.attrs, sort_keys=True, default=str).encode())
+    return sha.hexdigest()
+
+
+def _summarize_vendor(ds: xr.Dataset) -> Dict[str, Any]:
+    """
+    Hash the ``Vendor_specific`` variables without an append dimension,
+    per channel for variables with a ``channel`` dimension so that channels
+    can be compared after channel selection.
+    """
+    ds = ds.drop_dims(set(ds.dims).intersection(POSSIBLE_TIME_DIMS.union({"filenames"})))
+    if "channel" not in ds.dims:
+        return {"channel": None, "other": _hash_variables(ds)}
+
+    ds_chan = ds[[name for name, var in ds.data_vars.items() if "channel" in var.dims]]
+    ds_other = ds.drop_dims("channel")
+    return {
+        "channel": {
+            str(ch): _hash_variables(ds_chan.sel(channel=[ch])) for ch in ds["channel"].values
+        },
+        "other": _hash_variables(ds_other),
+    }
+
+
+def _summarize_groups(echodata: EchoData) -> Dict[str, Any]:
+    """
+    Get the dimensions, channels and first and last times of each group of ``echodata``
+    from the coordinates of the groups, which are held in memory once opened.
+    """
+    groups = {}
+    for group in echodata.group_paths:
+        ds = echodata[group]
+        if ds is None:
+            continue
+        times = {}
+        for dim in sorted(set(ds.dims).intersection(POSSIBLE_TIME_DIMS)):
+            time = ds[dim].values.astype("datetime64[ns]")
+            times[dim] = (
+                [str(np.datetime_as_string(t, unit="ns")) for t in (time[0], time[-1])]
+                if time.size > 0
+                else ["NaT", "NaT"]
+            )
+        groups[group] = {
+            "dims": sorted(ds.dims),
+            "channel": ([str(ch) for ch in ds["channel"].values] if "channel" in ds.dims else None),
+            "times": times,
+        }
+    return groups
+
+
+def _hash_vendor(echodata: EchoData) -> Optional[Dict[str, Any]]:
+    """Hash the ``Vendor_specific`` group of ``echodata``, ``None`` if it does not exist."""
+    vendor = echodata["Vendor_specific"]
+    return _summarize_vendor(vendor) if vendor is not None else None
+
+
+def _make_summary(
+    echodata: EchoData, groups: Dict[str, Any], vendor: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Assemble the summary of ``echodata`` from its group summaries and vendor hashes."""
+    return {
+        "summary_version": SUMMARY_VERSION,
+        "sonar_model": echodata.sonar_model,
+        "version": echodata["Provenance"].attrs.get("conversion_software_version"),
+        "groups": groups,
+        "vendor": vendor,
+    }
+
+
+def compute_vendor_hashes(echodata: EchoData) -> Dict[str, Any]:
+    """
+    Compute the hashes of the ``Vendor_specific`` variables of an ``EchoData`` object,
+    which are stored in the Provenance group of converted files.
+
+    Parameters
+    ----------
+    echodata : EchoData
+        The ``EchoData`` object to hash
+
+    Returns
+    -------
+    dict
+        A JSON serializable dictionary with ``summary_version``
+        and ``vendor``, the hashes of the ``Vendor_specific`` variables
+        without an append dimension (``None`` without a ``Vendor_specific`` group)
+    """
+    return {"summary_version": SUMMARY_VERSION, "vendor": _hash_vendor(echodata)}
+
+
+def compute_summary(echodata: EchoData) -> Dict[str, Any]:
+    """
+    Compute the metadata summary of an ``EchoData`` object.
+
+    Parameters
+    ----------
+    echodata : EchoData
+        The ``EchoData`` object to summarize
+
+    Returns
+    -------
+    dict
+        A JSON serializable dictionary with:
+
+        - ``sonar_model`` and ``version``, the echopype version that converted the data
+        - ``groups``, with for each group its dimensions, its channels
+          (``None`` without a ``channel`` dimension) and the first and last values
+          of its time dimensions as strings (``"NaT"`` for missing times)
+        - ``vendor``, the hashes of the ``Vendor_specific`` variables
+          without an append dimension
+    """
+    return _make_summary(echodata, _summarize_groups(echodata), _hash_vendor(echodata))
+
+
+def _get_stored_vendor_hashes(
+    echodata: EchoData, vendor_channels: Optional[List[str]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Get the ``Vendor_specific`` hashes stored in the Provenance group of ``echodata``
+    for the channels in ``vendor_channels``,
+    or ``None`` if they are missing or of another summary version.
+    """
+    stored: Optional[str] = echodata["Provenance"].attrs.get(SUMMARY_ATTR)
+    if stored is None:
+        return None
+    stored_dict = json.loads(stored)
+    vendor = stored_dict.get("vendor")
+    if stored_dict.get("summary_version") != SUMMARY_VERSION or vendor is None:
+        return None
+    if vendor_channels is None:
+        return vendor if vendor["channel"] is None else None
+    # Channels may have been selected since the file was written
+    if vendor["channel"] is None or not set(vendor_channels) <= vendor["channel"].keys():
+        return None
+    return {
+        "channel": {ch: vendor["channel"][ch] for ch in vendor_channels},
+        "other": vendor["other"],
+    }
+
+
+def get_summary(echodata: EchoData) -> Dict[str, Any]:
+    """
+    Get the metadata summary of an ``EchoData`` object.
+
+    The channels and times of the groups are read from their coordinates,
+    so they reflect in-place changes to an opened ``EchoData`` object.
+    The hashes of the ``Vendor_specific`` variables are read from
+    the Provenance group of the converted file if available,
+    and only computed otherwise.
+
+    Parameters
+    ----------
+    echodata : EchoData
+        The ``EchoData`` object to summarize
+
+    Returns
+    -------
+    dict
+        The summary, see ``compute_summary``
+    """
+    groups = _summarize_groups(echodata)
+    vendor = None
+    if "Vendor_specific" in groups:
+        vendor = _get_stored_vendor_hashes(echodata, groups["Vendor_specific"]["channel"])
+        if vendor is None:
+            vendor = _hash_vendor(echodata)
+    return _make_summary(echodata, groups, vendor)
+
+
+def get_summaries(echodata_list: List[EchoData]) -> List[Dict[str, Any]]:
+    """Get the metadata summary of each ``EchoData`` object in ``echodata_list``."""
+    return [get_summary(ed) for ed in echodata_list]
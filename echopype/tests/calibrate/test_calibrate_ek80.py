@@ -353,6 +353,7 @@ def test_ek80_BB_power_echoview(ek80_path):
     pc = ep.calibrate.ek80_complex.compress_pulse(
         backscatter=beam["backscatter_r"] + 1j * beam["backscatter_i"],
         chirp=chirp,
+        dtype=np.complex128,
     ).compute()
     pc = pc / ep.calibrate.ek80_complex.get_norm_fac(chirp)  # normalization for each channel
     pc_mean = pc.sel(channel="WBT 549762-15 ES70-7C").mean(dim="beam").dropna("range_sample")
@@ -451,3 +452,50 @@ def test_ek80_BB_complex_multiplex_NaNs_and_non_NaNs(raw_data_path, target_chann
         target_channel_ping_pattern,
         equal_nan=True
     )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("dtype, rtol", [(np.complex128, 1e-10), (np.complex64, 1e-4)])
+def test_compress_pulse_fft(dtype, rtol):
+    """Compare batched FFT pulse compression against direct convolution per ping and beam."""
+    from scipy import signal
+
+    rng = np.random.default_rng(0)
+    channels = ["ch1", "ch2"]
+    shape = (5, 4, 100, 2)  # ping_time, beam, range_sample, channel
+    data = rng.standard_normal(shape) + 1j * rng.standard_normal(shape)
+    data[0, :, 90:, 0] = np.nan  # padding of a shorter ping
+    backscatter = xr.DataArray(
+        data,
+        dims=["ping_time", "beam", "range_sample", "channel"],
+        coords={"channel": channels},
+    ).transpose("channel", "ping_time", "beam", "range_sample")
+    chirp = {
+        "ch1": rng.standard_normal(7) + 1j * rng.standard_normal(7),
+        "ch2": rng.standard_normal(12) + 1j * rng.standard_normal(12),
+    }
+
+    expected = np.zeros(shape, dtype=np.complex128)
+    for ch_seq, ch in enumerate(channels):
+        replica = np.flipud(np.conj(chirp[ch]))
+        for i in range(shape[0]):
+            for j in range(shape[1]):
+                expected[i, j, :, ch_seq] = signal.convolve(
+                    np.nan_to_num(data[i, j, :, ch_seq]), replica, mode="full"
+                )[replica.size - 1 :]
+    expected[np.isnan(data)] = np.nan
+
+    for bs in [backscatter, backscatter.chunk({"ping_time": 2})]:
+        pc = ep.calibrate.ek80_complex.compress_pulse(bs, chirp, dtype=dtype).compute()
+        assert pc.dims == backscatter.dims
+        assert pc.dtype == dtype
+        assert np.allclose(
+            pc.transpose("ping_time", "beam", "range_sample", "channel").values,
+            expected,
+            rtol=rtol,
+            atol=rtol * np.abs(np.nan_to_num(expected)).max(),
+            equal_nan=True,
+        )
+
+    # Single precision by default
+    assert ep.calibrate.ek80_complex.compress_pulse(backscatter, chirp).dtype == np.complex64
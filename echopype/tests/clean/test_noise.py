@@ -11,6 +11,7 @@ from echopype.clean.utils import (
     downsample_upsample_along_depth,
 )
 from echopype.utils.compute import _lin2log, _log2lin
+from echopype.testing import _gen_Sv_echo_range_irregular
 
 
 @pytest.mark.unit
@@ -247,6 +248,75 @@ def test_pool_Sv_values(chunk, func):
                     )
 
 
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("chunk", "func"),
+    [
+        (False, np.nanmean),
+        (True, np.nanmean),
+        (False, np.nanmedian),
+        (True, np.nanmedian),
+    ],
+)
+def test_pool_Sv_values_against_brute_force(chunk, func):
+    """
+    Check pooled Sv against a brute-force window search on mock Sv with `echo_range`
+    varying across pings, including windows straddling changes in `echo_range`.
+    """
+    # Create mock Sv with NaNs
+    ds_Sv = _gen_Sv_echo_range_irregular(
+        depth_len=30,
+        depth_interval=[0.5, 0.32, 0.13],
+        depth_ping_time_len=[10, 15, 5],
+        ping_time_len=30,
+        random_number_generator=np.random.default_rng(0),
+    )
+    ds_Sv["Sv"] = -80 * ds_Sv["Sv"]
+    ds_Sv["Sv"][0, 3, 5:9] = np.nan
+
+    # Set window args
+    depth_bin = 1.0
+    num_side_pings = 2
+    exclude_above = 0.5
+    range_var = "echo_range"
+
+    # Compute pooled Sv
+    pooled_Sv = pool_Sv(
+        ds_Sv.chunk({"ping_time": 7}) if chunk else ds_Sv,
+        func,
+        depth_bin,
+        num_side_pings,
+        exclude_above,
+        range_var,
+    ).compute()
+
+    # Compute expected pooled Sv by searching every window
+    Sv = ds_Sv["Sv"].values
+    depth = ds_Sv[range_var].values
+    num_pings = Sv.shape[1]
+    expected_pooled_Sv = np.full(Sv.shape, np.nan)
+    for channel_index, ping_time_index, range_sample_index in np.ndindex(Sv.shape):
+        current_depth = depth[channel_index, ping_time_index, range_sample_index]
+        if (
+            (current_depth - depth_bin >= np.nanmin(depth))
+            and (current_depth + depth_bin <= np.nanmax(depth))
+            and (current_depth - depth_bin >= exclude_above)
+            and (ping_time_index - num_side_pings >= 0)
+            and (ping_time_index + num_side_pings <= num_pings)
+        ):
+            window_pings = slice(ping_time_index - num_side_pings, ping_time_index + num_side_pings + 1)
+            window_depth = depth[channel_index, window_pings]
+            window_mask = (current_depth - depth_bin <= window_depth) & (
+                window_depth <= current_depth + depth_bin
+            )
+            expected_pooled_Sv[channel_index, ping_time_index, range_sample_index] = _lin2log(
+                func(_log2lin(Sv[channel_index, window_pings][window_mask]))
+            )
+
+    assert pooled_Sv.dims == ds_Sv["Sv"].dims
+    assert np.allclose(pooled_Sv.values, expected_pooled_Sv, rtol=1e-10, atol=1e-10, equal_nan=True)
+
+
 @pytest.mark.integration
 @pytest.mark.parametrize(
     ("chunk", "func"),
@@ -858,6 +928,83 @@ def test_mask_attenuated_signal_against_echopy(chunk):
     )
 
 
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("chunk", "num_side_pings"),
+    [
+        (False, 0),
+        (False, 3),
+        (True, 3),
+        (True, 15),
+    ],
+)
+def test_mask_attenuated_signal_against_ping_loop(chunk, num_side_pings):
+    """
+    Check the attenuated signal mask against echopy's ping-by-ping computation on mock Sv
+    with attenuated pings, NaNs and layer indices varying across pings.
+    """
+    # Create mock Sv with attenuated pings and `depth` shifting across pings
+    rng = np.random.default_rng(1)
+    num_pings, num_range_samples = 300, 200
+    Sv = -70 + 5 * rng.standard_normal((num_pings, num_range_samples))
+    Sv[rng.random(num_pings) < 0.1] -= 12
+    Sv[5, 30:60] = np.nan
+    Sv[50] = np.nan
+    depth = np.arange(num_range_samples) * 0.5 + rng.random((num_pings, 1)) * 3
+    ds_Sv = xr.Dataset(
+        data_vars={
+            "Sv": (["channel", "ping_time", "range_sample"], Sv[None]),
+            "depth": (["channel", "ping_time", "range_sample"], depth[None]),
+        },
+        coords={
+            "channel": ["ch_0"],
+            "ping_time": np.arange(num_pings),
+            "range_sample": np.arange(num_range_samples),
+        },
+    )
+    if chunk:
+        ds_Sv = ds_Sv.chunk({"ping_time": 40})
+
+    # Create mask
+    upper_limit_sl, lower_limit_sl, attenuation_signal_threshold = 20, 60, -6
+    attenuated_mask = ep.clean.mask_attenuated_signal(
+        ds_Sv,
+        f"{upper_limit_sl}m",
+        f"{lower_limit_sl}m",
+        num_side_pings,
+        f"{attenuation_signal_threshold}dB",
+    ).compute()
+
+    # Compute expected mask ping by ping
+    expected_mask = np.zeros(Sv.shape, dtype=bool)
+    for ping_time_idx in range(num_pings):
+        up = np.argmin(abs(depth[ping_time_idx, :] - upper_limit_sl))
+        lw = np.argmin(abs(depth[ping_time_idx, :] - lower_limit_sl))
+        if not (
+            (ping_time_idx - num_side_pings < 0)
+            | (ping_time_idx + num_side_pings > num_pings - 1)
+            | np.all(np.isnan(Sv[ping_time_idx, up:lw]))
+        ):
+            pingmedian = _lin2log(np.nanmedian(_log2lin(Sv[ping_time_idx, up:lw])))
+            blockmedian = _lin2log(
+                np.nanmedian(
+                    _log2lin(
+                        Sv[
+                            (ping_time_idx - num_side_pings) : (ping_time_idx + num_side_pings),
+                            up:lw,
+                        ]
+                    )
+                )
+            )
+            if (pingmedian - blockmedian) < attenuation_signal_threshold:
+                expected_mask[ping_time_idx, :] = True
+
+    assert attenuated_mask.dims == ("channel", "ping_time", "range_sample")
+    assert np.array_equal(attenuated_mask.isel(channel=0).values, expected_mask)
+    if num_side_pings > 0:
+        assert expected_mask.any()
+
+
 def test_remove_background_noise():
     """Test remove_background_noise on toy data"""
 
@@ -5,14 +5,17 @@ import pandas as pd
 from flox.xarray import xarray_reduce
 import xarray as xr
 import echopype as ep
+from echopype.calibrate.range import PING_INVARIANT_ATTR
 from echopype.consolidate import add_location, add_depth
 from echopype.commongrid.utils import (
     _parse_x_bin,
+    _get_ping_invariant_range,
     _groupby_x_along_channels,
     get_distance_from_latlon,
     compute_raw_NASC
 )
 from echopype.tests.commongrid.conftest import get_NASC_echoview
+from echopype.utils.compute import _log2lin
 
 
 # Utilities Tests
@@ -90,7 +93,134 @@ def test__groupby_x_along_channels(request, range_var, lat_lon):
     assert f"{range_var}_bins" in sv_mean.dims
 
 
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ["ds_Sv_fixture", "chunks"],
+    [
+        ("ds_Sv_echo_range_regular", None),
+        ("ds_Sv_echo_range_regular", {"ping_time": 7}),
+        ("ds_Sv_echo_range_irregular", None),
+    ],
+)
+def test__groupby_x_along_channels_ping_invariant_range(request, ds_Sv_fixture, chunks):
+    """The fast path for ranges constant along ping_time gives the same means."""
+    ds_Sv = request.getfixturevalue(ds_Sv_fixture)
+    # NaN samples at the end of some pings
+    ds_Sv["echo_range"] = ds_Sv["echo_range"].where(
+        (ds_Sv["range_sample"] < ds_Sv.sizes["range_sample"] - 5)
+        | xr.DataArray(np.arange(ds_Sv.sizes["ping_time"]) % 3 != 0, dims="ping_time")
+    )
+    ds_Sv["Sv"] = ds_Sv["Sv"].where(ds_Sv["echo_range"].notnull())
+    if chunks is not None:
+        ds_Sv = ds_Sv.chunk(chunks)
+    if ds_Sv_fixture == "ds_Sv_echo_range_regular":
+        # Mark the range as compute_Sv does
+        ds_Sv["echo_range"].attrs[PING_INVARIANT_ATTR] = 1
+        assert _get_ping_invariant_range(ds_Sv["echo_range"]) is not None
+    else:
+        assert _get_ping_invariant_range(ds_Sv["echo_range"]) is None
+
+    range_interval = np.arange(0, ds_Sv["echo_range"].max() + 20, 20)
+    ping_interval = ds_Sv["ping_time"].values[::10]
+
+    sv_mean = _groupby_x_along_channels(
+        ds_Sv, range_interval, x_interval=ping_interval, range_var="echo_range"
+    )
+    expected = xarray_reduce(
+        ds_Sv["Sv"].pipe(_log2lin),
+        ds_Sv["channel"],
+        ds_Sv["ping_time"],
+        ds_Sv["echo_range"],
+        expected_groups=(None, ping_interval, range_interval),
+        isbin=[False, True, True],
+        func="nanmean",
+    )
+    assert sv_mean.dims == expected.dims
+    xr.testing.assert_allclose(sv_mean.compute(), expected.compute())
+
+
+@pytest.mark.integration
+def test__get_ping_invariant_range_compute_Sv(test_path):
+    """The range of compute_Sv is marked as constant along ping_time."""
+    ed = ep.open_raw(
+        test_path["EK60"] / "ncei-wcsd" / "Summer2017-D20170620-T011027.raw", sonar_model="EK60"
+    )
+    ds_Sv = ep.calibrate.compute_Sv(ed)
+    assert ds_Sv["echo_range"].attrs[PING_INVARIANT_ATTR] == 1
+
+    range_1d = _get_ping_invariant_range(ds_Sv["echo_range"])
+    assert range_1d.dims == ("channel", "range_sample")
+    # The range is not computed until the data are aggregated
+    assert range_1d.chunks is not None
+    xr.testing.assert_allclose(
+        range_1d.compute(),
+        ds_Sv["echo_range"].isel(ping_time=0).drop_vars("ping_time").compute(),
+    )
+
+    # Ranges modified after calibration are not marked
+    ds_Sv["echo_range"] = ds_Sv["echo_range"] * xr.DataArray(
+        np.arange(1, ds_Sv.sizes["ping_time"] + 1), dims="ping_time"
+    )
+    assert _get_ping_invariant_range(ds_Sv["echo_range"]) is None
+
+
 # NASC Tests
+def _get_distance_from_latlon_geopy(ds_Sv):
+    """Reference row-wise implementation of get_distance_from_latlon using geopy"""
+    from geopy import distance
+
+    df_pos = ds_Sv["latitude"].to_dataframe().join(ds_Sv["longitude"].to_dataframe())
+    df_pos["latitude_prev"] = df_pos["latitude"].shift(-1)
+    df_pos["longitude_prev"] = df_pos["longitude"].shift(-1)
+    df_latlon_nonan = df_pos.dropna().copy()
+    df_latlon_nonan["dist"] = df_latlon_nonan.apply(
+        lambda x: distance.distance(
+            (x["latitude"], x["longitude"]),
+            (x["latitude_prev"], x["longitude_prev"]),
+        ).nm,
+        axis=1,
+    )
+    df_pos = df_pos.join(df_latlon_nonan["dist"], how="left")
+    df_pos["dist"] = df_pos["dist"].cumsum()
+    df_pos["dist"] = df_pos["dist"].ffill().bfill()
+    return df_pos["dist"].values
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ["method", "rtol"], [("geodesic", 1e-6), ("haversine", 1e-2)]
+)
+@pytest.mark.parametrize("chunks", [None, {"ping_time": 25}])
+def test_get_distance_from_latlon(method, rtol, chunks):
+    rng = np.random.default_rng(0)
+    n_pings = 100
+    lat = 40 + np.cumsum(rng.uniform(-1e-3, 1e-3, n_pings))
+    lon = -120 + np.cumsum(rng.uniform(-1e-3, 1e-3, n_pings))
+    # NaN gaps at the start, in the middle, and at the end
+    lat[[0, 1, 50, 51, 99]] = np.nan
+    lon[[30]] = np.nan
+    ds_Sv = xr.Dataset(
+        {
+            "latitude": ("ping_time", lat),
+            "longitude": ("ping_time", lon),
+        },
+        coords={
+            "ping_time": pd.date_range("2023-01-01", periods=n_pings, freq="1s")
+        },
+    )
+    expected = _get_distance_from_latlon_geopy(ds_Sv)
+    if chunks is not None:
+        ds_Sv = ds_Sv.chunk(chunks)
+
+    dist_nmi = get_distance_from_latlon(ds_Sv, method=method)
+    assert dist_nmi.shape == expected.shape
+    assert np.allclose(dist_nmi, expected, rtol=rtol, atol=0)
+
+    # all positions are NaN
+    ds_Sv = ds_Sv.assign(latitude=ds_Sv["latitude"] * np.nan)
+    assert np.all(np.isnan(get_distance_from_latlon(ds_Sv, method=method)))
+
+
 @pytest.mark.integration
 @pytest.mark.parametrize("compute_mvbs", [True, False])
 def test_compute_NASC(request, test_data_samples, compute_mvbs):
@@ -260,3 +260,83 @@ def _check_raw_output(
                         atol=absolute_tolerance,
                     )
         base.close()
+
+
+def _reference_checksum(data):
+    checksum = 0xB58C
+    for i in range(0, len(data), 2):
+        checksum += int.from_bytes(data[i : i + 2], byteorder="little")
+        checksum %= 2**16
+    if len(data) % 2 == 1:
+        checksum += data[-1] << 8
+        checksum %= 2**16
+    return checksum
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("num_bytes", [0, 1, 2, 9, 10, 4097])
+def test_ad2cp_checksum(num_bytes):
+    from echopype.convert.parse_ad2cp import Ad2cpDataPacket
+
+    data = np.random.default_rng(num_bytes).integers(0, 256, num_bytes, dtype="u1").tobytes()
+    assert Ad2cpDataPacket.checksum(data) == _reference_checksum(data)
+
+
+@pytest.mark.unit
+def test_ad2cp_parse_string_packets(tmp_path):
+    from echopype.convert.parse_ad2cp import Ad2cpDataPacket, ParseAd2cp
+
+    config = 'GETCLOCKSTR,TIME="2022-01-01 00:00:00"\r\nGETHW,FW=2212\r\n'
+    data_record = bytes([0x10]) + config.encode("utf-8")
+    header = np.array(
+        [(0xA5, 10, 0xA0, 0x10, len(data_record), Ad2cpDataPacket.checksum(data_record))],
+        dtype=[
+            ("sync", "u1"),
+            ("header_size", "u1"),
+            ("id", "u1"),
+            ("family", "u1"),
+            ("data_record_size", "<u2"),
+            ("data_record_checksum", "<u2"),
+        ],
+    ).tobytes()
+    header += int(Ad2cpDataPacket.checksum(header)).to_bytes(2, "little")
+    raw_file = tmp_path / "synthetic.ad2cp"
+    raw_file.write_bytes((header + data_record) * 3)
+
+    parser = ParseAd2cp(str(raw_file))
+    parser.parse_raw()
+
+    assert parser.num_packets == 3
+    assert np.all(parser.packet_ids() == 0xA0)
+    assert np.all(parser.packet_rows() == np.arange(3))
+    assert np.all(np.isnat(parser.packet_timestamps()))
+    store = parser.packet_stores[0xA0]
+    assert store.num_packets == 3
+    assert store.first_packet.is_string()
+    assert np.all(store.column("data_record_size").values(3) == len(data_record))
+    assert np.all(store.column("string_data_id").values(3) == 0x10)
+    assert np.all(store.column("string_data").values(3) == config)
+    assert parser.config["GETHW"]["FW"] == 2212
+    assert parser.ping_time[0] == np.datetime64("2022-01-01T00:00:00")
+
+
+@pytest.mark.unit
+def test_ad2cp_packet_column():
+    from echopype.convert.parse_ad2cp import PacketColumn
+
+    column = PacketColumn()
+    column.set(0, np.array([1, 2], dtype="<u2"))
+    # row 1 does not have the field
+    column.set(2, np.array([3, 4, 5], dtype="<u2"))
+    column.set(3, np.array([0.5]))
+    # grow past the initial capacity
+    column.set(PacketColumn.INITIAL_CAPACITY, np.array([6], dtype="<u2"))
+
+    num_rows = PacketColumn.INITIAL_CAPACITY + 2
+    values = column.values(num_rows)
+    assert values.shape == (num_rows, 3)
+    assert values.dtype == np.float64
+    assert np.all(values[:4] == [[1, 2, 0], [0, 0, 0], [3, 4, 5], [0.5, 0, 0]])
+    assert np.all(values[PacketColumn.INITIAL_CAPACITY] == [6, 0, 0])
+    present = column.present_mask(num_rows)
+    assert np.flatnonzero(present).tolist() == [0, 2, 3, PacketColumn.INITIAL_CAPACITY]
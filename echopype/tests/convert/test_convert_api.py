@@ -4,7 +4,7 @@ from typing import List, Tuple
 
 import xarray as xr
 
-from echopype.convert.api import open_raw
+from echopype.convert.api import convert_files, open_raw
 
 
 @pytest.fixture
@@ -165,3 +165,110 @@ def test_direct_to_zarr_integration(
             ed_zarr, ed_no_zarr = compare_zarr_vars(ed_zarr, ed_no_zarr, var_to_comp, grp)
 
         assert ed_zarr[grp] is not None
+
+
+@pytest.mark.unit
+def test_convert_files_manifest_resume(tmp_path, mocker):
+    """Check per-file failure isolation and resuming from the manifest in `convert_files`."""
+    raw_files = []
+    for name in ["good1.raw", "bad.raw", "good2.raw"]:
+        raw_file = tmp_path / name
+        raw_file.write_bytes(b"0" * 100)
+        raw_files.append(raw_file)
+    out_dir = tmp_path / "converted"
+    manifest_path = tmp_path / "manifest.jsonl"
+
+    def mock_open_raw(raw_file, sonar_model, **kwargs):
+        if "bad" in raw_file:
+            raise ValueError("corrupted datagram")
+        return raw_file
+
+    def mock_to_file(echodata, engine, save_path, **kwargs):
+        os.makedirs(save_path)
+
+    mocker.patch("echopype.convert.api.open_raw", side_effect=mock_open_raw)
+    mock_save = mocker.patch("echopype.convert.api.to_file", side_effect=mock_to_file)
+
+    report = convert_files(
+        raw_files, "EK60", save_path=out_dir, n_workers=1, manifest_path=manifest_path
+    )
+    assert report["status"].tolist() == ["converted", "failed", "converted"]
+    assert report["error"][1] == "ValueError: corrupted datagram"
+    assert report["converted_path"][0] == str(out_dir / "good1.zarr")
+    assert report["size_bytes"].tolist() == [100, 100, 100]
+    assert report.attrs["num_converted"] == 2
+    assert report.attrs["num_failed"] == 1
+    assert mock_save.call_count == 2
+
+    # Only the failed file is attempted again when resuming
+    report = convert_files(
+        raw_files, "EK60", save_path=out_dir, n_workers=1, manifest_path=manifest_path
+    )
+    assert report["status"].tolist() == ["resumed", "failed", "resumed"]
+    assert mock_save.call_count == 2
+
+    # Existing converted files are skipped without a manifest
+    report = convert_files(raw_files, "EK60", save_path=out_dir, n_workers=1)
+    assert report["status"].tolist() == ["skipped", "failed", "skipped"]
+    assert mock_save.call_count == 2
+
+
+@pytest.mark.unit
+def test_convert_files_process_pool_failures(tmp_path):
+    """Check that failures in worker processes are reported instead of raised."""
+    raw_files = [tmp_path / "missing1.raw", tmp_path / "missing2.raw"]
+
+    report = convert_files(raw_files, "EK60", save_path=tmp_path, n_workers=2)
+
+    assert report["raw_file"].tolist() == [str(raw_file) for raw_file in raw_files]
+    assert (report["status"] == "failed").all()
+    assert report["error"].str.startswith("FileNotFoundError").all()
+    assert report.attrs["num_converted"] == 0
+
+
+@pytest.mark.unit
+def test_convert_files_interrupted_write(tmp_path, mocker):
+    """Check that a converted file left half-written is converted again, not skipped."""
+    raw_file = tmp_path / "good.raw"
+    raw_file.write_bytes(b"0" * 100)
+    out_dir = tmp_path / "converted"
+    interrupted = [True]
+
+    def mock_to_file(echodata, engine, save_path, **kwargs):
+        os.makedirs(save_path)
+        if interrupted[0]:
+            raise KeyboardInterrupt
+
+    mocker.patch("echopype.convert.api.open_raw", return_value=None)
+    mocker.patch("echopype.convert.api.to_file", side_effect=mock_to_file)
+
+    with pytest.raises(KeyboardInterrupt):
+        convert_files([raw_file], "EK60", save_path=out_dir, n_workers=1)
+    assert not (out_dir / "good.zarr").exists()
+
+    interrupted[0] = False
+    report = convert_files([raw_file, str(raw_file)], "EK60", save_path=out_dir, n_workers=1)
+    # Duplicated raw files are converted once
+    assert report["status"].tolist() == ["converted"]
+    assert (out_dir / "good.zarr").exists()
+    assert not (out_dir / "good.partial.zarr").exists()
+
+
+@pytest.mark.unit
+def test_convert_files_broken_pool(tmp_path):
+    """Check that errors of the pool itself are recorded per file instead of raised."""
+    from concurrent.futures import Future
+    from concurrent.futures.process import BrokenProcessPool
+
+    class BrokenExecutor:
+        def submit(self, fn, *args, **kwargs):
+            future = Future()
+            future.set_exception(BrokenProcessPool("worker killed"))
+            return future
+
+    raw_files = [tmp_path / "a.raw", tmp_path / "b.raw"]
+    report = convert_files(raw_files, "EK60", save_path=tmp_path, executor=BrokenExecutor())
+
+    assert report["raw_file"].tolist() == [str(raw_file) for raw_file in raw_files]
+    assert (report["status"] == "failed").all()
+    assert (report["error"] == "BrokenProcessPool: worker killed").all()
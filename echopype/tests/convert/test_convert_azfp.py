@@ -263,3 +263,50 @@ def test_load_parse_azfp_xml(azfp_path):
     assert parseAZFP.parameters['pulse_len_phase2'] == [0, 0, 0, 0]
     assert parseAZFP.parameters['range_samples_phase1'] == [8273, 8273, 8273, 8273]
     assert parseAZFP.parameters['range_samples_phase2'] == [2750, 2750, 2750, 2750]
+
+
+@pytest.mark.unit
+def test_parse_azfp_ping_records():
+    """Check bulk unpacking of averaged and raw counts from synthetic ping records."""
+    from echopype.convert.parse_azfp import HEADER_DTYPE
+
+    num_bins = [3, 2]
+    header = np.zeros((), dtype=HEADER_DTYPE)
+    header["profile_flag"] = ParseAZFP.FILE_TYPE
+    header["num_chan"] = 2
+    header["num_bins"][:2] = num_bins
+    header["range_samples_per_bin"][:2] = 1
+    header["data_type"][:2] = [1, 0]  # averaged counts, then raw counts
+
+    rng = np.random.default_rng(0)
+    linear_sums = rng.integers(1, 2**32, size=(2, num_bins[0]), dtype=np.uint32)
+    overflows = rng.integers(0, 3, size=(2, num_bins[0]), dtype=np.uint8)
+    raw_counts = rng.integers(0, 2**16, size=(2, num_bins[1]), dtype=np.uint16)
+    raw = b"".join(
+        header.tobytes()
+        + linear_sums[p].astype(">u4").tobytes()
+        + overflows[p].tobytes()
+        + raw_counts[p].astype(">u2").tobytes()
+        for p in range(2)
+    )
+    raw = np.frombuffer(raw, dtype=np.uint8)
+
+    parser = ParseAZFP(None, None)
+    parser.parameters["num_freq"] = 2
+    parser.parameters["DS"] = [1.0, 1.0]
+    ping_offsets = parser._find_ping_offsets(raw)
+    assert list(ping_offsets) == [0, raw.size // 2]
+
+    headers = parser._read_blocks(raw, ping_offsets, ParseAZFP.HEADER_SIZE, HEADER_DTYPE)[:, 0]
+    parser._add_counts(raw, ping_offsets, headers)
+    expected_avg = (
+        np.log10(linear_sums.astype(np.int64) + overflows.astype(np.int64) * 4294967295) - 2.5
+    ) * (8 * 65535)
+    np.testing.assert_allclose(parser.unpacked_data["counts"][0], expected_avg)
+    np.testing.assert_array_equal(parser.unpacked_data["counts"][1], raw_counts)
+
+    # Ping records with different layouts are not unpacked together
+    headers = headers.copy()
+    headers["num_bins"][1, 1] = num_bins[1] + 1
+    with pytest.raises(ValueError, match="num_bins"):
+        parser._add_counts(raw, ping_offsets, headers)
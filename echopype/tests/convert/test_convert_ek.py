@@ -1,9 +1,11 @@
 # Test conversion functionality that is the same for both EK60 and EK80.
+from pathlib import Path
+
 import pytest
 import numpy as np
 
-from echopype import open_raw
-from echopype.convert.utils.ek_raw_io import RawSimradFile, SimradEOF
+from echopype import IncrementalConverter, open_converted, open_raw
+from echopype.convert.utils.ek_raw_io import RawSimradFile, RawSimradMmapFile, SimradEOF
 from echopype.convert.parse_base import ParseEK
 
 
@@ -154,6 +156,302 @@ def test_convert_ek_with_idx_file(file, sonar_model):
     )
 
 
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    "file",
+    [
+        "echopype/test_data/ek60/idx_bot/Summer2017-D20170620-T011027.raw",
+        "echopype/test_data/ek80/idx_bot/Hake-D20230711-T181910.raw",
+    ]
+)
+def test_raw_simrad_mmap_file(file):
+    """Check that the memory-mapped reader parses the same datagrams as the buffered reader."""
+    with RawSimradFile(file) as fid, RawSimradMmapFile(file) as fid_mmap:
+        while True:
+            try:
+                dgram = fid.read(1)
+            except SimradEOF:
+                with pytest.raises(SimradEOF):
+                    fid_mmap.read(1)
+                break
+            dgram_mmap = fid_mmap.read(1)
+
+            # Configuration datagrams hold arrays nested in dictionaries
+            np.testing.assert_equal(dgram_mmap, dgram)
+        assert fid.tell() == fid_mmap.tell()
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    "file",
+    [
+        "echopype/test_data/ek60/idx_bot/Summer2017-D20170620-T011027.raw",
+        "echopype/test_data/ek80/idx_bot/Hake-D20230711-T181910.raw",
+    ]
+)
+def test_build_dgram_index(file):
+    """Check that the datagram index locates the datagrams read sequentially."""
+    with RawSimradFile(file) as fid:
+        dgram_index = fid.build_dgram_index()
+        dgrams = []
+        while True:
+            try:
+                dgrams.append(fid.read(1))
+            except SimradEOF:
+                break
+
+        assert len(dgram_index) == len(dgrams)
+        assert [dgram["type"] for dgram in dgrams] == list(dgram_index["type"])
+        for dgram, dgram_entry in zip(dgrams, dgram_index):
+            assert np.datetime64(dgram["timestamp"].replace(tzinfo=None), "[ns]") == (
+                dgram_entry["timestamp"]
+            )
+            if dgram["type"] == "RAW0":
+                assert str(dgram["channel"]) == dgram_entry["channel"]
+            elif dgram["type"] in ["RAW3", "RAW4", "FIL1"]:
+                assert dgram["channel_id"] == dgram_entry["channel"]
+
+        # read a datagram from the index, with and without its samples
+        raw_offset = dgram_index["offset"][np.char.startswith(dgram_index["type"], "RAW")][-1]
+        dgram = fid.read_at(raw_offset)
+        dgram_header = fid.read_at(raw_offset, header_only=True)
+        assert "power" in dgram and "power" not in dgram_header
+        assert dgram_header.items() <= dgram.items()
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    "file, sonar_model",
+    [
+        ("echopype/test_data/ek60/idx_bot/Summer2017-D20170620-T011027.raw", "EK60"),
+        ("echopype/test_data/ek80/idx_bot/Hake-D20230711-T181910.raw", "EK80"),
+    ]
+)
+def test_convert_ek_include(file, sonar_model, tmp_path):
+    """Check that groups set from selectively decoded datagrams match those from a full parse."""
+    ed = open_raw(file, sonar_model=sonar_model)
+    ed_include = open_raw(file, sonar_model=sonar_model, include=["Environment", "Platform"])
+
+    assert ed_include["Sonar"] is None
+    assert ed_include["Vendor_specific"] is None
+    for group in ["Environment", "Platform"]:
+        assert ed_include[group].identical(ed[group])
+
+    # Groups left out are not saved
+    ed_include.to_zarr(tmp_path / "include.zarr")
+    ed_saved = open_converted(tmp_path / "include.zarr")
+    assert ed_saved["Sonar"] is None
+    assert ed_saved["Vendor_specific"] is None
+    for group in ["Environment", "Platform"]:
+        assert ed_saved[group] is not None
+
+
+@pytest.mark.unit
+def test_convert_ek_include_invalid_group():
+    with pytest.raises(ValueError):
+        open_raw("some_file.raw", sonar_model="EK60", include=["Beam_group1"])
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("output_format", ["zarr", "nc"])
+def test_convert_ek_native_dtypes_round_trip(output_format, tmp_path):
+    """Check that the samples of a converted file are read back with the dtypes of open_raw."""
+    ed = open_raw(
+        "echopype/test_data/ek60/ncei-wcsd/Summer2017-D20170620-T011027.raw", sonar_model="EK60"
+    )
+    converted_path = tmp_path / f"converted.{output_format}"
+    if output_format == "zarr":
+        ed.to_zarr(converted_path)
+    else:
+        ed.to_netcdf(converted_path)
+    ed_converted = open_converted(converted_path)
+
+    for var in ["backscatter_r", "angle_athwartship", "angle_alongship"]:
+        da = ed["Sonar/Beam_group1"][var]
+        da_converted = ed_converted["Sonar/Beam_group1"][var]
+        assert da.dtype == np.float32
+        assert da_converted.dtype == da.dtype
+        np.testing.assert_array_equal(da_converted.values, da.values)
+
+
+@pytest.mark.integration
+def test_convert_ek_memory_plan(mocker):
+    """Check that the swap plan of use_swap="auto" is surfaced on the returned EchoData."""
+    file = "echopype/test_data/ek60/ncei-wcsd/Summer2017-D20170620-T011027.raw"
+    assert open_raw(file, sonar_model="EK60").memory_plan is None
+
+    # No memory available: all samples are swapped to disk
+    mocker.patch(
+        "echopype.convert.utils.ek_swap.get_memory_info", return_value=(10**9, 0)
+    )
+    ed = open_raw(file, sonar_model="EK60", use_swap="auto")
+    plan = ed.memory_plan
+    assert len(plan["variables"]) > 0
+    assert all(var_plan["use_swap"] for var_plan in plan["variables"].values())
+    assert {data_type for _, data_type, _ in plan["variables"]} == {"power", "angle"}
+    assert plan["actual_peak_rss"] > 0
+    ed.cleanup_swap_files()
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    "file, sonar_model",
+    [
+        ("echopype/test_data/ek60/idx_bot/Summer2017-D20170620-T011027.raw", "EK60"),
+        ("echopype/test_data/ek80/idx_bot/Hake-D20230711-T181910.raw", "EK80"),
+    ]
+)
+def test_convert_ek_time_range_channels(file, sonar_model):
+    """Check that converting a time range and channels subset matches subsetting a full parse."""
+    ed = open_raw(file, sonar_model=sonar_model)
+    ping_time = ed["Sonar/Beam_group1"]["ping_time"].values
+    time_range = (ping_time[len(ping_time) // 4], ping_time[len(ping_time) // 2])
+    channels = list(ed["Sonar/Beam_group1"]["channel"].values[-1:])
+
+    ed_subset = open_raw(file, sonar_model=sonar_model, time_range=time_range, channels=channels)
+
+    beam_subset = ed_subset["Sonar/Beam_group1"]
+    assert list(beam_subset["channel"].values) == channels
+    assert beam_subset["ping_time"].min() >= time_range[0]
+    assert beam_subset["ping_time"].max() <= time_range[1]
+    # pings of the subset may be padded to fewer range samples than those of the full file
+    beam_expected = ed["Sonar/Beam_group1"].sel(
+        channel=channels,
+        ping_time=slice(*time_range),
+        range_sample=beam_subset["range_sample"],
+    )
+    np.testing.assert_array_equal(
+        beam_subset["backscatter_r"].values, beam_expected["backscatter_r"].values
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    "file, sonar_model",
+    [
+        ("echopype/test_data/ek60/idx_bot/Summer2017-D20170620-T011027.raw", "EK60"),
+        ("echopype/test_data/ek80/idx_bot/Hake-D20230711-T181910.raw", "EK80"),
+    ]
+)
+def test_convert_ek_n_workers(file, sonar_model):
+    """Check that parsing byte ranges of the file in worker processes matches a serial parse."""
+    ed = open_raw(file, sonar_model=sonar_model)
+    ed_parallel = open_raw(file, sonar_model=sonar_model, n_workers=2)
+
+    for group in ["Environment", "Platform", "Platform/NMEA", "Sonar/Beam_group1", "Vendor_specific"]:
+        assert ed_parallel[group].identical(ed[group])
+
+
+@pytest.mark.unit
+def test_convert_n_workers_unsupported():
+    with pytest.raises(ValueError):
+        open_raw("some_file.01A", sonar_model="AZFP", n_workers=2)
+    with pytest.raises(ValueError):
+        open_raw("some_file.raw", sonar_model="EK60", n_workers=2, ping_block_size=100)
+
+
+@pytest.mark.unit
+def test_split_dgram_index():
+    """Check that the datagram index is split into consecutive ranges of similar byte sizes."""
+    dgram_index = np.zeros(10, dtype=[("offset", "int64"), ("size", "int32")])
+    dgram_index["size"] = [10, 10, 100, 10, 10, 10, 10, 10, 10, 10]
+    dgram_index["offset"] = np.cumsum(dgram_index["size"] + 8) - dgram_index["size"] - 8
+
+    ranges = ParseEK._split_dgram_index(dgram_index, 4)
+    np.testing.assert_array_equal(np.concatenate(ranges), dgram_index)
+    assert [len(dgram_range) for dgram_range in ranges] == [2, 3, 5]
+    assert ParseEK._split_dgram_index(dgram_index[:0], 4) == []
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    ("file", "sonar_model"),
+    [
+        ("echopype/test_data/ek60/idx_bot/Summer2017-D20170620-T011027.raw", "EK60"),
+        ("echopype/test_data/ek80/idx_bot/Hake-D20230711-T181910.raw", "EK80"),
+    ]
+)
+def test_incremental_converter(file, sonar_model, tmp_path):
+    """Check that converting a file as it is written matches converting the whole file."""
+    with open(file, "rb") as f:
+        raw_bytes = f.read()
+    raw_file = tmp_path / Path(file).name
+    # The raw file exists as soon as the echosounder starts writing it
+    raw_file.touch()
+    converter = IncrementalConverter(raw_file, sonar_model, tmp_path / "incremental.zarr")
+
+    # Cut the file in the middle of datagrams, as when it is still being written
+    num_pings = 0
+    for end in np.linspace(0, len(raw_bytes), 4).astype(int)[1:]:
+        raw_file.write_bytes(raw_bytes[:end])
+        num_pings += converter.update()
+    # The last ping is held back until the file is completely written
+    assert converter.offset < len(raw_bytes)
+    num_pings += converter.update(final=True)
+    assert converter.offset == len(raw_bytes)
+    assert converter.update(final=True) == 0
+
+    ed = open_raw(file, sonar_model=sonar_model)
+    ed_incremental = open_converted(tmp_path / "incremental.zarr")
+    ds_beam = ed["Sonar/Beam_group1"]
+    ds_beam_incremental = ed_incremental["Sonar/Beam_group1"]
+    assert num_pings > 0
+    np.testing.assert_array_equal(ds_beam_incremental["ping_time"], ds_beam["ping_time"])
+    np.testing.assert_allclose(
+        ds_beam_incremental["backscatter_r"].values, ds_beam["backscatter_r"].values
+    )
+    np.testing.assert_array_equal(
+        ed_incremental["Platform"]["time1"], ed["Platform"]["time1"]
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    ("file", "sonar_model"),
+    [
+        ("echopype/test_data/ek60/idx_bot/Summer2017-D20170620-T011027.raw", "EK60"),
+        ("echopype/test_data/ek80/idx_bot/Hake-D20230711-T181910.raw", "EK80"),
+    ]
+)
+def test_incremental_converter_partial_ping(file, sonar_model, tmp_path):
+    """Check that a ping cut between its channels is converted once, with all its channels."""
+    with open(file, "rb") as f:
+        raw_bytes = f.read()
+    with RawSimradFile(file) as fid:
+        dgram_index = fid.build_dgram_index()
+    is_raw = np.char.startswith(dgram_index["type"], "RAW")
+    ping_times, num_dgrams = np.unique(dgram_index["timestamp"][is_raw], return_counts=True)
+    # Cut after the first RAW datagram of a ping with several channels
+    ping_times = ping_times[num_dgrams > 1]
+    ping_time = ping_times[len(ping_times) // 2]
+    cut_dgram = np.flatnonzero(is_raw & (dgram_index["timestamp"] == ping_time))[0]
+    cut = int(dgram_index["offset"][cut_dgram] + dgram_index["size"][cut_dgram] + 8)
+
+    raw_file = tmp_path / Path(file).name
+    raw_file.write_bytes(raw_bytes[:cut])
+    converter = IncrementalConverter(raw_file, sonar_model, tmp_path / "incremental.zarr")
+    converter.update()
+    assert converter.offset <= dgram_index["offset"][cut_dgram]
+    raw_file.write_bytes(raw_bytes)
+    converter.update(final=True)
+
+    ed = open_raw(file, sonar_model=sonar_model)
+    ds_beam_incremental = open_converted(tmp_path / "incremental.zarr")["Sonar/Beam_group1"]
+    ping_time_incremental = ds_beam_incremental["ping_time"].values
+    assert np.unique(ping_time_incremental).size == ping_time_incremental.size
+    np.testing.assert_array_equal(ping_time_incremental, ed["Sonar/Beam_group1"]["ping_time"])
+    np.testing.assert_allclose(
+        ds_beam_incremental["backscatter_r"].values,
+        ed["Sonar/Beam_group1"]["backscatter_r"].values,
+    )
+
+
+@pytest.mark.unit
+def test_convert_time_range_unsupported_model():
+    with pytest.raises(ValueError):
+        open_raw("some_file.01A", sonar_model="AZFP", time_range=("2020-01-01", "2020-01-02"))
+
+
 @pytest.mark.unit
 def test_pad_short_complex_pings():
     """
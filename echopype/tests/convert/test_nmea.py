@@ -0,0 +1,81 @@
+import warnings
+
+import numpy as np
+import pynmea2
+import pytest
+
+from echopype.convert.utils import nmea
+from echopype.convert.utils.nmea import decode_nmea_latlon
+
+
+def _with_checksum(body):
+    return f"${body}*{pynmea2.NMEASentence.checksum(body):02X}"
+
+
+NMEA_STRINGS = [
+    _with_checksum("GPGGA,154807.00,4730.1234,N,12218.5678,W,1,08,0.9,545.4,M,46.9,M,,"),
+    _with_checksum("GPGLL,4916.45,N,12311.12,W,225444,A"),
+    _with_checksum("INRMC,123519,A,4807.038,S,01131.000,E,022.4,084.4,230394,003.1,W"),
+    _with_checksum("GPVTG,054.7,T,034.4,M,005.5,N,010.2,K"),
+    "$GPGLL,4916.45,N,12311.12,W,225444,A",  # no checksum
+    "$GPGLL,4916.45,N,12311.12,W,225444,A*00",  # wrong checksum
+    _with_checksum("GPGGA,154807.00,,,,,0,00,,,M,,M,,"),  # no fix
+    _with_checksum("GPGLL,0,N,0,E"),
+    _with_checksum("GPGLL,4916.45,X,12311.12,W"),  # unknown direction
+    _with_checksum("GPGLL,49a6.45,N,12311.12,W"),  # malformed latitude
+    _with_checksum("GPGLL,4916.45,N,12311.12,W") + "\r\n",
+    _with_checksum("gpGLL,4916.45,N,12311.12,W").lower().replace("gll", "GLL"),
+    "$PXGGA,4916.45,N,12311.12,W",  # proprietary sentence
+    "$GP�GGA,4916.45,N,12311.12,W",
+    "$GPRMC,123519,A,4807.0",  # truncated
+    "$GPGGA",
+]
+
+
+def _decode_pynmea2(nmea_strings):
+    """Decode all sentences of the selected types with pynmea2."""
+    idx = np.flatnonzero(np.isin([s[3:6] for s in nmea_strings], ["GGA", "GLL", "RMC"]))
+    msg_type, lat, lon = [], [], []
+    for i in idx:
+        try:
+            msg = pynmea2.parse(nmea_strings[i])
+        except (pynmea2.ChecksumError, pynmea2.SentenceTypeError, pynmea2.ParseError):
+            msg = None
+        msg_type.append(getattr(msg, "sentence_type", np.nan))
+        for coords, name in [(lat, "latitude"), (lon, "longitude")]:
+            try:
+                coords.append(getattr(msg, name) if hasattr(msg, name) else np.nan)
+            except ValueError:
+                coords.append(np.nan)
+    return idx, msg_type, np.array(lat), np.array(lon)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("block_size", [3, 100_000])
+def test_decode_nmea_latlon(block_size, monkeypatch):
+    """Check that the vectorized decoding matches decoding each sentence with pynmea2."""
+    monkeypatch.setattr(nmea, "NMEA_BLOCK_SIZE", block_size)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        idx, msg_type, lat, lon = decode_nmea_latlon(NMEA_STRINGS, ["GGA", "GLL", "RMC"])
+    expected_idx, expected_msg_type, expected_lat, expected_lon = _decode_pynmea2(NMEA_STRINGS)
+
+    np.testing.assert_array_equal(idx, expected_idx)
+    assert [str(t) for t in msg_type] == [str(t) for t in expected_msg_type]
+    np.testing.assert_array_equal(lat, expected_lat)
+    np.testing.assert_array_equal(lon, expected_lon)
+
+
+@pytest.mark.unit
+def test_decode_nmea_latlon_malformed_warns():
+    with pytest.warns(UserWarning, match="latitude"):
+        _, _, lat, lon = decode_nmea_latlon(
+            [_with_checksum("GPGLL,49a6.45,N,12311.12,W")], ["GLL"]
+        )
+    assert np.isnan(lat[0]) and lon[0] == pytest.approx(-123.18533333)
+
+
+@pytest.mark.unit
+def test_decode_nmea_latlon_empty():
+    idx, msg_type, lat, lon = decode_nmea_latlon([], ["GGA", "GLL", "RMC"])
+    assert idx.size == 0 and msg_type == [] and lat.size == 0 and lon.size == 0
@@ -83,14 +83,10 @@ class TestParseEK:
         fixture_param, orig_data_dict = data_fixture
         parser = self._get_parser(sonar_model, orig_data_dict)
 
-        # Patch use swap to either True or False
+        # Set use swap to either True or False
         # based on the test fixture parameterization
-        mocker.patch(
-            "echopype.convert.parse_base.ParseEK._ParseEK__should_use_swap", return_value=use_swap
-        )
-
         parser.rectangularize_data(
-            use_swap="auto",
+            use_swap=use_swap,
             max_chunk_size="100MB",
         )
         return parser, orig_data_dict, fixture_param, mocker
@@ -216,6 +212,142 @@ class TestParseEK:
                         orig_arr = complex_keys[complex_part](orig_arr)
                         assert np.array_equal(darr, orig_arr)
 
+    @pytest.mark.parametrize("use_swap", [True, False])
+    @pytest.mark.parametrize("data_type", ["power", "angle"])
+    def test_rectangularize_data_native_dtypes(
+        self, use_swap, data_type, mock_ping_data_dict_power_angle
+    ):
+        _, orig_data_dict = mock_ping_data_dict_power_angle
+        parser_float = self._get_parser("EK60", orig_data_dict)
+        parser_float.rectangularize_data(use_swap=False)
+        parser_native = self._get_parser("EK60", orig_data_dict)
+        parser_native.rectangularize_data(use_swap=use_swap, native_dtypes=True)
+
+        assert parser_native.sample_encodings["power"]["dtype"] == "int16"
+        assert parser_native.sample_encodings["angle"]["dtype"] == "int16"
+        for ch, arr in parser_native.ping_data_dict[data_type].items():
+            expected = parser_float.ping_data_dict[data_type][ch]
+            if expected is None:
+                assert arr is None
+                continue
+
+            # Samples are decoded lazily to float32 with NaN-padded shorter pings
+            assert isinstance(arr, dask.array.Array)
+            assert arr.dtype == np.float32
+            arr = arr.compute()
+            if use_swap:
+                # Swapped arrays are expanded to the ping time of the channel
+                assert np.isnan(arr[expected.shape[0] :]).all()
+                arr = arr[: expected.shape[0], : expected.shape[1]]
+            assert arr.shape == expected.shape
+            assert np.allclose(arr, expected, equal_nan=True)
+
+    @pytest.mark.parametrize("data_type", ["power", "angle"])
+    def test_rectangularize_data_streamed(self, data_type, mock_ping_data_dict_power_angle):
+        _, orig_data_dict = mock_ping_data_dict_power_angle
+        parser_float = self._get_parser("EK60", orig_data_dict)
+        parser_float.rectangularize_data(use_swap=False)
+
+        # Feed the pings one by one as parse_raw does, with blocks smaller than the data
+        parser_stream = ParseEK(
+            file=self.file,
+            bot_file="",
+            idx_file="",
+            storage_options=self.storage_options,
+            sonar_model="EK60",
+        )
+        parser_stream.stream_samples(ping_block_size=7)
+        for ch in orig_data_dict["power"].keys():
+            for power, angle in zip(orig_data_dict["power"][ch], orig_data_dict["angle"][ch]):
+                parser_stream._append_channel_ping_data(
+                    {"channel": ch, "power": power, "angle": angle}
+                )
+        parser_stream.rectangularize_data()
+
+        assert parser_stream.ch_ids == parser_float.ch_ids
+        for ch, arr in parser_stream.ping_data_dict[data_type].items():
+            expected = parser_float.ping_data_dict[data_type][ch]
+            if expected is None:
+                assert arr is None
+                continue
+            assert isinstance(arr, dask.array.Array)
+            assert np.allclose(arr.compute(), expected, equal_nan=True)
+
+    @pytest.mark.parametrize("rectangularize", ["memory", "swap", "streamed"])
+    def test_rectangularize_data_native_boundary_values(self, rectangularize):
+        """The smallest native power and angle values are samples, not padding."""
+        from echopype.testing import _gen_ping_data_dict_power_angle
+
+        orig_data_dict = _gen_ping_data_dict_power_angle(
+            ch_range_sample_len=[[10, 20], [20], [20, 10]],
+            ch_range_sample_ping_time_len=[[3, 2], [5], [2, 3]],
+        )
+        for ch in orig_data_dict["power"].keys():
+            for power, angle in zip(orig_data_dict["power"][ch], orig_data_dict["angle"][ch]):
+                power[-1] = np.iinfo(np.int16).min
+                angle[-1] = np.iinfo(np.int8).min
+
+        if rectangularize == "streamed":
+            parser = ParseEK(
+                file=self.file,
+                bot_file="",
+                idx_file="",
+                storage_options=self.storage_options,
+                sonar_model="EK60",
+            )
+            parser.stream_samples(ping_block_size=2, native_dtypes=True)
+            for ch in orig_data_dict["power"].keys():
+                for power, angle in zip(orig_data_dict["power"][ch], orig_data_dict["angle"][ch]):
+                    parser._append_channel_ping_data(
+                        {"channel": ch, "power": power, "angle": angle}
+                    )
+            parser.rectangularize_data()
+        else:
+            parser = self._get_parser("EK60", orig_data_dict)
+            parser.rectangularize_data(use_swap=rectangularize == "swap", native_dtypes=True)
+
+        assert parser.sample_encodings["power"]["dtype"] == "int16"
+        assert parser.sample_encodings["angle"]["dtype"] == "int16"
+        for ch in orig_data_dict["power"].keys():
+            power = parser.ping_data_dict["power"][ch].compute()
+            angle = parser.ping_data_dict["angle"][ch].compute()
+            for i, ping_power in enumerate(orig_data_dict["power"][ch]):
+                count = len(ping_power)
+                assert power[i, count - 1] == np.float32(np.iinfo(np.int16).min * INDEX2POWER)
+                assert (angle[i, count - 1] == np.iinfo(np.int8).min).all()
+                # Only the samples after the last one of the ping are padding
+                assert np.isnan(power[i, count:]).all()
+                assert not np.isnan(power[i, :count]).any()
+                assert np.isnan(angle[i, count:]).all()
+
+    def test_rectangularize_data_auto_swap(self, mocker, mock_ping_data_dict_power_angle_simple):
+        parser = self._get_parser("EK60", mock_ping_data_dict_power_angle_simple)
+        expanded_sizes = parser._get_expanded_sizes()
+        # 20 pings of 100 float32 power samples and 100x2 float64 angle samples per channel
+        assert expanded_sizes[("receive", "power", 1)] == 20 * 100 * 4
+        assert expanded_sizes[("receive", "angle", 1)] == 20 * 100 * 2 * 8
+
+        # Leave room for all power samples and the angle samples of one channel
+        total = 10**6
+        budget = 3 * 20 * 100 * 4 + 20 * 100 * 2 * 8
+        mocker.patch(
+            "echopype.convert.utils.ek_swap.get_memory_info",
+            return_value=(total, budget + int(total * 0.6)),
+        )
+        parser.rectangularize_data(use_swap="auto")
+
+        plan = parser.memory_plan["variables"]
+        assert [var for var, var_plan in plan.items() if var_plan["use_swap"]] == [
+            ("receive", "angle", 2),
+            ("receive", "angle", 3),
+        ]
+        assert parser.memory_plan["actual_peak_rss"] > 0
+        for ch, arr in parser.ping_data_dict["power"].items():
+            assert isinstance(arr, np.ndarray)
+        assert isinstance(parser.ping_data_dict["angle"][1], np.ndarray)
+        assert isinstance(parser.ping_data_dict["angle"][2], dask.array.Array)
+        assert isinstance(parser.ping_data_dict["angle"][3], dask.array.Array)
+
     def test__parse_and_pad_datagram_no_zarr_root(self, mock_ping_data_dict_power_angle_simple):
         sonar_model = "EK60"
         parser = self._get_parser(sonar_model, mock_ping_data_dict_power_angle_simple)
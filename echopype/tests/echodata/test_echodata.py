@@ -230,6 +230,71 @@ class TestEchoData:
         ed = self.create_ed(converted_zarr)
         assert ed.group_paths == self.expected_groups
 
+    @pytest.mark.parametrize(
+        "converted_file",
+        ["Summer2017-D20170615-T190214__NEW.zarr", "Summer2017-D20170615-T190214__NEW.nc"],
+    )
+    def test_from_file_lazy(self, converted_file, test_path):
+        converted_path = test_path["EK60"] / "ncei-wcsd" / converted_file
+        ed = EchoData.from_file(converted_path)
+        ed_lazy = EchoData.from_file(converted_path, lazy=True)
+
+        assert ed_lazy.sonar_model == "EK60"
+        assert ed_lazy.group_paths == self.expected_groups
+        assert ed_lazy._lazy_groups == {f"/{g}" for g in self.expected_groups[1:]}
+        assert ed_lazy["Sonar/Beam_group1"].identical(ed["Sonar/Beam_group1"])
+        assert "/Sonar/Beam_group1" not in ed_lazy._lazy_groups
+        assert "/Vendor_specific" in ed_lazy._lazy_groups
+        for group in self.expected_groups:
+            assert ed_lazy[group].identical(ed[group])
+        assert len(ed_lazy._lazy_groups) == 0
+
+    def test_from_file_groups(self, converted_zarr):
+        ed = EchoData.from_file(converted_zarr)
+        ed_groups = EchoData.from_file(converted_zarr, groups=["Sonar/Beam_group1"])
+
+        assert ed_groups.sonar_model == "EK60"
+        assert ed_groups.group_paths == ("Top-level", "Sonar", "Sonar/Beam_group1")
+        assert ed_groups["Sonar/Beam_group1"].identical(ed["Sonar/Beam_group1"])
+        # Parent groups are only created along the path
+        assert ed_groups["Sonar"] is None
+        assert ed_groups["Vendor_specific"] is None
+
+        with pytest.raises(ValueError, match="not found"):
+            EchoData.from_file(converted_zarr, groups=["Sonar/Beam_group9"])
+
+    def test_from_file_lazy_values(self, tmp_path):
+        """
+        Tests that groups opened lazily or selectively from a consolidated zarr store
+        hold the values written, and not the fill values.
+        """
+        ed = get_mock_echodata()
+        ed["Sonar/Beam_group1"] = ed["Sonar/Beam_group1"].assign_coords(
+            channel=["ch_0", "ch_1"],
+            ping_time=np.arange("2018-07-01", 5, dtype="datetime64[s]").astype("datetime64[ns]"),
+            range_sample=np.arange(10),
+        ).assign(
+            backscatter_r=(
+                ["channel", "ping_time", "range_sample"],
+                np.arange(100, dtype=np.float32).reshape(2, 5, 10),
+            ),
+        )
+        ed.to_zarr(tmp_path / "lazy.zarr")
+
+        ed_full = EchoData.from_file(tmp_path / "lazy.zarr")
+        ed_lazy = EchoData.from_file(tmp_path / "lazy.zarr", lazy=True)
+        ed_groups = EchoData.from_file(tmp_path / "lazy.zarr", groups=["Sonar/Beam_group1"])
+        for ed_open in [ed_lazy, ed_groups]:
+            ds_beam = ed_open["Sonar/Beam_group1"]
+            assert ds_beam.identical(ed_full["Sonar/Beam_group1"])
+            assert list(ds_beam["channel"].values) == ["ch_0", "ch_1"]
+            np.testing.assert_array_equal(
+                ds_beam["ping_time"], ed["Sonar/Beam_group1"]["ping_time"]
+            )
+            np.testing.assert_array_equal(
+                ds_beam["backscatter_r"], ed["Sonar/Beam_group1"]["backscatter_r"]
+            )
+
     def test_nbytes(self, converted_zarr):
         ed = self.create_ed(converted_zarr)
         assert isinstance(ed.nbytes, float)
@@ -340,6 +405,60 @@ class TestEchoData:
         # clean up the zarr file
         shutil.rmtree(zarr_path)
 
+    def test_to_zarr_parallel(self, tmp_path):
+        """
+        Tests that writing all groups concurrently with `parallel=True` produces the same
+        zarr store as writing them sequentially.
+        """
+        ed = get_mock_echodata()
+        ed["Sonar/Beam_group1"] = ed["Sonar/Beam_group1"].assign(
+            backscatter_r=(
+                ["channel", "ping_time", "range_sample"],
+                np.random.default_rng(0).random((2, 5, 10), dtype=np.float32),
+            ),
+            channel_name=(["channel"], ["ch_0", "ch_1"]),
+        )
+        ed["Environment"] = ed["Environment"].assign(
+            sound_speed_indicative=(["time1"], np.array([1500.0, 1501.0]))
+        )
+
+        ed.to_zarr(tmp_path / "sequential.zarr")
+        ed.to_zarr(tmp_path / "parallel.zarr", parallel=True)
+
+        check_consolidated(ed, tmp_path / "parallel.zarr" / ".zmetadata")
+        ed_sequential = open_converted(tmp_path / "sequential.zarr")
+        ed_parallel = open_converted(tmp_path / "parallel.zarr")
+        for group in ed.group_paths:
+            assert ed_parallel[group].identical(ed_sequential[group])
+
+        with pytest.raises(NotImplementedError):
+            ed.to_netcdf(tmp_path / "parallel.nc", parallel=True)
+
+    def test_to_zarr_parallel_uncompressed(self, tmp_path, monkeypatch):
+        """
+        Tests that writing concurrently without compression splits the data along `ping_time`.
+        """
+        import zarr
+        from echopype.convert import api as convert_api
+
+        monkeypatch.setattr(convert_api, "PARALLEL_CHUNK_SIZE", 80)
+        ed = get_mock_echodata()
+        ed["Sonar/Beam_group1"] = ed["Sonar/Beam_group1"].assign(
+            backscatter_r=(
+                ["channel", "ping_time", "range_sample"],
+                np.random.default_rng(0).random((2, 5, 10), dtype=np.float32),
+            ),
+        )
+
+        ed.to_zarr(tmp_path / "parallel.zarr", compress=False, parallel=True)
+
+        z_arr = zarr.open_group(str(tmp_path / "parallel.zarr"))["Sonar/Beam_group1/backscatter_r"]
+        assert z_arr.chunks == (2, 1, 10)
+        ed_parallel = open_converted(tmp_path / "parallel.zarr")
+        assert ed_parallel["Sonar/Beam_group1"]["backscatter_r"].identical(
+            ed["Sonar/Beam_group1"]["backscatter_r"]
+        )
+
 
 def test_open_converted(ek60_converted_zarr, minio_bucket):  # noqa
     def _check_path(zarr_path):
@@ -0,0 +1,123 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+import echopype
+from echopype.echodata import EchoData, summary
+from echopype.echodata.catalog import build_catalog, query_catalog
+
+from utils import get_mock_echodata
+
+
+@pytest.fixture
+def converted_files(test_path):
+    return [
+        test_path["EK60"] / "ncei-wcsd" / "Summer2017-D20170615-T190214__NEW.zarr",
+        test_path["EK60"] / "ncei-wcsd" / "Summer2017-D20170615-T190214__NEW.nc",
+    ]
+
+
+def test_catalog(converted_files, tmp_path):
+    catalog_path = tmp_path / "catalog.db"
+    assert build_catalog(converted_files[:1], catalog_path) == 1
+    # Files already in the catalog are skipped
+    assert build_catalog(converted_files, catalog_path) == 1
+    assert build_catalog(converted_files, catalog_path, overwrite=True) == 2
+
+    ed = echopype.open_converted(converted_files[0])
+    ping_time = ed["Sonar/Beam_group1"]["ping_time"].values
+    frequency = ed["Sonar/Beam_group1"]["frequency_nominal"].values
+    channel = ed["Sonar/Beam_group1"]["channel"].values
+
+    df = query_catalog(catalog_path, sonar_model="EK60")
+    assert df["path"].tolist() == [str(f) for f in converted_files]
+    assert df["time_start"][0] == ping_time[0]
+    assert df["time_end"][0] == ping_time[-1]
+    assert df["channel"][0] == sorted(channel)
+    assert df["lat_min"][0] == pytest.approx(np.nanmin(ed["Platform"]["latitude"]))
+    assert df["lon_max"][0] == pytest.approx(np.nanmax(ed["Platform"]["longitude"]))
+
+    # Times are clipped to the queried range
+    df = query_catalog(catalog_path, time_range=(ping_time[10], None))
+    assert (df["time_start"] == ping_time[10]).all()
+    assert len(query_catalog(catalog_path, time_range=(None, ping_time[0] - 1))) == 0
+
+    # Only the channels of the queried frequencies are listed
+    df = query_catalog(catalog_path, frequency_nominal=frequency[0])
+    assert df["channel"][0] == [channel[0]]
+
+    lat = float(np.nanmean(ed["Platform"]["latitude"]))
+    lon = float(np.nanmean(ed["Platform"]["longitude"]))
+    assert len(query_catalog(catalog_path, bbox=(lon - 1, lat - 1, lon + 1, lat + 1))) == 2
+    assert len(query_catalog(catalog_path, bbox=(lon + 1, lat + 1, lon + 2, lat + 2))) == 0
+
+    with pytest.raises(FileNotFoundError):
+        query_catalog(tmp_path / "missing.db")
+
+
+def test_catalog_values(tmp_path):
+    """Check that the catalog rows of a zarr store hold the values written."""
+    ed = get_mock_echodata()
+    ping_time = np.arange("2018-07-01", 5, dtype="datetime64[s]").astype("datetime64[ns]")
+    ed["Sonar/Beam_group1"] = ed["Sonar/Beam_group1"].assign_coords(
+        channel=["ch_0", "ch_1"], ping_time=ping_time
+    ).assign(frequency_nominal=(["channel"], [38000.0, 120000.0]))
+    ed["Platform"] = ed["Platform"].assign_coords(
+        time1=ping_time[:3]
+    ).assign(
+        latitude=(["time1"], [44.6, 44.7, np.nan]),
+        longitude=(["time1"], [-124.1, -124.3, -124.2]),
+    )
+    ed["Provenance"] = ed["Provenance"].assign(source_filenames=(["filenames"], ["a.raw"]))
+    ed.to_zarr(tmp_path / "mock.zarr")
+
+    catalog_path = tmp_path / "catalog.db"
+    assert build_catalog([tmp_path / "mock.zarr"], catalog_path) == 1
+    with sqlite3.connect(str(catalog_path)) as conn:
+        files = conn.execute(
+            "SELECT source_filenames, time_start, time_end, lat_min, lat_max, lon_min, lon_max "
+            "FROM files"
+        ).fetchall()
+        channels = conn.execute(
+            "SELECT beam_group, channel, frequency_nominal FROM channels ORDER BY channel"
+        ).fetchall()
+    conn.close()
+
+    assert files == [
+        (
+            "a.raw",
+            int(ping_time[0].astype(np.int64)),
+            int(ping_time[-1].astype(np.int64)),
+            44.6,
+            44.7,
+            -124.3,
+            -124.1,
+        )
+    ]
+    assert channels == [
+        ("Sonar/Beam_group1", "ch_0", 38000.0),
+        ("Sonar/Beam_group1", "ch_1", 120000.0),
+    ]
+    df = query_catalog(catalog_path, bbox=(-124.2, 44.65, -124.0, 45.0), frequency_nominal=120000)
+    assert df["channel"].tolist() == [["ch_1"]]
+
+
+def test_catalog_opened_groups(mocker, tmp_path):
+    """Check that only the groups holding the catalog entry are opened."""
+    ed = get_mock_echodata()
+    ed["Sonar/Beam_group1"] = ed["Sonar/Beam_group1"].assign_coords(
+        channel=["ch_0", "ch_1"],
+        ping_time=np.arange("2018-07-01", 5, dtype="datetime64[s]").astype("datetime64[ns]"),
+    )
+    ed.to_zarr(tmp_path / "mock.zarr")
+
+    open_group = mocker.spy(EchoData, "_open_group")
+    hash_vendor = mocker.spy(summary, "_hash_vendor")
+    assert build_catalog([tmp_path / "mock.zarr"], tmp_path / "catalog.db") == 1
+
+    opened = [call.args[-1] for call in open_group.call_args_list]
+    assert sorted(opened, key=str) == sorted(
+        [None, "Provenance", "Platform", "Sonar/Beam_group1"], key=str
+    )
+    hash_vendor.assert_not_called()
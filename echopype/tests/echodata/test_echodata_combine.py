@@ -14,8 +14,10 @@ from echopype.echodata import EchoData
 from echopype.echodata.combine import (
     _create_channel_selection_dict,
     _check_channel_consistency,
+    _check_no_append_vendor_params,
     _merge_attributes
 )
+from echopype.echodata.summary import SUMMARY_ATTR, compute_summary, get_summary
 
 
 @pytest.fixture
@@ -393,6 +395,133 @@ def test_attr_storage(ek60_test_data):
             )
 
 
+def test_echodata_summary(ek60_test_data, tmp_path):
+    ed = echopype.open_raw(ek60_test_data[0], "EK60")
+    ed.to_zarr(tmp_path / "converted.zarr")
+    ed_converted = echopype.open_converted(tmp_path / "converted.zarr")
+
+    # The Vendor_specific hashes stored in the converted file are read back
+    assert SUMMARY_ATTR in ed_converted["Provenance"].attrs
+    summary = get_summary(ed_converted)
+    assert summary == compute_summary(ed)
+    assert summary["sonar_model"] == "EK60"
+    assert summary["groups"]["Sonar/Beam_group1"]["channel"] == [
+        str(ch) for ch in ed["Sonar/Beam_group1"]["channel"].values
+    ]
+    ping_time = ed["Sonar/Beam_group1"]["ping_time"].values
+    np.testing.assert_array_equal(
+        np.array(
+            summary["groups"]["Sonar/Beam_group1"]["times"]["ping_time"], dtype="datetime64[ns]"
+        ),
+        ping_time[[0, -1]],
+    )
+
+    # Vendor params are compared through their hashes
+    other_summary = compute_summary(ed)
+    _check_no_append_vendor_params([summary, other_summary], "Vendor_specific")
+    ch = summary["groups"]["Vendor_specific"]["channel"][0]
+    other_summary["vendor"]["channel"][ch] = "0"
+    with pytest.raises(RuntimeError, match="Non identical filter parameters"):
+        _check_no_append_vendor_params([summary, other_summary], "Vendor_specific")
+    other_channels = summary["groups"]["Vendor_specific"]["channel"][1:]
+    _check_no_append_vendor_params([summary, other_summary], "Vendor_specific", other_channels)
+
+    # The summaries of the combined objects are not kept in the combined object
+    ed_other = echopype.open_raw(ek60_test_data[1], "EK60")
+    combined = echopype.combine_echodata([ed_converted, ed_other])
+    assert SUMMARY_ATTR not in combined["Provenance"].attrs
+    assert SUMMARY_ATTR not in combined["Provenance"].data_vars
+
+
+def test_echodata_summary_in_place_changes(ek60_test_data, tmp_path):
+    ed = echopype.open_raw(ek60_test_data[0], "EK60")
+    ed.to_zarr(tmp_path / "converted.zarr")
+    ed_converted = echopype.open_converted(tmp_path / "converted.zarr")
+
+    # Select channels and pings of the opened object in place
+    channels = list(ed_converted["Sonar/Beam_group1"]["channel"].values[1:])
+    for group in ["Sonar/Beam_group1", "Vendor_specific"]:
+        ed_converted[group] = ed_converted[group].sel(channel=channels)
+    ed_converted["Sonar/Beam_group1"] = ed_converted["Sonar/Beam_group1"].isel(
+        ping_time=slice(2, None)
+    )
+
+    # The channels and times are not read from the summary stored in the converted file
+    summary = get_summary(ed_converted)
+    assert summary == compute_summary(ed_converted)
+    assert summary["groups"]["Sonar/Beam_group1"]["channel"] == [str(ch) for ch in channels]
+    assert summary["groups"]["Vendor_specific"]["channel"] == [str(ch) for ch in channels]
+    assert list(summary["vendor"]["channel"]) == [str(ch) for ch in channels]
+    ping_time = ed["Sonar/Beam_group1"]["ping_time"].values
+    np.testing.assert_array_equal(
+        np.array(
+            summary["groups"]["Sonar/Beam_group1"]["times"]["ping_time"], dtype="datetime64[ns]"
+        ),
+        ping_time[[2, -1]],
+    )
+
+
+def test_combine_echodata_to_zarr(ek60_test_data, tmp_path):
+    eds = [echopype.open_raw(file, "EK60") for file in ek60_test_data]
+    zarr_path = tmp_path / "combined_echodata.zarr"
+
+    combined_zarr = echopype.combine_echodata(eds, zarr_path=zarr_path)
+    combined = echopype.combine_echodata(eds)
+
+    assert str(combined_zarr.converted_raw_path) == str(zarr_path.absolute())
+    assert set(combined_zarr.group_paths) == set(combined.group_paths)
+    for group in combined.group_paths:
+        if group in ["Top-level", "Provenance"]:
+            continue
+        # Packed samples are decoded to float64 from the zarr store, and to float32 in memory
+        xr.testing.assert_allclose(combined_zarr[group], combined[group])
+    prov_vars = [
+        name for name, var in combined["Provenance"].data_vars.items()
+        if "echodata_filename" in var.dims
+    ] + ["source_filenames", "filenames", "echodata_filename"]
+    xr.testing.assert_equal(
+        combined_zarr["Provenance"][prov_vars], combined["Provenance"][prov_vars]
+    )
+
+    with pytest.raises(RuntimeError, match="already exists"):
+        echopype.combine_echodata(eds, zarr_path=zarr_path)
+
+
+def test_open_mfconverted(ek60_test_data, tmp_path):
+    converted_paths = []
+    for file in ek60_test_data:
+        ed = echopype.open_raw(file, "EK60")
+        ed.to_zarr(tmp_path / f"{Path(file).stem}.zarr")
+        converted_paths.append(tmp_path / f"{Path(file).stem}.zarr")
+
+    ed_virtual = echopype.open_mfconverted(converted_paths)
+    combined = echopype.combine_echodata(
+        [echopype.open_converted(path) for path in converted_paths]
+    )
+
+    assert ed_virtual.group_paths == combined.group_paths
+    # Data are only concatenated lazily
+    assert ed_virtual["Sonar/Beam_group1"]["backscatter_r"].chunks is not None
+    for group in ["Sonar/Beam_group1", "Platform", "Environment", "Vendor_specific"]:
+        xr.testing.assert_equal(ed_virtual[group], combined[group])
+    xr.testing.assert_equal(
+        ed_virtual["Provenance"]["source_filenames"], combined["Provenance"]["source_filenames"]
+    )
+
+    # Slicing by time and channel before loading
+    ping_time = combined["Sonar/Beam_group1"]["ping_time"].values
+    channel = combined["Sonar/Beam_group1"]["channel"].values[0]
+    sliced = ed_virtual["Sonar/Beam_group1"].sel(
+        ping_time=slice(ping_time[10], ping_time[-10]), channel=channel
+    )
+    xr.testing.assert_equal(
+        sliced.compute(),
+        combined["Sonar/Beam_group1"].sel(
+            ping_time=slice(ping_time[10], ping_time[-10]), channel=channel
+        ),
+    )
+
+
 def test_combined_encodings(ek60_test_data):
     eds = [echopype.open_raw(file, "EK60") for file in ek60_test_data]
 
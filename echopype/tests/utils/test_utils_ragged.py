@@ -0,0 +1,60 @@
+import pytest
+import numpy as np
+import xarray as xr
+
+from echopype.utils.ragged import (
+    RAGGED_COUNT_VAR,
+    RAGGED_SAMPLE_DIM,
+    from_ragged,
+    is_ragged,
+    to_ragged,
+)
+
+
+def _make_beam_group(ping_lens):
+    """Beam group with channels of different numbers of samples, padded with NaN."""
+    num_pings = ping_lens.shape[1]
+    range_sample = np.arange(ping_lens.max())
+    backscatter_r = np.full((ping_lens.shape[0], num_pings, range_sample.size), np.nan)
+    angle = np.full(backscatter_r.shape + (2,), np.nan)
+    for ch_idx, ch_lens in enumerate(ping_lens):
+        for ping_idx, ping_len in enumerate(ch_lens):
+            backscatter_r[ch_idx, ping_idx, :ping_len] = np.random.randn(ping_len)
+            angle[ch_idx, ping_idx, :ping_len] = np.random.randn(ping_len, 2)
+    return xr.Dataset(
+        {
+            "backscatter_r": (["channel", "ping_time", "range_sample"], backscatter_r),
+            "angle": (["channel", "ping_time", "range_sample", "beam"], angle),
+            "sample_interval": (["channel", "ping_time"], np.ones(ping_lens.shape)),
+        },
+        coords={
+            "channel": ["ch1", "ch2"],
+            "ping_time": np.arange(num_pings),
+            "range_sample": range_sample,
+            "beam": ["1", "2"],
+        },
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("ping_chunk_size", [1, 3, 1000])
+def test_ragged_round_trip(ping_chunk_size):
+    ping_lens = np.array([[100, 100, 80, 100, 100], [10, 12, 0, 12, 12]])
+    ds = _make_beam_group(ping_lens)
+
+    ds_ragged = to_ragged(ds)
+    assert is_ragged(ds_ragged)
+    assert not is_ragged(ds)
+    np.testing.assert_array_equal(ds_ragged[RAGGED_COUNT_VAR], ping_lens)
+    assert ds_ragged["backscatter_r"].dims == (RAGGED_SAMPLE_DIM,)
+    assert ds_ragged["angle"].dims == (RAGGED_SAMPLE_DIM, "beam")
+    assert ds_ragged.sizes[RAGGED_SAMPLE_DIM] == ping_lens.sum()
+    # Variables without samples are untouched
+    assert ds_ragged["sample_interval"].identical(ds["sample_interval"])
+
+    # Padded samples are lazily restored
+    ds_padded = from_ragged(ds_ragged, ping_chunk_size=ping_chunk_size)
+    assert ds_padded["backscatter_r"].chunks is not None
+    assert RAGGED_COUNT_VAR not in ds_padded
+    assert RAGGED_SAMPLE_DIM not in ds_padded.dims
+    xr.testing.assert_identical(ds_padded.compute(), ds)
@@ -9,10 +9,12 @@ import sys
 import tempfile
 import uuid
 from pathlib import Path, WindowsPath
-from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
 import fsspec
+import numpy as np
 import xarray as xr
+import zarr
 from dask.array import Array as DaskArray
 from fsspec import AbstractFileSystem, FSMap
 from fsspec.implementations.local import LocalFileSystem
@@ -62,6 +64,9 @@ def save_file(ds, path, mode, engine, group=None, compression_settings=None, **k
     """
     Saves a dataset to netcdf or zarr depending on the engine
     If ``compression_settings`` are set, compress all variables with those settings
+
+    Returns the output of ``to_netcdf`` or ``to_zarr``, e.g. the delayed write
+    when saving with ``compute=False``.
     """
 
     # set zarr or netcdf specific encodings for each variable in ds
@@ -69,13 +74,13 @@ def save_file(ds, path, mode, engine, group=None, compression_settings=None, **k
 
     # Allows saving both NetCDF and Zarr files from an xarray dataset
     if engine == "netcdf4":
-        ds.to_netcdf(path=path, mode=mode, group=group, encoding=encoding, **kwargs)
+        return ds.to_netcdf(path=path, mode=mode, group=group, encoding=encoding, **kwargs)
     elif engine == "zarr":
         # Ensure that encoding and chunks match
         for var, enc in encoding.items():
             if isinstance(ds[var].data, DaskArray):
                 ds[var] = ds[var].chunk(enc.get("chunks", {}))
-        ds.to_zarr(store=path, mode=mode, group=group, encoding=encoding, **kwargs)
+        return ds.to_zarr(store=path, mode=mode, group=group, encoding=encoding, **kwargs)
     else:
         raise ValueError(f"{engine} is not a supported save format")
 
@@ -511,3 +516,32 @@ def delete_zarr_store(store: "FSStore | str", fs: Optional[AbstractFileSystem] =
 
 
 # End of utilities for creating temporary swap zarr files ------------------------------
+
+
+def _match_stored_dims(ds: xr.Dataset, zarr_group: zarr.Group) -> xr.Dataset:
+    """
+    Match the channels and range samples of ``ds`` with those already stored in ``zarr_group``.
+
+    Missing channels are filled with NaN. The stored arrays are grown along ``range_sample``
+    if ``ds`` holds longer pings, otherwise ``ds`` is padded to the stored range samples.
+    """
+    if "channel" in ds.dims and "channel" in zarr_group:
+        ds = ds.reindex(channel=zarr_group["channel"][:])
+    if "range_sample" in ds.dims and "range_sample" in zarr_group:
+        stored_size = zarr_group["range_sample"].shape[0]
+        if ds.sizes["range_sample"] > stored_size:
+            _resize_dim(zarr_group, "range_sample", ds.sizes["range_sample"])
+            zarr_group["range_sample"][:] = np.arange(ds.sizes["range_sample"])
+        elif ds.sizes["range_sample"] < stored_size:
+            ds = ds.reindex(range_sample=np.arange(stored_size))
+    return ds
+
+
+def _resize_dim(zarr_group: zarr.Group, dim: str, size: int) -> None:
+    """Resize the arrays of ``zarr_group`` along ``dim``, new regions holding the fill value."""
+    for _, z_arr in zarr_group.arrays():
+        dims: List[str] = z_arr.attrs.get("_ARRAY_DIMENSIONS", [])
+        if dim in dims:
+            shape = list(z_arr.shape)
+            shape[dims.index(dim)] = size
+            z_arr.resize(tuple(shape))
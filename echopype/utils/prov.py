@@ -151,7 +151,8 @@ def source_files_vars(
 def _check_valid_latlon(ds):
     """Verify that the dataset contains valid latitude and longitude variables"""
     if (
-        "longitude" in ds
+        ds is not None
+        and "longitude" in ds
         and not ds["longitude"].isnull().all()
         and "latitude" in ds
         and not ds["latitude"].isnull().all()
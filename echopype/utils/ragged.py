@@ -0,0 +1,191 @@
+from typing import List
+
+import dask
+import dask.array as da
+import numpy as np
+import xarray as xr
+
+# Dimension of the flat sample buffers of ragged beam groups
+RAGGED_SAMPLE_DIM = "sample"
+# Variable holding the number of samples of each channel and ping of ragged beam groups
+RAGGED_COUNT_VAR = "sample_count"
+# Number of pings in each chunk of the lazily padded variables
+DEFAULT_PING_CHUNK_SIZE = 1000
+
+# Encoding keys tied to the shape of the padded variables
+_SHAPE_ENCODINGS = ["chunks", "preferred_chunks", "chunksizes", "contiguous"]
+
+
+def is_ragged(ds: xr.Dataset) -> bool:
+    """Check if the samples of a beam group are stored as ragged arrays."""
+    return RAGGED_COUNT_VAR in ds.data_vars
+
+
+def _get_sample_vars(ds: xr.Dataset, sample_dim: str) -> List[str]:
+    """Get the names of the per-channel, per-ping sample variables along ``sample_dim``."""
+    return [
+        name
+        for name, var in ds.data_vars.items()
+        if {"channel", "ping_time", sample_dim}.issubset(var.dims)
+    ]
+
+
+def to_ragged(ds: xr.Dataset, sample_dim: str = "range_sample") -> xr.Dataset:
+    """
+    Store the samples of a beam group as contiguous ragged arrays.
+
+    Following the CF contiguous ragged array representation, the padded samples
+    of each variable along ``sample_dim`` are replaced by a flat buffer along the
+    ``sample`` dimension, holding the samples of each channel and ping one after the other,
+    and the ``sample_count`` variable holds the number of samples
+    of each channel and ping. Only the samples up to the last non-NaN sample
+    of each ping are kept, so the padding of channels and pings
+    shorter than the longest ping of the beam group is not stored.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        Beam group with padded samples.
+    sample_dim : str, default "range_sample"
+        Dimension along which the samples are padded.
+
+    Returns
+    -------
+    xr.Dataset
+        Beam group with ragged samples.
+        The ``sample_dim`` coordinate is kept to restore the padded shape.
+    """
+    sample_vars = _get_sample_vars(ds, sample_dim)
+    if len(sample_vars) == 0 or is_ragged(ds):
+        return ds
+
+    # Samples in the order of the flat buffers
+    padded = {}
+    for name in sample_vars:
+        trailing_dims = [d for d in ds[name].dims if d not in ("channel", "ping_time", sample_dim)]
+        padded[name] = ds[name].transpose("channel", "ping_time", sample_dim, *trailing_dims)
+
+    # Go through each channel so that only one channel is loaded at a time
+    counts = np.zeros((ds.sizes["channel"], ds.sizes["ping_time"]), dtype=np.int64)
+    flat = {name: [] for name in sample_vars}
+    sample_positions = np.arange(ds.sizes[sample_dim])
+    for ch_idx in range(ds.sizes["channel"]):
+        ch_values = {name: np.asarray(arr[ch_idx].values) for name, arr in padded.items()}
+
+        # Number of samples up to the last non-NaN sample across all variables
+        for values in ch_values.values():
+            if values.dtype.kind in "fc":
+                valid = ~np.isnan(values)
+            else:
+                valid = np.ones(values.shape, dtype=bool)
+            if valid.ndim > 2:
+                valid = valid.any(axis=tuple(range(2, valid.ndim)))
+            last_valid = np.where(valid, sample_positions + 1, 0).max(axis=1, initial=0)
+            counts[ch_idx] = np.maximum(counts[ch_idx], last_valid)
+
+        mask = sample_positions < counts[ch_idx][:, None]
+        for name, values in ch_values.items():
+            flat[name].append(values[mask])
+
+    ds_ragged = ds.drop_vars(sample_vars)
+    ds_ragged[RAGGED_COUNT_VAR] = xr.DataArray(
+        counts,
+        dims=("channel", "ping_time"),
+        attrs={
+            "long_name": "Number of samples in each ping",
+            "sample_dimension": RAGGED_SAMPLE_DIM,
+        },
+    )
+    for name in sample_vars:
+        encoding = {k: v for k, v in ds[name].encoding.items() if k not in _SHAPE_ENCODINGS}
+        ds_ragged[name] = xr.Variable(
+            (RAGGED_SAMPLE_DIM,) + padded[name].dims[3:],
+            np.concatenate(flat[name]),
+            attrs=ds[name].attrs,
+            encoding=encoding,
+        )
+
+    return ds_ragged
+
+
+def _pad_samples(flat: np.ndarray, counts: np.ndarray, size: int, dtype: np.dtype) -> np.ndarray:
+    """Pad the flat samples of consecutive pings into a (ping, sample, ...) array."""
+    flat = np.asarray(flat)
+    padded = np.full((counts.size, size) + flat.shape[1:], np.nan, dtype=dtype)
+    padded[np.arange(size) < counts[:, None]] = flat
+    return padded
+
+
+def from_ragged(
+    ds: xr.Dataset,
+    sample_dim: str = "range_sample",
+    ping_chunk_size: int = DEFAULT_PING_CHUNK_SIZE,
+) -> xr.Dataset:
+    """
+    Lazily pad the ragged samples of a beam group.
+
+    This is the inverse of ``to_ragged``: the padded variables are dask arrays
+    chunked by channel and blocks of ``ping_chunk_size`` pings,
+    so that the padded samples are only materialized chunk by chunk when computed.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        Beam group with ragged samples.
+    sample_dim : str, default "range_sample"
+        Dimension along which the samples are padded.
+    ping_chunk_size : int, default 1000
+        Number of pings in each chunk of the padded variables.
+
+    Returns
+    -------
+    xr.Dataset
+        Beam group with NaN-padded samples.
+    """
+    if not is_ragged(ds):
+        return ds
+
+    counts = ds[RAGGED_COUNT_VAR].transpose("channel", "ping_time").values.astype(np.int64)
+    num_channels, num_pings = counts.shape
+    size = ds.sizes[sample_dim] if sample_dim in ds.dims else int(counts.max(initial=0))
+    # Offsets of the samples of each channel and ping in the flat buffers
+    offsets = np.concatenate([[0], np.cumsum(counts.ravel())])
+
+    ds_padded = ds.drop_vars(RAGGED_COUNT_VAR)
+    for name, var in ds.data_vars.items():
+        if RAGGED_SAMPLE_DIM not in var.dims:
+            continue
+        var = var.transpose(RAGGED_SAMPLE_DIM, ...)
+        trailing_shape = var.shape[1:]
+        dtype = np.result_type(var.dtype, np.float32)
+
+        ch_arrs = []
+        for ch_idx in range(num_channels):
+            ping_arrs = []
+            for start_ping in range(0, num_pings, ping_chunk_size):
+                end_ping = min(start_ping + ping_chunk_size, num_pings)
+                start = offsets[ch_idx * num_pings + start_ping]
+                end = offsets[ch_idx * num_pings + end_ping]
+                ping_arrs.append(
+                    da.from_delayed(
+                        dask.delayed(_pad_samples)(
+                            var.data[start:end], counts[ch_idx, start_ping:end_ping], size, dtype
+                        ),
+                        shape=(end_ping - start_ping, size) + trailing_shape,
+                        dtype=dtype,
+                    )
+                )
+            if len(ping_arrs) == 0:
+                ping_arrs.append(da.full((0, size) + trailing_shape, np.nan, dtype=dtype))
+            ch_arrs.append(da.concatenate(ping_arrs, axis=0))
+
+        ds_padded[name] = xr.Variable(
+            ("channel", "ping_time", sample_dim) + var.dims[1:],
+            da.stack(ch_arrs, axis=0),
+            attrs=var.attrs,
+        )
+
+    ds_padded = ds_padded.drop_dims(RAGGED_SAMPLE_DIM, errors="ignore")
+    if sample_dim not in ds_padded.coords:
+        ds_padded = ds_padded.assign_coords({sample_dim: np.arange(size)})
+    return ds_padded